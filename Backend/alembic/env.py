@@ -19,7 +19,7 @@ if config.config_file_name is not None:
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
 from app.db.database import Base
-from app.models import user, job, application, profile, interview
+from app.models import user, job, application, profile, interview, resume_job, job_artifact, idf, llm_cache, webhook_event, scheduled_task, stats, table_version, candidate_vector, resume_artifact, rescore_run, resume_blob
 target_metadata = Base.metadata
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
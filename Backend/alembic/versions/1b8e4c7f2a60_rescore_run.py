@@ -0,0 +1,82 @@
+"""rescore runs and stored score parts
+
+Revision ID: 1b8e4c7f2a60
+Revises: 8c3d1f6e9a24
+Create Date: 2026-10-18 23:36:02.417853
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1b8e4c7f2a60'
+down_revision: Union[str, Sequence[str], None] = '8c3d1f6e9a24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'rescore_run',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.Column('reason', sa.String(length=20), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('total', sa.Integer(), nullable=False),
+        sa.Column('processed', sa.Integer(), nullable=False),
+        sa.Column('parsed', sa.Integer(), nullable=False),
+        sa.Column('scores_changed', sa.Integer(), nullable=False),
+        sa.Column('decisions_changed', sa.Integer(), nullable=False),
+        sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['job_id'], ['job_listing.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_rescore_run_id'), 'rescore_run', ['id'], unique=False)
+    op.create_index(op.f('ix_rescore_run_job_id'), 'rescore_run', ['job_id'], unique=False)
+    op.create_index(op.f('ix_rescore_run_status'), 'rescore_run', ['status'], unique=False)
+
+    op.add_column('candidate_application', sa.Column('tfidf_score', sa.Integer(), nullable=True))
+    op.add_column('candidate_application', sa.Column('ai_score', sa.Integer(), nullable=True))
+    op.add_column('candidate_application', sa.Column('auto_status', sa.String(length=30), nullable=True))
+
+    # Decisions still as the pipelines left them: the resume screen's (recorded
+    # on its last completed job) before an interview, the interview's after.
+    op.execute("""
+        UPDATE candidate_application
+        SET auto_status = (
+            SELECT resume_job.application_status
+            FROM resume_job
+            WHERE resume_job.application_id = candidate_application.id
+              AND resume_job.status = 'completed'
+            ORDER BY resume_job.id DESC
+            LIMIT 1
+        )
+        WHERE voice_score IS NULL
+    """)
+    op.execute("""
+        UPDATE candidate_application
+        SET auto_status = status
+        WHERE voice_score IS NOT NULL
+          AND status IN ('shortlisted', 'rejected')
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('candidate_application', 'auto_status')
+    op.drop_column('candidate_application', 'ai_score')
+    op.drop_column('candidate_application', 'tfidf_score')
+
+    op.drop_index(op.f('ix_rescore_run_status'), table_name='rescore_run')
+    op.drop_index(op.f('ix_rescore_run_job_id'), table_name='rescore_run')
+    op.drop_index(op.f('ix_rescore_run_id'), table_name='rescore_run')
+    op.drop_table('rescore_run')
@@ -0,0 +1,38 @@
+"""candidate sourcing vectors
+
+Revision ID: 2e7a9c5d3f81
+Revises: 6d2b8f4a1e57
+Create Date: 2026-10-18 22:05:31.770245
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2e7a9c5d3f81'
+down_revision: Union[str, Sequence[str], None] = '6d2b8f4a1e57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Filled by resume processing and profile saves; backfill existing
+    # candidates with python -m app.core.candidate_vectors rebuild
+    op.create_table(
+        'candidate_vector',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('resume_terms', sa.Text(), nullable=True),
+        sa.Column('skills_terms', sa.Text(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('candidate_vector')
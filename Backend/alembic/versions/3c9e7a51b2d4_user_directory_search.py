@@ -0,0 +1,62 @@
+"""user directory search indexes
+
+Revision ID: 3c9e7a51b2d4
+Revises: f08a2d6c41e9
+Create Date: 2026-10-18 20:03:44.130572
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9e7a51b2d4'
+down_revision: Union[str, Sequence[str], None] = 'f08a2d6c41e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Postgres only, so they are not declared on the User model.
+# prefix search (lower(x) LIKE 'q%') -> btree with text_pattern_ops
+# substring search (lower(x) LIKE '%q%') -> GIN with pg_trgm
+INDEXES = [
+    ('ix_users_email_lower_prefix', 'lower(email) text_pattern_ops', 'btree'),
+    ('ix_users_name_lower_prefix', 'lower(name) text_pattern_ops', 'btree'),
+    ('ix_users_email_lower_trgm', 'lower(email) gin_trgm_ops', 'gin'),
+    ('ix_users_name_lower_trgm', 'lower(name) gin_trgm_ops', 'gin'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_context().dialect.name != 'postgresql':
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    with op.get_context().autocommit_block():
+        for name, expression, using in INDEXES:
+            op.create_index(
+                name,
+                'users',
+                [sa.text(expression)],
+                postgresql_using=using,
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_context().dialect.name != 'postgresql':
+        return
+
+    with op.get_context().autocommit_block():
+        for name, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name='users',
+                postgresql_concurrently=True,
+                if_exists=True
+            )
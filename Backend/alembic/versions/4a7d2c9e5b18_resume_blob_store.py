@@ -0,0 +1,75 @@
+"""content-addressed resume blobs
+
+Revision ID: 4a7d2c9e5b18
+Revises: 1b8e4c7f2a60
+Create Date: 2026-10-19 00:21:47.682315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4a7d2c9e5b18'
+down_revision: Union[str, Sequence[str], None] = '1b8e4c7f2a60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'resume_blob',
+        sa.Column('digest', sa.String(length=64), nullable=False),
+        sa.Column('byte_size', sa.Integer(), nullable=False),
+        sa.Column('ref_count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('digest')
+    )
+    op.create_index(op.f('ix_resume_blob_ref_count'), 'resume_blob', ['ref_count'], unique=False)
+
+    # Existing files under uploads/resumes are moved in with
+    # `python -m app.core.resume_store import-legacy`.
+    op.add_column('resume_job', sa.Column('blob_hash', sa.String(length=64), nullable=True))
+    op.alter_column('resume_job', 'file_path', existing_type=sa.Text(), nullable=True)
+
+    op.add_column('candidate_application', sa.Column('resume_blob', sa.String(length=64), nullable=True))
+    op.create_foreign_key(
+        'candidate_application_resume_blob_fkey',
+        'candidate_application', 'resume_blob',
+        ['resume_blob'], ['digest']
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f('ix_candidate_application_resume_blob'),
+            'candidate_application',
+            ['resume_blob'],
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            op.f('ix_candidate_application_resume_blob'),
+            table_name='candidate_application',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
+
+    op.drop_constraint('candidate_application_resume_blob_fkey', 'candidate_application', type_='foreignkey')
+    op.drop_column('candidate_application', 'resume_blob')
+
+    # store-only uploads have no path to fall back to
+    op.execute("DELETE FROM resume_job WHERE file_path IS NULL")
+    op.alter_column('resume_job', 'file_path', existing_type=sa.Text(), nullable=False)
+    op.drop_column('resume_job', 'blob_hash')
+
+    op.drop_index(op.f('ix_resume_blob_ref_count'), table_name='resume_blob')
+    op.drop_table('resume_blob')
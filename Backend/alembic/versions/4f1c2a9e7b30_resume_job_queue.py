@@ -0,0 +1,47 @@
+"""resume job queue
+
+Revision ID: 4f1c2a9e7b30
+Revises: d9bd9702c2a1
+Create Date: 2026-10-18 10:12:41.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f1c2a9e7b30'
+down_revision: Union[str, Sequence[str], None] = 'd9bd9702c2a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'resume_job',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('application_id', sa.Integer(), nullable=False),
+        sa.Column('file_path', sa.Text(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('resume_score', sa.Integer(), nullable=True),
+        sa.Column('application_status', sa.String(length=30), nullable=True),
+        sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['application_id'], ['candidate_application.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_resume_job_id'), 'resume_job', ['id'], unique=False)
+    op.create_index(op.f('ix_resume_job_status'), 'resume_job', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_resume_job_status'), table_name='resume_job')
+    op.drop_index(op.f('ix_resume_job_id'), table_name='resume_job')
+    op.drop_table('resume_job')
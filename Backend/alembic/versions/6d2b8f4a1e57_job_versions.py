@@ -0,0 +1,40 @@
+"""job listing versions for HTTP caching
+
+Revision ID: 6d2b8f4a1e57
+Revises: 9a4f6b2e7c13
+Create Date: 2026-10-18 21:17:52.604113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6d2b8f4a1e57'
+down_revision: Union[str, Sequence[str], None] = '9a4f6b2e7c13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'table_version',
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('name')
+    )
+    op.add_column('job_listing', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('job_listing', sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True))
+
+    op.execute("INSERT INTO table_version (name, version) VALUES ('job_listing', 1)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('job_listing', 'updated_at')
+    op.drop_column('job_listing', 'version')
+    op.drop_table('table_version')
@@ -0,0 +1,52 @@
+"""application performance score
+
+Revision ID: 7d40b5e2f96a
+Revises: e27b94f0c813
+Create Date: 2026-10-18 17:32:48.902316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d40b5e2f96a'
+down_revision: Union[str, Sequence[str], None] = 'e27b94f0c813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCORE_COLUMNS = [
+    'resume_score',
+    'voice_score',
+    'communication_score',
+    'technical_score',
+    'confidence_score',
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('candidate_application', sa.Column('performance_score', sa.Float(), nullable=True))
+
+    # Backfill: average of the non-null scores, as core.leaderboard computes it.
+    total = " + ".join(f"COALESCE({c}, 0)" for c in SCORE_COLUMNS)
+    count = " + ".join(f"(CASE WHEN {c} IS NOT NULL THEN 1 ELSE 0 END)" for c in SCORE_COLUMNS)
+    op.execute(
+        f"UPDATE candidate_application "
+        f"SET performance_score = ROUND(CAST(({total}) AS NUMERIC) / NULLIF({count}, 0), 2)"
+    )
+
+    op.create_index(
+        'ix_candidate_application_job_performance',
+        'candidate_application',
+        ['job_id', 'performance_score'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_candidate_application_job_performance', table_name='candidate_application')
+    op.drop_column('candidate_application', 'performance_score')
@@ -0,0 +1,49 @@
+"""scheduled task dedupe key
+
+Revision ID: 7e2a9b4c1d53
+Revises: 4a7d2c9e5b18
+Create Date: 2026-10-19 09:42:18.305127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e2a9b4c1d53'
+down_revision: Union[str, Sequence[str], None] = '4a7d2c9e5b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Tasks queued before this revision keep a NULL key and never collide.
+    op.add_column('scheduled_task', sa.Column('dedupe_key', sa.String(length=100), nullable=True))
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'uq_scheduled_task_live_key',
+            'scheduled_task',
+            ['kind', 'dedupe_key'],
+            unique=True,
+            postgresql_where=sa.text("status IN ('pending', 'running')"),
+            sqlite_where=sa.text("status IN ('pending', 'running')"),
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'uq_scheduled_task_live_key',
+            table_name='scheduled_task',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
+
+    op.drop_column('scheduled_task', 'dedupe_key')
@@ -0,0 +1,36 @@
+"""job text artifact
+
+Revision ID: 8b2e6d41c9a5
+Revises: 4f1c2a9e7b30
+Create Date: 2026-10-18 11:03:17.204551
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2e6d41c9a5'
+down_revision: Union[str, Sequence[str], None] = '4f1c2a9e7b30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'job_text_artifact',
+        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.Column('description_hash', sa.String(length=64), nullable=False),
+        sa.Column('term_counts', sa.Text(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['job_id'], ['job_listing.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('job_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('job_text_artifact')
@@ -0,0 +1,66 @@
+"""resume artifacts keyed by content hash
+
+Revision ID: 8c3d1f6e9a24
+Revises: 2e7a9c5d3f81
+Create Date: 2026-10-18 22:48:16.093521
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c3d1f6e9a24'
+down_revision: Union[str, Sequence[str], None] = '2e7a9c5d3f81'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'resume_artifact',
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('byte_size', sa.Integer(), nullable=False),
+        sa.Column('text', sa.LargeBinary(), nullable=False),
+        sa.Column('token_count', sa.Integer(), nullable=False),
+        sa.Column('term_count', sa.Integer(), nullable=False),
+        sa.Column('features', sa.LargeBinary(), nullable=False),
+        sa.Column('idf_version', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('content_hash')
+    )
+    # Existing applications get linked the next time their resume is processed.
+    op.add_column('candidate_application', sa.Column('resume_hash', sa.String(length=64), nullable=True))
+    op.create_foreign_key(
+        'candidate_application_resume_hash_fkey',
+        'candidate_application', 'resume_artifact',
+        ['resume_hash'], ['content_hash'],
+        ondelete='SET NULL'
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f('ix_candidate_application_resume_hash'),
+            'candidate_application',
+            ['resume_hash'],
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            op.f('ix_candidate_application_resume_hash'),
+            table_name='candidate_application',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
+
+    op.drop_constraint('candidate_application_resume_hash_fkey', 'candidate_application', type_='foreignkey')
+    op.drop_column('candidate_application', 'resume_hash')
+    op.drop_table('resume_artifact')
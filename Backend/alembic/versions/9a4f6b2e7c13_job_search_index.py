@@ -0,0 +1,56 @@
+"""job full-text search index
+
+Revision ID: 9a4f6b2e7c13
+Revises: 3c9e7a51b2d4
+Create Date: 2026-10-18 20:41:09.284417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4f6b2e7c13'
+down_revision: Union[str, Sequence[str], None] = '3c9e7a51b2d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match SEARCH_DOCUMENT in app/core/job_search.py. Postgres only; other
+# dialects search through the in-process inverted index.
+SEARCH_DOCUMENT = (
+    "(setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(role, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C'))"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_context().dialect.name != 'postgresql':
+        return
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_job_listing_search',
+            'job_listing',
+            [sa.text(SEARCH_DOCUMENT)],
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_context().dialect.name != 'postgresql':
+        return
+
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_job_listing_search',
+            table_name='job_listing',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
@@ -0,0 +1,49 @@
+"""candidate vector row version
+
+Revision ID: 9d4f2b7a6c15
+Revises: 7e2a9b4c1d53
+Create Date: 2026-10-19 11:08:53.774210
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4f2b7a6c15'
+down_revision: Union[str, Sequence[str], None] = '7e2a9b4c1d53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # existing rows are at version 0, i.e. part of any matrix built from scratch
+    op.add_column(
+        'candidate_vector',
+        sa.Column('version', sa.BigInteger(), server_default='0', nullable=False)
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f('ix_candidate_vector_version'),
+            'candidate_vector',
+            ['version'],
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            op.f('ix_candidate_vector_version'),
+            table_name='candidate_vector',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
+
+    op.drop_column('candidate_vector', 'version')
@@ -0,0 +1,47 @@
+"""webhook event inbox
+
+Revision ID: a61f8c02d5b9
+Revises: 5e9d13b7a4c6
+Create Date: 2026-10-18 14:58:22.640913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a61f8c02d5b9'
+down_revision: Union[str, Sequence[str], None] = '5e9d13b7a4c6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'webhook_event',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('call_id', sa.String(length=100), nullable=False),
+        sa.Column('status', sa.String(length=30), nullable=False),
+        sa.Column('payload', sa.Text(), nullable=False),
+        sa.Column('state', sa.String(length=20), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('result', sa.Text(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('processed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('received_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('call_id', 'status', name='uq_webhook_event_call_status')
+    )
+    op.create_index(op.f('ix_webhook_event_id'), 'webhook_event', ['id'], unique=False)
+    op.create_index(op.f('ix_webhook_event_state'), 'webhook_event', ['state'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_webhook_event_state'), table_name='webhook_event')
+    op.drop_index(op.f('ix_webhook_event_id'), table_name='webhook_event')
+    op.drop_table('webhook_event')
@@ -0,0 +1,68 @@
+"""indexes for foreign keys and hot filters
+
+Revision ID: b5c81e3f0a47
+Revises: 7d40b5e2f96a
+Create Date: 2026-10-18 18:05:11.274903
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5c81e3f0a47'
+down_revision: Union[str, Sequence[str], None] = '7d40b5e2f96a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns, unique)
+INDEXES = [
+    ('ix_candidate_application_job_status', 'candidate_application', ['job_id', 'status'], False),
+    ('ix_candidate_application_user_created', 'candidate_application', ['user_id', sa.text('created_at DESC')], False),
+    ('uq_candidate_application_user_job', 'candidate_application', ['user_id', 'job_id'], True),
+    ('ix_job_listing_recruiter_id', 'job_listing', ['recruiter_id'], False),
+    ('ix_interview_candidate_application_id', 'interview', ['candidate_application_id'], False),
+    ('ix_users_role_created', 'users', ['role', sa.text('created_at DESC')], False),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    duplicates = [] if context.is_offline_mode() else op.get_bind().execute(sa.text(
+        "SELECT user_id, job_id, COUNT(*) FROM candidate_application "
+        "GROUP BY user_id, job_id HAVING COUNT(*) > 1"
+    )).fetchall()
+
+    if duplicates:
+        # Deleting them would cascade to interviews; leave that decision to a human.
+        raise RuntimeError(
+            "Duplicate applications must be resolved before adding "
+            f"uq_candidate_application_user_job: {duplicates[:20]}"
+        )
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction, and keeps
+    # the tables writable while the indexes build.
+    with op.get_context().autocommit_block():
+        for name, table, columns, unique in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=unique,
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True
+            )
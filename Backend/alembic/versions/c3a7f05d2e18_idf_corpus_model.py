@@ -0,0 +1,43 @@
+"""idf corpus model
+
+Revision ID: c3a7f05d2e18
+Revises: 8b2e6d41c9a5
+Create Date: 2026-10-18 12:26:50.771093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3a7f05d2e18'
+down_revision: Union[str, Sequence[str], None] = '8b2e6d41c9a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'idf_term',
+        sa.Column('term', sa.String(length=100), nullable=False),
+        sa.Column('doc_freq', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('term')
+    )
+    op.create_table(
+        'idf_corpus',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('doc_count', sa.Integer(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    # Populate with: python -m app.core.idf_model rebuild
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('idf_corpus')
+    op.drop_table('idf_term')
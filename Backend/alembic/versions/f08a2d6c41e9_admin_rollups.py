@@ -0,0 +1,107 @@
+"""admin overview rollups
+
+Revision ID: f08a2d6c41e9
+Revises: b5c81e3f0a47
+Create Date: 2026-10-18 19:12:37.518264
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f08a2d6c41e9'
+down_revision: Union[str, Sequence[str], None] = 'b5c81e3f0a47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'stat_counter',
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('value', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+    op.create_table(
+        'recruiter_stats',
+        sa.Column('recruiter_id', sa.Integer(), nullable=False),
+        sa.Column('jobs_posted', sa.Integer(), nullable=False),
+        sa.Column('applications_received', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['recruiter_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('recruiter_id')
+    )
+
+    # Backfill; the same as python -m app.core.admin_stats rebuild
+    op.execute("INSERT INTO stat_counter (name, value) SELECT 'users', COUNT(*) FROM users")
+    op.execute("INSERT INTO stat_counter (name, value) SELECT 'jobs', COUNT(*) FROM job_listing")
+    op.execute("INSERT INTO stat_counter (name, value) SELECT 'applications', COUNT(*) FROM candidate_application")
+    op.execute(
+        "INSERT INTO stat_counter (name, value) "
+        "SELECT 'users.role:' || role, COUNT(*) FROM users GROUP BY role"
+    )
+    op.execute(
+        "INSERT INTO stat_counter (name, value) "
+        "SELECT 'applications.status:' || status, COUNT(*) FROM candidate_application "
+        "WHERE status IS NOT NULL GROUP BY status"
+    )
+    op.execute(
+        "INSERT INTO recruiter_stats (recruiter_id, jobs_posted, applications_received) "
+        "SELECT j.recruiter_id, COUNT(DISTINCT j.id), COUNT(a.id) "
+        "FROM job_listing j LEFT JOIN candidate_application a ON a.job_id = j.id "
+        "WHERE j.recruiter_id IS NOT NULL GROUP BY j.recruiter_id"
+    )
+
+    with op.get_context().autocommit_block():
+        # "recent jobs" on the overview
+        op.create_index(
+            'ix_job_listing_created_at',
+            'job_listing',
+            [sa.text('created_at DESC')],
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        # /admin/users pages by id within a role; replaces the created_at variant
+        op.create_index(
+            'ix_users_role_id',
+            'users',
+            ['role', sa.text('id DESC')],
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.drop_index(
+            'ix_users_role_created',
+            table_name='users',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_role_created',
+            'users',
+            ['role', sa.text('created_at DESC')],
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.drop_index(
+            'ix_users_role_id',
+            table_name='users',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
+        op.drop_index(
+            'ix_job_listing_created_at',
+            table_name='job_listing',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
+
+    op.drop_table('recruiter_stats')
+    op.drop_table('stat_counter')
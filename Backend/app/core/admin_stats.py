@@ -0,0 +1,224 @@
+from collections import Counter
+import sys
+
+from sqlalchemy import delete, event, func, inspect, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from ..db.database import SessionLocal
+from ..models.application import CandidateApplication
+from ..models.job import JobListing
+from ..models.stats import StatCounter, RecruiterStats
+from ..models.user import User
+
+
+# ============================================================
+# INCREMENTAL MAINTENANCE
+# ============================================================
+# Rollups are adjusted in the same transaction as the ORM write that changed
+# them. Raw SQL writes and FK cascades bypass this; run
+# ``python -m app.core.admin_stats rebuild`` after those.
+
+# Status / role changes need the old value even when it was never loaded.
+for _attribute in (CandidateApplication.status, User.role):
+    event.listen(_attribute, "set", lambda *args: None, active_history=True)
+
+
+def _changed(obj, key):
+    """(old, new) when ``key`` changed in this flush, else None."""
+    history = inspect(obj).attrs[key].history
+    if not history.added or not history.deleted:
+        return None
+    return history.deleted[0], history.added[0]
+
+
+def _collect(session: Session):
+    counters = Counter()
+    jobs_posted = Counter()
+    applications_by_job = Counter()
+
+    for sign, objects in ((1, session.new), (-1, session.deleted)):
+        for obj in objects:
+            if isinstance(obj, User):
+                counters["users"] += sign
+                counters[f"users.role:{obj.role}"] += sign
+            elif isinstance(obj, JobListing):
+                counters["jobs"] += sign
+                jobs_posted[obj.recruiter_id] += sign
+            elif isinstance(obj, CandidateApplication):
+                counters["applications"] += sign
+                counters[f"applications.status:{obj.status}"] += sign
+                applications_by_job[obj.job_id] += sign
+
+    for obj in session.dirty:
+        if isinstance(obj, User):
+            change = _changed(obj, "role")
+            if change:
+                counters[f"users.role:{change[0]}"] -= 1
+                counters[f"users.role:{change[1]}"] += 1
+        elif isinstance(obj, CandidateApplication):
+            change = _changed(obj, "status")
+            if change:
+                counters[f"applications.status:{change[0]}"] -= 1
+                counters[f"applications.status:{change[1]}"] += 1
+
+    return counters, jobs_posted, applications_by_job
+
+
+def _insert(connection):
+    return (postgresql if connection.dialect.name == "postgresql" else sqlite).insert
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_rollups(session, flush_context):
+    counters, jobs_posted, applications_by_job = _collect(session)
+
+    counters = {name: delta for name, delta in counters.items() if delta}
+    applications_by_job = {job_id: delta for job_id, delta in applications_by_job.items() if delta and job_id}
+
+    if not counters and not any(jobs_posted.values()) and not applications_by_job:
+        return
+
+    connection = session.connection()
+    insert = _insert(connection)
+
+    applications_received = Counter()
+    if applications_by_job:
+        owners = connection.execute(
+            select(JobListing.id, JobListing.recruiter_id)
+            .where(JobListing.id.in_(applications_by_job))
+        )
+        for job_id, recruiter_id in owners:
+            applications_received[recruiter_id] += applications_by_job[job_id]
+
+    if counters:
+        stmt = insert(StatCounter)
+        connection.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[StatCounter.name],
+                set_={"value": StatCounter.value + stmt.excluded.value}
+            ),
+            # sorted so concurrent upserts lock rows in one order
+            [{"name": name[:100], "value": counters[name]} for name in sorted(counters)]
+        )
+
+    recruiters = sorted(
+        recruiter_id
+        for recruiter_id in set(jobs_posted) | set(applications_received)
+        if recruiter_id and (jobs_posted[recruiter_id] or applications_received[recruiter_id])
+    )
+    if recruiters:
+        stmt = insert(RecruiterStats)
+        connection.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[RecruiterStats.recruiter_id],
+                set_={
+                    "jobs_posted": RecruiterStats.jobs_posted + stmt.excluded.jobs_posted,
+                    "applications_received": (
+                        RecruiterStats.applications_received + stmt.excluded.applications_received
+                    )
+                }
+            ),
+            [
+                {
+                    "recruiter_id": recruiter_id,
+                    "jobs_posted": jobs_posted[recruiter_id],
+                    "applications_received": applications_received[recruiter_id]
+                }
+                for recruiter_id in recruiters
+            ]
+        )
+
+
+# ============================================================
+# READS
+# ============================================================
+def overview_counters(db: Session):
+    """Totals, users by role and applications by status from a single read."""
+    counters = dict(db.execute(select(StatCounter.name, StatCounter.value)).all())
+
+    def group(prefix):
+        return {
+            name[len(prefix):]: value
+            for name, value in sorted(counters.items())
+            if name.startswith(prefix) and value
+        }
+
+    return {
+        "totals": {
+            "users": counters.get("users", 0),
+            "jobs": counters.get("jobs", 0),
+            "applications": counters.get("applications", 0),
+        },
+        "users_by_role": group("users.role:"),
+        "applications_by_status": group("applications.status:"),
+    }
+
+
+# ============================================================
+# FULL REBUILD
+# ============================================================
+def rebuild_stats(db: Session):
+    """Recompute every rollup from the base tables."""
+    counters = {
+        "users": db.scalar(select(func.count(User.id))) or 0,
+        "jobs": db.scalar(select(func.count(JobListing.id))) or 0,
+        "applications": db.scalar(select(func.count(CandidateApplication.id))) or 0,
+    }
+
+    for role, count in db.execute(select(User.role, func.count(User.id)).group_by(User.role)):
+        counters[f"users.role:{role}"] = count
+
+    for status, count in db.execute(
+        select(CandidateApplication.status, func.count(CandidateApplication.id))
+        .where(CandidateApplication.status.isnot(None))
+        .group_by(CandidateApplication.status)
+    ):
+        counters[f"applications.status:{status}"] = count
+
+    recruiters = {}
+    for recruiter_id, count in db.execute(
+        select(JobListing.recruiter_id, func.count(JobListing.id))
+        .where(JobListing.recruiter_id.isnot(None))
+        .group_by(JobListing.recruiter_id)
+    ):
+        recruiters[recruiter_id] = {"jobs_posted": count, "applications_received": 0}
+
+    for recruiter_id, count in db.execute(
+        select(JobListing.recruiter_id, func.count(CandidateApplication.id))
+        .join(CandidateApplication, CandidateApplication.job_id == JobListing.id)
+        .where(JobListing.recruiter_id.isnot(None))
+        .group_by(JobListing.recruiter_id)
+    ):
+        recruiters[recruiter_id]["applications_received"] = count
+
+    # Core statements only, so the after_flush hook does not count them.
+    db.execute(delete(StatCounter))
+    db.execute(delete(RecruiterStats))
+
+    if counters:
+        db.execute(
+            StatCounter.__table__.insert(),
+            [{"name": name[:100], "value": value} for name, value in counters.items()]
+        )
+    if recruiters:
+        db.execute(
+            RecruiterStats.__table__.insert(),
+            [{"recruiter_id": recruiter_id, **values} for recruiter_id, values in recruiters.items()]
+        )
+
+    db.commit()
+
+    print(f"📊 Admin stats rebuilt: {len(counters)} counters, {len(recruiters)} recruiters")
+
+
+if __name__ == "__main__":
+    # python -m app.core.admin_stats rebuild
+    if sys.argv[1:] == ["rebuild"]:
+        db = SessionLocal()
+        try:
+            rebuild_stats(db)
+        finally:
+            db.close()
+    else:
+        print("usage: python -m app.core.admin_stats rebuild")
@@ -4,11 +4,30 @@ import json
 import re
 from dotenv import load_dotenv
 
+from .llm_cache import llm_cache, make_key
+
 load_dotenv()
 
 genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
 
-model = genai.GenerativeModel("models/gemini-2.5-flash")
+MODEL_NAME = "models/gemini-2.5-flash"
+
+# Bump whenever the prompt below changes so cached responses are not reused.
+PROMPT_VERSION = "interview-v1"
+
+model = genai.GenerativeModel(MODEL_NAME)
+
+
+def _generate(prompt: str):
+    response = model.generate_content(prompt)
+
+    text = response.text
+
+    # Safe JSON extraction
+    match = re.search(r"\{.*\}", text, re.S)
+    data = json.loads(match.group())
+
+    return data
 
 
 def evaluate_interview(transcript: str, job_description: str):
@@ -38,12 +57,8 @@ Return ONLY JSON in this format:
 }}
 """
 
-    response = model.generate_content(prompt)
-
-    text = response.text
-
-    # Safe JSON extraction
-    match = re.search(r"\{.*\}", text, re.S)
-    data = json.loads(match.group())
-
-    return data
\ No newline at end of file
+    return llm_cache.get_or_compute(
+        make_key(MODEL_NAME, PROMPT_VERSION, transcript, job_description),
+        lambda: _generate(prompt),
+        model=MODEL_NAME
+    )
\ No newline at end of file
@@ -4,25 +4,49 @@ import json
 import re
 from dotenv import load_dotenv
 
+from .llm_cache import llm_cache, make_key
+
 load_dotenv()
 
 client = genai.Client(
     api_key=os.getenv("GOOGLE_API_KEY")
 )
 
+MODEL_NAME = "gemini-2.0-flash"
+
+# Bump whenever the prompt below changes so cached responses are not reused.
+PROMPT_VERSION = "resume-v1"
+
+
+def _generate(prompt: str):
+    response = client.models.generate_content(
+        model=MODEL_NAME,
+        contents=prompt
+    )
+
+    result_text = response.text.strip()
+
+    # 🔥 Remove markdown if Gemini adds it
+    result_text = re.sub(r"```json|```", "", result_text).strip()
+
+    return json.loads(result_text)
+
 
 def analyze_resume_with_ai(resume_text: str, job_description: str):
 
+    resume_text = resume_text[:4000]
+    job_description = job_description[:3000]
+
     prompt = f"""
 You are an AI HR evaluator.
 
 Compare the resume with the job description carefully.
 
 Resume:
-{resume_text[:4000]}
+{resume_text}
 
 Job Description:
-{job_description[:3000]}
+{job_description}
 
 Return ONLY valid JSON in this exact format:
 
@@ -37,20 +61,12 @@ Do NOT include explanation outside JSON.
 """
 
     try:
-        response = client.models.generate_content(
-            model="gemini-2.0-flash",
-            contents=prompt
+        return llm_cache.get_or_compute(
+            make_key(MODEL_NAME, PROMPT_VERSION, resume_text, job_description),
+            lambda: _generate(prompt),
+            model=MODEL_NAME
         )
 
-        result_text = response.text.strip()
-
-        # 🔥 Remove markdown if Gemini adds it
-        result_text = re.sub(r"```json|```", "", result_text).strip()
-
-        result_json = json.loads(result_text)
-
-        return result_json
-
     except Exception as e:
         print("AI Resume Scoring Failed:", e)
 
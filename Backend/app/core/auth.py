@@ -1,5 +1,9 @@
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Optional
+import threading
+import time
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer
@@ -7,8 +11,9 @@ from jose import jwt, JWTError
 from dotenv import load_dotenv
 import os
 
-from sqlalchemy.orm import Session
-from ..db.database import get_db
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..db.database import get_async_db
 from ..models.user import User
 
 load_dotenv()
@@ -21,6 +26,91 @@ ACCESS_TOKEN_EXPIRE_MINUTES = int(
     os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES")
 )
 
+# Upper bound on how long another process may serve a stale user after an edit.
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "30"))
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "4096"))
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Detached snapshot of the authenticated user, safe to share across sessions."""
+    id: int
+    email: str
+    name: Optional[str]
+    phone: Optional[str]
+    role: str
+    created_at: Optional[datetime]
+
+    @classmethod
+    def from_user(cls, user: User):
+        return cls(
+            id=user.id,
+            email=user.email,
+            name=user.name,
+            phone=user.phone,
+            role=user.role,
+            created_at=user.created_at
+        )
+
+
+@dataclass(frozen=True)
+class TokenClaims:
+    """Identity taken from the signed token alone, without a database lookup."""
+    id: int
+    role: str
+
+
+class _TTLCache:
+    """Small thread-safe LRU whose entries expire after a per-entry deadline."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value, ttl_seconds: float):
+        if ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# token -> verified claims, kept no longer than the token itself is valid
+_verified_tokens = _TTLCache(AUTH_CACHE_SIZE)
+# user id -> Principal
+_principals = _TTLCache(AUTH_CACHE_SIZE)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_principal(mapper, connection, target):
+    _principals.pop(target.id)
+
 
 # ✅ Create JWT Token
 def create_access_token(
@@ -39,12 +129,18 @@ def create_access_token(
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
-# ✅ Get Current Logged-in User
-def get_current_user(
-    credentials = Depends(security),
-    db: Session = Depends(get_db)
-):
-    token = credentials.credentials
+def _invalid_token():
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid token"
+    )
+
+
+def _verify_token(token: str):
+    """Decode and verify ``token`` once; later requests with it hit the cache."""
+    payload = _verified_tokens.get(token)
+    if payload is not None:
+        return payload
 
     try:
         payload = jwt.decode(
@@ -52,24 +148,27 @@ def get_current_user(
             SECRET_KEY,
             algorithms=[ALGORITHM]
         )
+    except JWTError:
+        raise _invalid_token()
 
-        user_id = payload.get("sub")
+    if payload.get("sub") is None:
+        raise _invalid_token()
 
-        if user_id is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token"
-            )
+    ttl = AUTH_CACHE_TTL_SECONDS
+    if payload.get("exp") is not None:
+        ttl = min(ttl, payload["exp"] - time.time())
 
-    except JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token"
-        )
+    _verified_tokens.put(token, payload, ttl)
+
+    return payload
+
+
+async def _load_principal(db: AsyncSession, user_id: int):
+    principal = _principals.get(user_id)
+    if principal is not None:
+        return principal
 
-    user = db.query(User).filter(
-        User.id == int(user_id)
-    ).first()
+    user = await db.get(User, user_id)
 
     if not user:
         raise HTTPException(
@@ -77,7 +176,50 @@ def get_current_user(
             detail="User not found"
         )
 
-    return user
+    principal = Principal.from_user(user)
+    _principals.put(user_id, principal, AUTH_CACHE_TTL_SECONDS)
+
+    return principal
+
+
+# ✅ Get Current Logged-in User
+async def get_current_user(
+    credentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+):
+    payload = _verify_token(credentials.credentials)
+
+    try:
+        user_id = int(payload["sub"])
+    except (TypeError, ValueError):
+        # e.g. a list or an object where the user id should be
+        raise _invalid_token()
+
+    return await _load_principal(db, user_id)
+
+
+# ✅ Identity From Signed Claims (no user lookup)
+async def get_token_claims(
+    credentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    For read-only endpoints that only need "who" and "which role". Tokens
+    issued before the role claim existed fall back to the user lookup.
+    """
+    payload = _verify_token(credentials.credentials)
+
+    try:
+        user_id = int(payload["sub"])
+    except (TypeError, ValueError):
+        # e.g. a list or an object where the user id should be
+        raise _invalid_token()
+
+    role = payload.get("role")
+    if role is None:
+        role = (await _load_principal(db, user_id)).role
+
+    return TokenClaims(id=user_id, role=role)
 
 
 # ✅ Recruiter Only Access
@@ -104,6 +246,18 @@ def require_candidate(
     return user
 
 
+# ✅ Recruiter Only Access, From Claims
+def require_recruiter_claims(
+    claims: TokenClaims = Depends(get_token_claims)
+):
+    if claims.role.lower() != "recruiter":
+        raise HTTPException(
+            status_code=403,
+            detail="Recruiter access required"
+        )
+    return claims
+
+
 def require_admin(
     user: User = Depends(get_current_user)
 ):
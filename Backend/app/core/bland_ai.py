@@ -1,5 +1,11 @@
-import requests
+from collections import defaultdict
 import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ProtocolError
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -7,22 +13,190 @@ load_dotenv()
 BLAND_API_KEY = os.getenv("BLAND_API_KEY")
 BLAND_WEBHOOK_SECRET = os.getenv("BLAND_WEBHOOK_SECRET")
 
+# Point BLAND_API_URL at a local stub server to exercise the dispatcher offline.
+BLAND_API_URL = os.getenv("BLAND_API_URL", "https://api.bland.ai/v1/calls")
+BLAND_WEBHOOK_URL = os.getenv(
+    "BLAND_WEBHOOK_URL",
+    "https://electrical-impermanently-trish.ngrok-free.dev/applications/bland-webhook"
+)
+BLAND_TIMEOUT_SECONDS = float(os.getenv("BLAND_TIMEOUT_SECONDS", "15"))
 
-def start_bland_interview(phone_number: str, candidate_name: str, job_title: str, application_id: int):
+# Limits apply per API process.
+BLAND_MAX_CONCURRENT_CALLS = int(os.getenv("BLAND_MAX_CONCURRENT_CALLS", "5"))
+BLAND_MAX_CONCURRENT_CALLS_PER_JOB = int(os.getenv("BLAND_MAX_CONCURRENT_CALLS_PER_JOB", "2"))
+BLAND_CALLS_PER_MINUTE = int(os.getenv("BLAND_CALLS_PER_MINUTE", "30"))
 
-    url = "https://api.bland.ai/v1/calls"
 
-    headers = {
-        "Authorization": BLAND_API_KEY,
-        "Content-Type": "application/json"
-    }
+# A gateway answering these may have forwarded the POST before the upstream
+# failed, so the call can be under way; every other 5xx is safe to resend.
+_GATEWAY_ERRORS = (502, 504)
+
+
+class BlandRetryableError(Exception):
+    """429 / 5xx / the request never reached Bland; ``retry_after`` is set when Bland sent one."""
+
+    def __init__(self, message: str, retry_after: float | None = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class BlandOutcomeUnknown(Exception):
+    """
+    The request was sent but no response came back (read timeout, dropped
+    connection): Bland may already be calling the candidate, so it must
+    not be sent again. The call webhook settles what happened.
+    """
+
+
+class BlandRejected(Exception):
+    """Bland refused the request (a 4xx other than 429); sending it again will not help."""
+
+
+class DispatcherBusy(Exception):
+    """No concurrency slot or rate-limit token right now; try again in ``wait`` seconds."""
+
+    def __init__(self, wait: float):
+        super().__init__(f"Bland dispatcher busy, retry in {wait:.1f}s")
+        self.wait = wait
+
+
+class RateLimiter:
+    """Token bucket refilled continuously at ``per_minute`` tokens per minute."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = max(per_minute, 1)
+        self.rate = self.capacity / 60.0
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self):
+        """Take a token and return 0, or return the seconds until one is available."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+
+            return (1 - self.tokens) / self.rate
+
+
+class BlandDispatcher:
+    """
+    Places outbound calls through one pooled HTTP session while enforcing a
+    global and per-job concurrency cap and a calls-per-minute budget.
+    """
+
+    def __init__(self, max_concurrent: int, max_per_job: int, calls_per_minute: int):
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=max_concurrent))
+        self.session.mount("http://", HTTPAdapter(pool_maxsize=max_concurrent))
+
+        self.max_per_job = max_per_job
+        self.rate_limiter = RateLimiter(calls_per_minute)
+
+        self._global = threading.BoundedSemaphore(max_concurrent)
+        self._per_job = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def _acquire(self, job_id: int):
+        if not self._global.acquire(blocking=False):
+            raise DispatcherBusy(1.0)
+
+        with self._lock:
+            if self._per_job[job_id] >= self.max_per_job:
+                self._global.release()
+                raise DispatcherBusy(1.0)
+            self._per_job[job_id] += 1
+
+        wait = self.rate_limiter.try_acquire()
+        if wait:
+            self._release(job_id)
+            raise DispatcherBusy(wait)
+
+    def _release(self, job_id: int):
+        with self._lock:
+            self._per_job[job_id] -= 1
+            if self._per_job[job_id] <= 0:
+                del self._per_job[job_id]
+        self._global.release()
+
+    def dispatch(self, job_id: int, payload: dict):
+        self._acquire(job_id)
+        try:
+            print("\n==============================")
+            print("CALLING BLAND AI...")
+            print("Phone:", payload["phone_number"])
+            print("==============================\n")
+
+            headers = {
+                "Authorization": BLAND_API_KEY,
+                "Content-Type": "application/json"
+            }
+
+            try:
+                response = self.session.post(
+                    BLAND_API_URL,
+                    json=payload,
+                    headers=headers,
+                    timeout=BLAND_TIMEOUT_SECONDS
+                )
+            except requests.ConnectTimeout as e:
+                raise BlandRetryableError(f"Bland request failed: {e}")
+            except requests.ConnectionError as e:
+                # a connection dropped mid-exchange may already have delivered the POST
+                if e.args and isinstance(e.args[0], ProtocolError):
+                    raise BlandOutcomeUnknown(f"Bland connection dropped: {e}")
+                raise BlandRetryableError(f"Bland request failed: {e}")
+            except requests.RequestException as e:
+                raise BlandOutcomeUnknown(f"Bland request failed, outcome unknown: {e}")
+
+            print("BLAND STATUS:", response.status_code)
+            print("BLAND RESPONSE:", response.text)
+
+            status = response.status_code
+
+            if status in _GATEWAY_ERRORS:
+                raise BlandOutcomeUnknown(f"Bland gateway returned {status}, outcome unknown")
+
+            if status == 429 or status >= 500:
+                retry_after = response.headers.get("Retry-After")
+                raise BlandRetryableError(
+                    f"Bland returned {status}",
+                    float(retry_after) if retry_after and retry_after.isdigit() else None
+                )
+
+            if status >= 400:
+                raise BlandRejected(f"Bland rejected the call with {status}: {response.text[:500]}")
+
+            try:
+                return response.json()
+            except ValueError:
+                # accepted, so the call may be placed; only the body is unreadable
+                raise BlandOutcomeUnknown(f"Bland returned {status} with a non-JSON body")
+
+        finally:
+            self._release(job_id)
+
+
+dispatcher = BlandDispatcher(
+    BLAND_MAX_CONCURRENT_CALLS,
+    BLAND_MAX_CONCURRENT_CALLS_PER_JOB,
+    BLAND_CALLS_PER_MINUTE
+)
+
+
+def start_bland_interview(phone_number: str, candidate_name: str, job_title: str, application_id: int, job_id: int = 0):
 
     payload = {
         "phone_number": phone_number,
         "task": f"Conduct a screening interview for {candidate_name} applying for {job_title}. Ask about experience, skills, and communication ability.",
         "voice": "maya",
         "language": "en",
-        "webhook": "https://electrical-impermanently-trish.ngrok-free.dev/applications/bland-webhook",
+        "webhook": BLAND_WEBHOOK_URL,
         "metadata": {
             "application_id": application_id
         },
@@ -31,14 +205,4 @@ def start_bland_interview(phone_number: str, candidate_name: str, job_title: str
         }
     }
 
-    print("\n==============================")
-    print("CALLING BLAND AI...")
-    print("Phone:", phone_number)
-    print("==============================\n")
-
-    response = requests.post(url, json=payload, headers=headers)
-
-    print("BLAND STATUS:", response.status_code)
-    print("BLAND RESPONSE:", response.text)
-
-    return response.json()
+    return dispatcher.dispatch(job_id, payload)
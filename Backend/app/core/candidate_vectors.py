@@ -0,0 +1,294 @@
+from dataclasses import dataclass
+import json
+import os
+import sys
+import threading
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from ..db.database import SessionLocal
+from ..models.application import CandidateApplication
+from ..models.candidate_vector import CandidateVector
+from ..models.job import JobListing
+from ..models.profile import Profile
+from ..models.resume_job import ResumeJob
+from ..models.resume_artifact import ResumeArtifact
+from ..models.user import User
+from .http_cache import bump_table_version, read_table_version
+from .idf_model import IdfModel, current_model, top_matches
+from .job_vectors import get_job_terms
+from .resume_artifacts import artifact_terms
+from .resume_scoring import term_counts
+
+# overlapping terms reported per sourced candidate
+SOURCING_TERMS = int(os.getenv("SOURCING_TERMS", "10"))
+
+# changed candidates kept beside the cached matrix before being merged into it
+CANDIDATE_DELTA_MAX_ROWS = int(os.getenv("CANDIDATE_DELTA_MAX_ROWS", "2000"))
+
+
+# ============================================================
+# INCREMENTAL UPDATES
+# ============================================================
+def _insert(db: Session):
+    dialect = db.get_bind().dialect.name
+    return (postgresql if dialect == "postgresql" else sqlite).insert
+
+
+def _upsert(db: Session, user_id: int, **values):
+    # the row carries the table version it was written at (see _apply_changes)
+    values["version"] = bump_table_version(db, CandidateVector.__tablename__)
+
+    # one statement, so two resume jobs of the same candidate cannot both insert the row
+    stmt = _insert(db)(CandidateVector)
+    db.execute(
+        stmt.values(user_id=user_id, **values)
+        .on_conflict_do_update(
+            index_elements=[CandidateVector.user_id],
+            set_={**values, "updated_at": func.now()}
+        )
+    )
+
+
+def store_resume_terms(db: Session, user_id: int, terms: dict):
+    """Record the candidate's latest resume. The caller commits."""
+    _upsert(db, user_id, resume_terms=json.dumps(terms))
+
+
+def store_skills_terms(db: Session, user_id: int, skills: str | None):
+    """Record the candidate's profile skills. The caller commits."""
+    _upsert(db, user_id, skills_terms=json.dumps(term_counts(skills)))
+
+
+# ============================================================
+# CANDIDATE MATRIX
+# ============================================================
+@dataclass
+class CandidateMatrix:
+    """
+    Every stored candidate (resume + skills terms) as one L2-normalized
+    TF-IDF row: a base matrix plus the rows written since it was built.
+    A changed candidate's base row is masked by ``superseded`` while its
+    new row lives in ``delta``; the delta is folded into the base once it
+    outgrows CANDIDATE_DELTA_MAX_ROWS. Never modified in place.
+    """
+    model: IdfModel
+    version: int
+    user_ids: np.ndarray
+    matrix: sparse.csr_matrix
+    superseded: np.ndarray
+    delta_ids: np.ndarray
+    delta: sparse.csr_matrix
+
+    def top(self, vector, k: int, terms: dict):
+        """``[(user_id, similarity, shared terms)]`` best first, ties by user id."""
+        matches = [
+            (int(self.user_ids[row]), similarity, shared)
+            for row, similarity, shared in top_matches(self.matrix, self.user_ids, vector, k, terms, self.superseded)
+        ] + [
+            (int(self.delta_ids[row]), similarity, shared)
+            for row, similarity, shared in top_matches(self.delta, self.delta_ids, vector, k, terms)
+        ]
+        return sorted(matches, key=lambda match: (-match[1], match[0]))[:k]
+
+
+_matrix: CandidateMatrix | None = None
+_lock = threading.Lock()
+_rebuilding = False
+
+
+def _combined_terms(row):
+    terms = json.loads(row.resume_terms) if row.resume_terms else {}
+    for term, count in (json.loads(row.skills_terms) if row.skills_terms else {}).items():
+        terms[term] = terms.get(term, 0) + count
+    return terms
+
+
+def _read_rows(db: Session, model: IdfModel, *criteria):
+    rows = db.execute(
+        select(CandidateVector.user_id, CandidateVector.resume_terms, CandidateVector.skills_terms)
+        .where(*criteria)
+        .order_by(CandidateVector.user_id)
+        .execution_options(yield_per=1000)
+    )
+
+    user_ids, terms = [], []
+    for row in rows:
+        user_ids.append(row.user_id)
+        terms.append(_combined_terms(row))
+
+    return np.asarray(user_ids, np.int64), model.transform_many(terms)
+
+
+def _build(db: Session, model: IdfModel):
+    # read first: rows written meanwhile are at most fetched again as changes
+    version, _ = read_table_version(db, CandidateVector.__tablename__)
+    user_ids, matrix = _read_rows(db, model)
+
+    print(f"🧮 Candidate matrix built: {len(user_ids)} candidates x {model.dimension} columns (model v{model.version})")
+
+    return CandidateMatrix(
+        model, version, user_ids, matrix,
+        np.zeros(len(user_ids), bool),
+        np.empty(0, np.int64), sparse.csr_matrix((0, model.dimension), dtype=np.float32)
+    )
+
+
+def _apply_changes(db: Session, current: CandidateMatrix, version: int):
+    """``current`` plus the rows written after it, up to table version ``version``."""
+    changed_ids, changed = _read_rows(
+        db, current.model,
+        CandidateVector.version > current.version,
+        CandidateVector.version <= version
+    )
+
+    superseded = current.superseded | np.isin(current.user_ids, changed_ids)
+    kept = ~np.isin(current.delta_ids, changed_ids)
+    delta_ids = np.concatenate([current.delta_ids[kept], changed_ids])
+    delta = sparse.vstack([current.delta[kept], changed], format="csr")
+
+    if len(delta_ids) <= CANDIDATE_DELTA_MAX_ROWS:
+        return CandidateMatrix(current.model, version, current.user_ids, current.matrix, superseded, delta_ids, delta)
+
+    # fold the delta in: copies the stored rows, no JSON is parsed again
+    live = ~superseded
+    user_ids = np.concatenate([current.user_ids[live], delta_ids])
+    matrix = sparse.vstack([current.matrix[live], delta], format="csr")
+
+    print(f"🧮 Candidate matrix merged {len(delta_ids)} changed row(s): {len(user_ids)} candidates")
+
+    return CandidateMatrix(
+        current.model, version, user_ids, matrix,
+        np.zeros(len(user_ids), bool),
+        np.empty(0, np.int64), sparse.csr_matrix((0, current.model.dimension), dtype=np.float32)
+    )
+
+
+def _rebuild_in_background(model: IdfModel):
+    def rebuild():
+        global _matrix, _rebuilding
+        db = SessionLocal()
+        try:
+            rebuilt = _build(db, model)
+            with _lock:
+                # changes written during the build are applied by the next request
+                _matrix = rebuilt
+        except Exception as e:
+            print("Candidate matrix rebuild failed:", e)
+        finally:
+            _rebuilding = False
+            db.close()
+
+    threading.Thread(target=rebuild, name="candidate-matrix-rebuild", daemon=True).start()
+
+
+def current_candidate_matrix(db: Session):
+    """
+    The cached matrix, with candidates written since it was built patched
+    in. A new IDF snapshot rebuilds it on a background thread while the
+    previous matrix (and its model) keeps being served.
+    """
+    global _matrix, _rebuilding
+
+    model = current_model()
+    version, _ = read_table_version(db, CandidateVector.__tablename__)
+
+    matrix = _matrix
+    if matrix is not None and matrix.model is model and matrix.version >= version:
+        return matrix
+
+    with _lock:
+        if _matrix is None:
+            # nothing to serve yet
+            _matrix = _build(db, model)
+
+        if _matrix.model is not model and not _rebuilding:
+            _rebuilding = True
+            _rebuild_in_background(model)
+
+        if _matrix.version < version:
+            _matrix = _apply_changes(db, _matrix, version)
+
+        return _matrix
+
+
+def source_candidates(db: Session, job: JobListing, limit: int):
+    """
+    Top-``limit`` stored candidates for a job:
+    ``[{user_id, name, score, matched_terms, applied}]``, best first.
+    """
+    candidates = current_candidate_matrix(db)
+    job_terms = get_job_terms(db, job)
+    if not job_terms:
+        return []
+
+    job_vector = candidates.model.transform(job_terms)
+    terms = {candidates.model.index(term): term for term in job_terms}
+
+    matches = candidates.top(job_vector, limit, terms)
+    user_ids = [user_id for user_id, _, _ in matches]
+
+    names = dict(db.execute(select(User.id, User.name).where(User.id.in_(user_ids))).all())
+    applied = set(db.scalars(
+        select(CandidateApplication.user_id).where(
+            CandidateApplication.job_id == job.id,
+            CandidateApplication.user_id.in_(user_ids)
+        )
+    ))
+
+    return [
+        {
+            "user_id": user_id,
+            "name": names.get(user_id),
+            "score": int(similarity * 100),
+            "matched_terms": shared[:SOURCING_TERMS],
+            "applied": user_id in applied,
+        }
+        for user_id, similarity, shared in matches
+        # a user deleted since the matrix was built has no name row
+        if user_id in names
+    ]
+
+
+# ============================================================
+# FULL REBUILD
+# ============================================================
+def rebuild_candidate_vectors(db: Session):
+    """Reload every candidate's latest processed resume (from its artifact) and profile skills."""
+    latest_resumes = dict(db.execute(
+        select(CandidateApplication.user_id, CandidateApplication.resume_hash)
+        .join(ResumeJob, ResumeJob.application_id == CandidateApplication.id)
+        .where(ResumeJob.status == "completed", CandidateApplication.resume_hash.isnot(None))
+        .order_by(ResumeJob.id)
+    ).all())
+
+    for user_id, digest in latest_resumes.items():
+        store_resume_terms(db, user_id, artifact_terms(db.get(ResumeArtifact, digest)))
+
+    skills = db.execute(
+        select(Profile.user_id, Profile.skills)
+        .join(User, User.id == Profile.user_id)
+        .where(User.role == "candidate", Profile.skills.isnot(None))
+    )
+    for user_id, text in skills:
+        store_skills_terms(db, user_id, text)
+
+    db.commit()
+
+    print(f"🧮 Candidate vectors rebuilt: {len(latest_resumes)} resumes")
+
+
+if __name__ == "__main__":
+    # python -m app.core.candidate_vectors rebuild
+    if sys.argv[1:] == ["rebuild"]:
+        db = SessionLocal()
+        try:
+            rebuild_candidate_vectors(db)
+        finally:
+            db.close()
+    else:
+        print("usage: python -m app.core.candidate_vectors rebuild")
@@ -0,0 +1,214 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+import os
+import threading
+import time
+
+from fastapi import Request, Response
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from ..models.job import JobListing
+from ..models.table_version import TableVersion
+
+# How long GET /jobs/ trusts its cached body before re-reading the table version.
+JOB_LIST_CACHE_SECONDS = float(os.getenv("JOB_LIST_CACHE_SECONDS", "5"))
+
+# Browsers may store the response but must revalidate it every time.
+CACHE_CONTROL = "no-cache"
+
+# tables whose in-process caches are keyed by their table_version row;
+# candidate_vector is written with upserts that call bump_table_version
+VERSIONED_TABLES = {
+    JobListing: JobListing.__tablename__,
+}
+
+
+# ============================================================
+# VERSION COUNTERS
+# ============================================================
+@event.listens_for(JobListing, "before_update")
+def _bump_row_version(mapper, connection, target):
+    # in SQL, so concurrent updates cannot hand out the same version twice
+    if Session.object_session(target).is_modified(target, include_collections=False):
+        target.version = JobListing.version + 1
+
+
+def _insert(connection):
+    return (postgresql if connection.dialect.name == "postgresql" else sqlite).insert
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_table_versions(session, flush_context):
+    changed = {
+        VERSIONED_TABLES[type(obj)]
+        for obj in session.new | session.dirty | session.deleted
+        if type(obj) in VERSIONED_TABLES
+        and (obj not in session.dirty or session.is_modified(obj, include_collections=False))
+    }
+    if not changed:
+        return
+
+    connection = session.connection()
+    stmt = _insert(connection)(TableVersion)
+    now = datetime.now(timezone.utc)
+    connection.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[TableVersion.name],
+            set_={"version": TableVersion.version + 1, "updated_at": stmt.excluded.updated_at}
+        ),
+        [{"name": name, "version": 1, "updated_at": now} for name in sorted(changed)]
+    )
+    session.info.setdefault("changed_tables", set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _drop_stale_responses(session):
+    if JobListing.__tablename__ in session.info.pop("changed_tables", ()):
+        job_list_cache.clear()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_tables(session):
+    session.info.pop("changed_tables", None)
+
+
+def bump_table_version(db: Session, name: str):
+    """
+    Count a write made outside the unit of work (a Core upsert), which
+    after_flush cannot see; returns the new version. The row stays locked
+    until the caller commits, so versions become visible in order.
+    """
+    connection = db.connection()
+    stmt = _insert(connection)(TableVersion)
+    version = connection.execute(
+        stmt.values(name=name, version=1, updated_at=datetime.now(timezone.utc))
+        .on_conflict_do_update(
+            index_elements=[TableVersion.name],
+            set_={"version": TableVersion.version + 1, "updated_at": stmt.excluded.updated_at}
+        )
+        .returning(TableVersion.version)
+    ).scalar_one()
+    db.info.setdefault("changed_tables", set()).add(name)
+    return version
+
+
+def read_table_version(db: Session, name: str):
+    """(version, updated_at); (0, None) before the table's first write."""
+    row = db.execute(
+        select(TableVersion.version, TableVersion.updated_at).where(TableVersion.name == name)
+    ).first()
+    return (row.version, row.updated_at) if row else (0, None)
+
+
+# ============================================================
+# CONDITIONAL REQUESTS
+# ============================================================
+def _utc(value: datetime | None):
+    if value is None:
+        return None
+    # SQLite hands back naive UTC timestamps
+    value = value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+    return value.replace(microsecond=0)
+
+
+def validators(etag: str, last_modified: datetime | None):
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_utc(last_modified), usegmt=True)
+    return headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime | None):
+    """RFC 9110 evaluation: If-None-Match (weak comparison) wins over If-Modified-Since."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        opaque = etag.removeprefix("W/")
+        return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return _utc(last_modified) <= since
+
+    return False
+
+
+def not_modified(etag: str, last_modified: datetime | None):
+    return Response(status_code=304, headers=validators(etag, last_modified))
+
+
+def json_response(body: bytes, etag: str, last_modified: datetime | None):
+    return Response(body, media_type="application/json", headers=validators(etag, last_modified))
+
+
+def job_etag(job: JobListing):
+    return f'W/"job-{job.id}-{job.version}"'
+
+
+def job_list_etag(version: int):
+    return f'W/"jobs-{version}"'
+
+
+# ============================================================
+# LIST CACHE
+# ============================================================
+@dataclass
+class CachedResponse:
+    version: int
+    body: bytes
+    etag: str
+    last_modified: datetime | None
+    checked_at: float
+
+
+class ResponseCache:
+    """
+    One serialized response per key, reused while the table version is
+    unchanged. Within JOB_LIST_CACHE_SECONDS of the last check it is served
+    without touching the database; commits made by this process clear it
+    immediately, other processes' writes show up after at most that long.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def fresh(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.monotonic() - entry.checked_at < self.ttl:
+                return entry
+            return None
+
+    def revalidate(self, key, version: int):
+        """The stale entry if it still matches ``version`` (and mark it fresh), else None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry.version == version:
+                entry.checked_at = time.monotonic()
+                return entry
+            return None
+
+    def put(self, key, version: int, body: bytes, etag: str, last_modified: datetime | None):
+        entry = CachedResponse(version, body, etag, last_modified, time.monotonic())
+        with self._lock:
+            self._entries[key] = entry
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+job_list_cache = ResponseCache(JOB_LIST_CACHE_SECONDS)
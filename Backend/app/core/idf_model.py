@@ -0,0 +1,375 @@
+from typing import NamedTuple
+import os
+import sys
+import threading
+import time
+import zlib
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy import delete
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from ..db.database import SessionLocal
+from ..models.idf import IdfTerm, IdfCorpus
+
+IDF_RELOAD_SECONDS = int(os.getenv("IDF_RELOAD_SECONDS", "300"))
+CORPUS_ID = 1
+
+# hashed indices shared by terms a snapshot has never seen
+IDF_OVERFLOW_BUCKETS = int(os.getenv("IDF_OVERFLOW_BUCKETS", str(2 ** 18)))
+
+# idf_term.term is a String(100); longer terms are counted and looked up by their prefix
+MAX_TERM_LENGTH = 100
+
+
+class SparseVector(NamedTuple):
+    # sorted term indices and their l2-normalized tf-idf weights
+    indices: np.ndarray
+    values: np.ndarray
+
+
+def dot(a: SparseVector, b: SparseVector):
+    _, a_pos, b_pos = np.intersect1d(
+        a.indices, b.indices, assume_unique=True, return_indices=True
+    )
+    return float(np.dot(a.values[a_pos], b.values[b_pos]))
+
+
+class IdfModel:
+    """
+    Immutable snapshot of the corpus IDF weights.
+
+    Terms the snapshot has never seen (e.g. a job created after the last
+    reload) are hashed into a fixed block of overflow indices after the
+    vocabulary, with the smoothed IDF of a zero document frequency. The
+    space never grows, so every vector built from one snapshot shares it;
+    unseen terms that collide in a bucket simply count as one term.
+    """
+
+    def __init__(self, version: int, doc_count: int, terms: list[str], doc_freq: np.ndarray):
+        self.version = version
+        self.doc_count = doc_count
+        self.vocabulary = {term: index for index, term in enumerate(terms)}
+
+        # Same smoothing as sklearn's TfidfVectorizer(smooth_idf=True).
+        self.idf = (np.log((1 + doc_count) / (1 + doc_freq)) + 1).astype(np.float32)
+        self.unseen_idf = float(np.log(1 + doc_count) + 1)
+
+    @property
+    def dimension(self):
+        return len(self.vocabulary) + IDF_OVERFLOW_BUCKETS
+
+    def index(self, term: str):
+        term = term[:MAX_TERM_LENGTH]
+        index = self.vocabulary.get(term)
+        if index is None:
+            index = len(self.vocabulary) + zlib.crc32(term.encode("utf-8")) % IDF_OVERFLOW_BUCKETS
+        return index
+
+    def transform(self, terms: dict):
+        if not terms:
+            return SparseVector(np.empty(0, np.int32), np.empty(0, np.float32))
+
+        indices = np.fromiter((self.index(t) for t in terms), np.int32, len(terms))
+        counts = np.fromiter(terms.values(), np.float32, len(terms))
+
+        # terms sharing a prefix or an overflow bucket add up; sorted as a side effect
+        indices, position = np.unique(indices, return_inverse=True)
+        counts = np.bincount(position, weights=counts).astype(np.float32)
+
+        known = indices < len(self.idf)
+        idf = np.full(len(indices), self.unseen_idf, np.float32)
+        idf[known] = self.idf[indices[known]]
+
+        values = counts * idf
+        values /= np.linalg.norm(values)
+
+        return SparseVector(indices, values)
+
+    def transform_many(self, documents: list[dict]):
+        """``transform`` for a batch: one L2-normalized CSR row per term dict."""
+        lengths = np.fromiter((len(terms) for terms in documents), np.int64, len(documents))
+        total = int(lengths.sum())
+
+        rows = np.repeat(np.arange(len(documents), dtype=np.int32), lengths)
+        cols = np.fromiter((self.index(t) for terms in documents for t in terms), np.int32, total)
+        counts = np.fromiter((c for terms in documents for c in terms.values()), np.float32, total)
+
+        idf = np.full(total, self.unseen_idf, np.float32)
+        known = cols < len(self.idf)
+        idf[known] = self.idf[cols[known]]
+
+        # duplicate (row, col) entries are summed, as in transform
+        matrix = sparse.csr_matrix(
+            (counts * idf, (rows, cols)),
+            shape=(len(documents), self.dimension),
+            dtype=np.float32
+        )
+
+        norms = np.sqrt(matrix.multiply(matrix).sum(axis=1)).A1
+        norms[norms == 0] = 1.0
+        return (sparse.diags((1.0 / norms).astype(np.float32)) @ matrix).tocsr()
+
+
+def top_matches(
+    matrix: sparse.csr_matrix,
+    row_ids: np.ndarray,
+    vector: SparseVector,
+    k: int,
+    terms: dict,
+    exclude: np.ndarray | None = None
+):
+    """
+    Rows of ``matrix`` most similar to ``vector`` (both from the same model),
+    as ``[(row, similarity, shared terms strongest first)]`` best first, ties
+    by id. ``terms`` maps the vector's indices back to words; rows flagged
+    in the boolean ``exclude`` never match.
+    """
+    indices, values = vector.indices, vector.values
+    if not len(indices) or not matrix.shape[0]:
+        return []
+
+    column = sparse.csr_matrix((values, indices, [0, len(indices)]), shape=(1, matrix.shape[1])).T
+    scores = (matrix @ column).toarray().ravel()
+    if exclude is not None:
+        scores[exclude] = 0
+
+    k = min(k, len(scores))
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.lexsort((row_ids[top], -scores[top]))]
+
+    weights = dict(zip(indices.tolist(), values.tolist()))
+
+    matches = []
+    for row in top:
+        if scores[row] <= 0:
+            break
+
+        start, end = matrix.indptr[row], matrix.indptr[row + 1]
+        shared = sorted(
+            (
+                (weight * weights[index], terms[index])
+                for index, weight in zip(matrix.indices[start:end].tolist(), matrix.data[start:end].tolist())
+                if index in weights
+            ),
+            reverse=True
+        )
+        matches.append((int(row), float(scores[row]), [term for _, term in shared]))
+
+    return matches
+
+
+# ============================================================
+# LOADING
+# ============================================================
+_model = IdfModel(0, 0, [], np.empty(0))
+_loaded_at = 0.0
+_reload_lock = threading.Lock()
+
+
+def _read_version(db: Session):
+    corpus = db.get(IdfCorpus, CORPUS_ID)
+    return (corpus.version, corpus.doc_count) if corpus else (0, 0)
+
+
+def load_idf_model(db: Session | None = None):
+    global _model, _loaded_at
+
+    own_session = db is None
+    db = db or SessionLocal()
+    try:
+        version, doc_count = _read_version(db)
+        rows = db.query(IdfTerm.term, IdfTerm.doc_freq).order_by(IdfTerm.term).all()
+    finally:
+        if own_session:
+            db.close()
+
+    terms = [term for term, _ in rows]
+    doc_freq = np.fromiter((df for _, df in rows), np.float32, len(rows))
+
+    _model = IdfModel(version, doc_count, terms, doc_freq)
+    _loaded_at = time.monotonic()
+
+    print(f"📚 IDF model v{version} loaded ({len(terms)} terms, {doc_count} docs)")
+
+    return _model
+
+
+def current_model():
+    """Return the loaded snapshot, refreshing it every IDF_RELOAD_SECONDS if the corpus moved."""
+    global _loaded_at
+
+    if time.monotonic() - _loaded_at < IDF_RELOAD_SECONDS:
+        return _model
+
+    with _reload_lock:
+        if time.monotonic() - _loaded_at < IDF_RELOAD_SECONDS:
+            return _model
+
+        db = SessionLocal()
+        try:
+            version, _ = _read_version(db)
+            if version != _model.version:
+                return load_idf_model(db)
+            _loaded_at = time.monotonic()
+        except Exception as e:
+            print("IDF model reload failed:", e)
+            _loaded_at = time.monotonic()
+        finally:
+            db.close()
+
+    return _model
+
+
+# ============================================================
+# INCREMENTAL UPDATES
+# ============================================================
+def _insert(db: Session):
+    dialect = db.get_bind().dialect.name
+    return (postgresql if dialect == "postgresql" else sqlite).insert
+
+
+def _stored_terms(terms):
+    return {term[:MAX_TERM_LENGTH] for term in terms}
+
+
+def _apply_counts(db: Session, deltas: dict, documents: int):
+    """Add ``deltas`` to the document frequencies and ``documents`` to the corpus size."""
+    insert = _insert(db)
+
+    term_stmt = insert(IdfTerm)
+    db.execute(
+        term_stmt.on_conflict_do_update(
+            index_elements=[IdfTerm.term],
+            set_={"doc_freq": IdfTerm.doc_freq + term_stmt.excluded.doc_freq}
+        ),
+        # sorted so concurrent upserts lock rows in one order
+        [{"term": term, "doc_freq": deltas[term]} for term in sorted(deltas)]
+    )
+
+    dropped = [term for term, delta in deltas.items() if delta < 0]
+    if dropped:
+        db.execute(delete(IdfTerm).where(IdfTerm.term.in_(dropped), IdfTerm.doc_freq <= 0))
+
+    corpus_stmt = insert(IdfCorpus).values(id=CORPUS_ID, doc_count=documents, version=1)
+    db.execute(
+        corpus_stmt.on_conflict_do_update(
+            index_elements=[IdfCorpus.id],
+            set_={
+                "doc_count": IdfCorpus.doc_count + documents,
+                "version": IdfCorpus.version + 1
+            }
+        )
+    )
+
+
+def add_document(db: Session, terms: dict):
+    """
+    Count one more document in the corpus: a job description, or a resume
+    the first time its content is seen (one per ResumeArtifact, as in
+    rebuild_idf_model). The caller commits.
+    """
+    if not terms:
+        return
+
+    _apply_counts(db, dict.fromkeys(_stored_terms(terms), 1), 1)
+
+
+def replace_document(db: Session, old_terms: dict, new_terms: dict):
+    """A counted document's text changed (an edited job description). The caller commits."""
+    old, new = _stored_terms(old_terms), _stored_terms(new_terms)
+    if old == new:
+        return
+
+    if not old or not new:
+        # an empty description is not a document
+        documents = 1 if new else -1
+    else:
+        documents = 0
+
+    deltas = {term: -1 for term in old - new}
+    deltas.update((term, 1) for term in new - old)
+    _apply_counts(db, deltas, documents)
+
+
+def rebuild_idf_model(db: Session):
+    """Recount document frequencies from every stored job description and resume."""
+    from ..models.job import JobListing
+    from ..models.resume_artifact import ResumeArtifact
+    from ..models.resume_job import ResumeJob
+    from .resume_artifacts import artifact_terms
+    from .resume_parser import resume_parser
+    from .resume_store import read_upload
+    from .resume_scoring import term_counts
+
+    doc_freq = {}
+    doc_count = 0
+
+    def count(terms):
+        nonlocal doc_count
+        if not terms:
+            return
+        doc_count += 1
+        # one count per document, also when several terms share a prefix
+        for term in _stored_terms(terms):
+            doc_freq[term] = doc_freq.get(term, 0) + 1
+
+    for (description,) in db.query(JobListing.description).yield_per(500):
+        count(term_counts(description))
+
+    # each distinct resume content once, however many jobs it was sent to
+    for artifact in db.query(ResumeArtifact).yield_per(100):
+        count(artifact_terms(artifact))
+
+    # uploads scored before artifacts existed: once per blob / file
+    legacy = (
+        db.query(ResumeJob.blob_hash, ResumeJob.file_path)
+        .outerjoin(ResumeArtifact, ResumeArtifact.content_hash == ResumeJob.blob_hash)
+        .filter(ResumeJob.status == "completed", ResumeArtifact.content_hash.is_(None))
+        .distinct()
+    )
+    seen = set()
+    for blob_hash, file_path in legacy:
+        # an imported upload keeps its old path; older jobs of the application share it
+        keys = {key for key in (blob_hash, file_path) if key}
+        if keys & seen:
+            continue
+        seen |= keys
+
+        try:
+            count(term_counts(resume_parser.extract(read_upload(blob_hash, file_path))))
+        except Exception as e:
+            print(f"Skipping {blob_hash or file_path}:", e)
+
+    db.execute(delete(IdfTerm))
+    if doc_freq:
+        db.execute(
+            IdfTerm.__table__.insert(),
+            [{"term": term, "doc_freq": df} for term, df in doc_freq.items()]
+        )
+
+    corpus = db.get(IdfCorpus, CORPUS_ID)
+    if not corpus:
+        corpus = IdfCorpus(id=CORPUS_ID, version=0)
+        db.add(corpus)
+
+    corpus.doc_count = doc_count
+    corpus.version = (corpus.version or 0) + 1
+
+    db.commit()
+
+    return load_idf_model(db)
+
+
+if __name__ == "__main__":
+    # python -m app.core.idf_model rebuild
+    if sys.argv[1:] == ["rebuild"]:
+        db = SessionLocal()
+        try:
+            rebuild_idf_model(db)
+        finally:
+            db.close()
+    else:
+        print("usage: python -m app.core.idf_model rebuild")
@@ -0,0 +1,334 @@
+from datetime import datetime, timedelta, timezone
+import hashlib
+import json
+import os
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .scheduler import schedule_task, task_handler, FailTask, RetryTask
+from ..db.database import SessionLocal
+from ..models.application import CandidateApplication
+from ..models.interview import Interview
+from ..models.webhook_event import WebhookEvent
+from .ai_interview_evaluator import evaluate_interview
+from .bland_ai import start_bland_interview, BlandOutcomeUnknown, BlandRejected, BlandRetryableError, DispatcherBusy
+from .leaderboard import update_performance_score
+from .resume_pipeline import interview_call_key
+from .workers import PollingWorkerPool
+
+WEBHOOK_WORKERS = int(os.getenv("WEBHOOK_WORKERS", "2"))
+WEBHOOK_EVENT_MAX_ATTEMPTS = int(os.getenv("WEBHOOK_EVENT_MAX_ATTEMPTS", "3"))
+WEBHOOK_EVENT_LEASE_SECONDS = int(os.getenv("WEBHOOK_EVENT_LEASE_SECONDS", "300"))
+
+
+# ============================================================
+# SCHEDULED CALLS
+# ============================================================
+@task_handler("bland_interview")
+def run_bland_interview(db: Session, payload: dict):
+    application = db.query(CandidateApplication).filter(
+        CandidateApplication.id == payload["application_id"]
+    ).first()
+
+    if not application:
+        return
+
+    # A recruiter may have decided in the meantime.
+    if application.status in ["shortlisted", "rejected", "hired"]:
+        print(f"Skipping interview call for application {application.id} ({application.status})")
+        return
+
+    candidate = application.user
+
+    try:
+        start_bland_interview(
+            candidate.phone,
+            candidate.name,
+            application.job.title,
+            application.id,
+            job_id=application.job_id
+        )
+    except DispatcherBusy as e:
+        raise RetryTask(str(e), delay=e.wait, count_attempt=False)
+    except BlandRetryableError as e:
+        raise RetryTask(str(e), delay=e.retry_after)
+    except BlandOutcomeUnknown as e:
+        # Re-sending could ring the candidate twice; if the call went out,
+        # its webhook moves the application on (and retries a no-answer).
+        raise FailTask(str(e))
+    except BlandRejected as e:
+        # No call was placed and none will be; don't leave the application
+        # waiting on a webhook that never comes.
+        application.status = "failed"
+        db.commit()
+        raise FailTask(str(e))
+
+
+# ============================================================
+# INBOX
+# ============================================================
+def store_webhook_event(db: Session, data: dict):
+    """
+    Persist a raw Bland event. Returns False when the (call_id, status)
+    pair was already received, i.e. a duplicate delivery.
+    """
+    raw = json.dumps(data, sort_keys=True, default=str)
+
+    call_id = data.get("call_id") or data.get("c_id")
+    if not call_id:
+        call_id = "payload:" + hashlib.sha256(raw.encode("utf-8")).hexdigest()[:64]
+
+    event = WebhookEvent(
+        call_id=str(call_id)[:100],
+        status=(data.get("status") or "").lower()[:30],
+        payload=raw,
+        state="pending",
+        attempts=0
+    )
+
+    db.add(event)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        return False
+
+    webhook_workers.wake()
+
+    return True
+
+
+# ============================================================
+# EVENT HANDLING (previously inline in bland_webhook)
+# ============================================================
+def handle_bland_event(db: Session, data: dict):
+    status = (data.get("status") or "").lower()
+    metadata = data.get("metadata", {})
+    application_id = metadata.get("application_id")
+
+    if not application_id:
+        return "Missing application_id"
+
+    application = db.query(CandidateApplication).filter(
+        CandidateApplication.id == application_id
+    ).first()
+
+    if not application:
+        return "Application not found"
+
+    # ============================================================
+    # FAILED CALL HANDLING
+    # ============================================================
+    if status in ["no_answer", "busy", "failed"]:
+        application.status = status
+
+        if application.retry_count < 1:
+            application.retry_count += 1
+
+            schedule_task(
+                db,
+                "bland_interview",
+                datetime.now(timezone.utc) + timedelta(minutes=2),
+                {"application_id": application.id},
+                dedupe_key=interview_call_key(application.id)
+            )
+
+            return "Retry scheduled"
+
+        return f"Call ended with status: {status}"
+
+    # ============================================================
+    # CALL STARTED
+    # ============================================================
+    if status in ["answered", "in_progress"]:
+        # Events may be processed out of order; never undo a final decision.
+        if application.status in ["shortlisted", "rejected"]:
+            return "Ignoring stale start event"
+
+        application.status = "interview_in_progress"
+        return "Interview started"
+
+    if status != "completed":
+        return "Ignoring non-completed event"
+
+    transcript = data.get("concatenated_transcript")
+    if not transcript:
+        return "Missing transcript"
+
+    # ============================================================
+    # SAVE INTERVIEW
+    # ============================================================
+    interview = db.query(Interview).filter(
+        Interview.candidate_application_id == application.id
+    ).first()
+
+    if not interview:
+        interview = Interview(
+            candidate_application_id=application.id
+        )
+        db.add(interview)
+
+    interview.transcript = transcript
+    interview.duration = int(data.get("corrected_duration", 0))
+    interview.started_at = data.get("started_at")
+    interview.ended_at = data.get("ended_at")
+
+    # ============================================================
+    # AI INTERVIEW ANALYSIS (Gemini AI)
+    # ============================================================
+    evaluation = evaluate_interview(
+        transcript=transcript,
+        job_description=application.job.description
+    )
+
+    application.voice_score = evaluation["voice_score"]
+    application.communication_score = evaluation["communication_score"]
+    application.technical_score = evaluation["technical_score"]
+    application.confidence_score = evaluation["confidence_score"]
+    application.interview_feedback = evaluation["feedback"]
+
+    interview.strengths = evaluation["strengths"]
+    interview.weaknesses = evaluation["weaknesses"]
+    interview.recommendation = evaluation["recommendation"]
+    application.retry_count = 0
+    update_performance_score(application)
+
+    # ============================================================
+    # FINAL DECISION
+    # ============================================================
+    apply_interview_decision(application)
+
+    return "Interview processed successfully"
+
+
+def apply_interview_decision(application: CandidateApplication):
+    """Shortlist at or above the job's interview threshold, reject below it. The caller commits."""
+    job = application.job
+
+    if job.interview_min_score and application.voice_score >= job.interview_min_score:
+        application.status = "shortlisted"
+    else:
+        application.status = "rejected"
+
+    application.auto_status = application.status
+
+
+# ============================================================
+# WORKER
+# ============================================================
+def _fail_abandoned_events(db: Session, lease_cutoff: datetime):
+    """Events whose lease expired on their last attempt crashed their worker every time; fail them."""
+    abandoned = (
+        (WebhookEvent.state == "processing")
+        & (WebhookEvent.locked_at < lease_cutoff)
+        & (WebhookEvent.attempts >= WEBHOOK_EVENT_MAX_ATTEMPTS)
+    )
+
+    event_ids = db.scalars(
+        select(WebhookEvent.id)
+        .where(abandoned)
+        .with_for_update(skip_locked=True)
+    ).all()
+
+    if not event_ids:
+        return
+
+    db.execute(
+        update(WebhookEvent)
+        .where(WebhookEvent.id.in_(event_ids), abandoned)
+        .values(
+            state="failed",
+            error="Worker lost on the last attempt",
+            locked_at=None
+        )
+    )
+    db.commit()
+
+    print(f"Failed {len(event_ids)} webhook event(s) whose worker was lost on every attempt")
+
+
+def claim_webhook_event():
+    db = SessionLocal()
+    try:
+        now = datetime.now(timezone.utc)
+        lease_cutoff = now - timedelta(seconds=WEBHOOK_EVENT_LEASE_SECONDS)
+
+        _fail_abandoned_events(db, lease_cutoff)
+
+        claimable = or_(
+            WebhookEvent.state == "pending",
+            (WebhookEvent.state == "processing")
+            & (WebhookEvent.locked_at < lease_cutoff)
+            & (WebhookEvent.attempts < WEBHOOK_EVENT_MAX_ATTEMPTS)
+        )
+
+        candidate = (
+            db.query(WebhookEvent.id)
+            .filter(claimable)
+            .order_by(WebhookEvent.id)
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+
+        if not candidate:
+            db.rollback()
+            return None
+
+        claimed = db.execute(
+            update(WebhookEvent)
+            .where(WebhookEvent.id == candidate.id, claimable)
+            .values(
+                state="processing",
+                locked_at=now,
+                attempts=WebhookEvent.attempts + 1
+            )
+        )
+        db.commit()
+
+        return candidate.id if claimed.rowcount == 1 else None
+
+    finally:
+        db.close()
+
+
+def process_webhook_event(event_id: int):
+    db = SessionLocal()
+    try:
+        event = db.query(WebhookEvent).filter(WebhookEvent.id == event_id).first()
+        if not event or event.state != "processing":
+            return
+
+        try:
+            result = handle_bland_event(db, json.loads(event.payload))
+        except Exception as e:
+            db.rollback()
+            print(f"Webhook event {event_id} failed:", e)
+
+            event.error = str(e)[:2000]
+            event.locked_at = None
+            event.state = "failed" if event.attempts >= WEBHOOK_EVENT_MAX_ATTEMPTS else "pending"
+
+            db.commit()
+            return
+
+        # Marked processed in the same transaction as the application
+        # changes, so a crash can never apply an event twice.
+        event.state = "processed"
+        event.result = result
+        event.error = None
+        event.processed_at = datetime.now(timezone.utc)
+
+        db.commit()
+
+    finally:
+        db.close()
+
+
+webhook_workers = PollingWorkerPool(
+    "webhook",
+    claim_webhook_event,
+    process_webhook_event,
+    size=WEBHOOK_WORKERS
+)
@@ -0,0 +1,154 @@
+from dataclasses import dataclass
+import json
+import os
+import threading
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..db.database import SessionLocal
+from ..models.job import JobListing, JobStatus
+from ..models.job_artifact import JobTextArtifact
+from .http_cache import read_table_version
+from .idf_model import IdfModel, current_model, top_matches
+from .job_vectors import description_hash
+from .resume_scoring import term_counts
+
+# overlapping terms reported per matched job
+MATCH_TERMS = int(os.getenv("MATCH_TERMS", "10"))
+
+
+@dataclass
+class JobMatrix:
+    """
+    Every open job as one row of L2-normalized TF-IDF weights. Rows are
+    built under one IDF snapshot, so a resume transformed with the same
+    model scores against all of them in a single sparse product.
+    """
+    model: IdfModel
+    jobs_version: int
+    job_ids: np.ndarray
+    matrix: sparse.csr_matrix
+
+
+_matrix: JobMatrix | None = None
+_lock = threading.Lock()
+_rebuilding = False
+
+
+def _open_job_terms(db: Session):
+    """(job ids, term dicts) for every open job, read in one pass."""
+    rows = db.execute(
+        select(
+            JobListing.id,
+            JobListing.description,
+            JobTextArtifact.description_hash,
+            JobTextArtifact.term_counts
+        )
+        .outerjoin(JobTextArtifact, JobTextArtifact.job_id == JobListing.id)
+        .where(JobListing.status == JobStatus.open)
+        .order_by(JobListing.id)
+        .execution_options(yield_per=1000)
+    )
+
+    job_ids, terms = [], []
+    for row in rows:
+        job_ids.append(row.id)
+        if row.term_counts is not None and row.description_hash == description_hash(row.description):
+            terms.append(json.loads(row.term_counts))
+        else:
+            # missing or stale artifact; core.job_vectors repairs it on the next scoring
+            terms.append(term_counts(row.description))
+
+    return job_ids, terms
+
+
+def _build(db: Session, model: IdfModel, jobs_version: int):
+    job_ids, terms = _open_job_terms(db)
+    matrix = model.transform_many(terms)
+
+    print(f"🧮 Job matrix built: {len(job_ids)} open jobs x {model.dimension} columns (model v{model.version})")
+
+    return JobMatrix(model, jobs_version, np.asarray(job_ids), matrix)
+
+
+def _rebuild_in_background():
+    def rebuild():
+        global _matrix, _rebuilding
+        db = SessionLocal()
+        try:
+            # versions read here, so every write up to the build is included
+            model = current_model()
+            jobs_version, _ = read_table_version(db, JobListing.__tablename__)
+            rebuilt = _build(db, model, jobs_version)
+            with _lock:
+                _matrix = rebuilt
+        except Exception as e:
+            print("Job matrix rebuild failed:", e)
+        finally:
+            _rebuilding = False
+            db.close()
+
+    threading.Thread(target=rebuild, name="job-matrix-rebuild", daemon=True).start()
+
+
+def current_job_matrix(db: Session):
+    """
+    The cached matrix. When the IDF snapshot or the job_listing table
+    version moves, one rebuild runs on a background thread and the
+    previous matrix keeps being served until it is done; only the very
+    first build happens on the request.
+    """
+    global _matrix, _rebuilding
+
+    model = current_model()
+    jobs_version, _ = read_table_version(db, JobListing.__tablename__)
+
+    matrix = _matrix
+    if matrix is not None and matrix.model is model and matrix.jobs_version == jobs_version:
+        return matrix
+
+    with _lock:
+        if _matrix is None:
+            _matrix = _build(db, model, jobs_version)
+        elif not _rebuilding and (_matrix.model is not model or _matrix.jobs_version != jobs_version):
+            _rebuilding = True
+            _rebuild_in_background()
+
+        return _matrix
+
+
+def match_jobs(db: Session, resume_terms: dict, k: int):
+    """
+    Top-``k`` open jobs for one resume: ``[{job_id, title, score, matched_terms}]``.
+    ``score`` is on the same 0-100 scale as ``score_vectors``.
+    """
+    jobs = current_job_matrix(db)
+    if not resume_terms or not len(jobs.job_ids):
+        return []
+
+    resume = jobs.model.transform(resume_terms)
+    terms = {jobs.model.index(term): term for term in resume_terms}
+    matches = top_matches(jobs.matrix, jobs.job_ids, resume, k, terms)
+
+    # the matrix may predate an edit: titles and open status come from the table
+    job_ids = [int(jobs.job_ids[row]) for row, _, _ in matches]
+    titles = dict(db.execute(
+        select(JobListing.id, JobListing.title).where(
+            JobListing.id.in_(job_ids),
+            JobListing.status == JobStatus.open
+        )
+    ).all())
+
+    return [
+        {
+            "job_id": job_id,
+            "title": titles[job_id],
+            "score": int(similarity * 100),
+            "matched_terms": shared[:MATCH_TERMS],
+        }
+        for job_id, (_, similarity, shared) in zip(job_ids, matches)
+        if job_id in titles
+    ]
@@ -0,0 +1,320 @@
+from dataclasses import dataclass
+import math
+import os
+import threading
+import time
+
+from sqlalchemy import Double, and_, cast, event, func, literal_column, or_, select
+from sqlalchemy.orm import Session
+
+from ..db.database import engine
+from ..models.job import JobListing
+from .resume_scoring import analyze
+
+JOB_SEARCH_RELOAD_SECONDS = int(os.getenv("JOB_SEARCH_RELOAD_SECONDS", "300"))
+
+# Postgres matches on an expression GIN index over this document (see the
+# job_search migration); the two must stay identical for the index to be used.
+SEARCH_DOCUMENT = (
+    "(setweight(to_tsvector('english', coalesce(job_listing.title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(job_listing.role, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(job_listing.description, '')), 'C'))"
+)
+
+# Inverted-index fallback: same A/B/C field ordering, BM25 scoring.
+FIELD_WEIGHTS = (("title", 3), ("role", 2), ("description", 1))
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+USE_INVERTED_INDEX = engine.dialect.name != "postgresql"
+
+
+def _status_value(status):
+    return getattr(status, "value", status)
+
+
+def _like_pattern(value: str):
+    term = value.strip().lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{term}%"
+
+
+# ============================================================
+# POSTGRES
+# ============================================================
+def _sql_filters(location, mode, experience, status):
+    filters = []
+
+    if location:
+        filters.append(func.lower(JobListing.location).like(_like_pattern(location), escape="\\"))
+    if mode:
+        filters.append(func.lower(JobListing.mode) == mode.strip().lower())
+    if experience is not None:
+        filters.append(or_(
+            JobListing.experience_required.is_(None),
+            JobListing.experience_required <= experience
+        ))
+    if status:
+        filters.append(JobListing.status == status)
+
+    return filters
+
+
+def _search_postgres(db: Session, q, filters, after, limit):
+    if q:
+        document = literal_column(SEARCH_DOCUMENT)
+        query = func.websearch_to_tsquery(literal_column("'english'"), q)
+        # double, not ts_rank's real, so the value round-trips through the cursor
+        score = cast(func.ts_rank(document, query), Double)
+
+        stmt = select(JobListing, score).where(document.op("@@")(query), *filters)
+        if after:
+            stmt = stmt.where(or_(
+                score < after[0],
+                and_(score == after[0], JobListing.id < after[1])
+            ))
+        stmt = stmt.order_by(score.desc(), JobListing.id.desc())
+    else:
+        stmt = select(JobListing, literal_column("NULL")).where(*filters)
+        if after:
+            stmt = stmt.where(JobListing.id < after[0])
+        stmt = stmt.order_by(JobListing.id.desc())
+
+    return [(job, score) for job, score in db.execute(stmt.limit(limit + 1))]
+
+
+# ============================================================
+# INVERTED INDEX (SQLite and other dialects without tsvector)
+# ============================================================
+@dataclass
+class _Document:
+    terms: tuple
+    length: int
+    location: str
+    mode: str
+    experience: int | None
+    status: str | None
+
+
+def _snapshot(job: JobListing):
+    return {
+        "title": job.title,
+        "role": job.role,
+        "description": job.description,
+        "location": job.location,
+        "mode": job.mode,
+        "experience_required": job.experience_required,
+        "status": _status_value(job.status),
+    }
+
+
+class InvertedIndex:
+    """term -> {job_id: field-weighted term frequency}, plus the filterable columns."""
+
+    def __init__(self):
+        self.postings = {}
+        self.documents = {}
+        self.total_length = 0
+        self._lock = threading.Lock()
+
+    def _remove(self, job_id):
+        document = self.documents.pop(job_id, None)
+        if document is None:
+            return
+
+        self.total_length -= document.length
+        for term in document.terms:
+            del self.postings[term][job_id]
+            if not self.postings[term]:
+                del self.postings[term]
+
+    def _add(self, job_id, fields):
+        frequencies = {}
+        for field, weight in FIELD_WEIGHTS:
+            for term in analyze(fields[field] or ""):
+                frequencies[term] = frequencies.get(term, 0) + weight
+
+        for term, frequency in frequencies.items():
+            self.postings.setdefault(term, {})[job_id] = frequency
+
+        length = sum(frequencies.values())
+        self.total_length += length
+        self.documents[job_id] = _Document(
+            terms=tuple(frequencies),
+            length=length,
+            location=(fields["location"] or "").lower(),
+            mode=(fields["mode"] or "").lower(),
+            experience=fields["experience_required"],
+            status=fields["status"],
+        )
+
+    def apply(self, changes: dict):
+        """``{job_id: fields}`` to (re)index, ``{job_id: None}`` to drop."""
+        with self._lock:
+            for job_id, fields in changes.items():
+                self._remove(job_id)
+                if fields is not None:
+                    self._add(job_id, fields)
+
+    def _matches(self, document, location, mode, experience, status):
+        if location and location.strip().lower() not in document.location:
+            return False
+        if mode and document.mode != mode.strip().lower():
+            return False
+        if experience is not None and document.experience is not None and document.experience > experience:
+            return False
+        if status and document.status != status:
+            return False
+        return True
+
+    def search(self, q, location, mode, experience, status):
+        """[(score, job_id)] for every matching job, unsorted. ``score`` is None without ``q``."""
+        with self._lock:
+            if not q:
+                return [
+                    (None, job_id)
+                    for job_id, document in self.documents.items()
+                    if self._matches(document, location, mode, experience, status)
+                ]
+
+            terms = set(analyze(q))
+            postings = [self.postings.get(term, {}) for term in terms]
+            if not postings or not all(postings):
+                return []
+
+            # every term must match, like websearch_to_tsquery
+            postings.sort(key=len)
+            candidates = set(postings[0]).intersection(*postings[1:])
+
+            total = len(self.documents)
+            average_length = self.total_length / total if total else 1.0
+
+            results = []
+            for job_id in candidates:
+                document = self.documents[job_id]
+                if not self._matches(document, location, mode, experience, status):
+                    continue
+
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * document.length / average_length)
+                score = 0.0
+                for jobs in postings:
+                    idf = math.log(1 + (total - len(jobs) + 0.5) / (len(jobs) + 0.5))
+                    frequency = jobs[job_id]
+                    score += idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+                results.append((score, job_id))
+
+            return results
+
+
+_index: InvertedIndex | None = None
+_built_at = 0.0
+_build_lock = threading.Lock()
+
+
+def build_index(db: Session):
+    global _index, _built_at
+
+    index = InvertedIndex()
+    rows = db.execute(select(
+        JobListing.id, JobListing.title, JobListing.role, JobListing.description,
+        JobListing.location, JobListing.mode, JobListing.experience_required, JobListing.status
+    ).execution_options(yield_per=500))
+    index.apply({row.id: _snapshot(row) for row in rows})
+
+    _index = index
+    _built_at = time.monotonic()
+
+    print(f"🔎 Job search index built ({len(index.documents)} jobs, {len(index.postings)} terms)")
+
+    return index
+
+
+def _current_index(db: Session):
+    """Built on first use; rebuilt every JOB_SEARCH_RELOAD_SECONDS to pick up writes from other processes."""
+    if _index is not None and time.monotonic() - _built_at < JOB_SEARCH_RELOAD_SECONDS:
+        return _index
+
+    with _build_lock:
+        if _index is not None and time.monotonic() - _built_at < JOB_SEARCH_RELOAD_SECONDS:
+            return _index
+        return build_index(db)
+
+
+def _search_inverted(db: Session, q, location, mode, experience, status, after, limit):
+    if q and not analyze(q):
+        return []
+
+    results = _current_index(db).search(q, location, mode, experience, status)
+
+    if q:
+        if after:
+            results = [
+                (score, job_id) for score, job_id in results
+                if score < after[0] or (score == after[0] and job_id < after[1])
+            ]
+        results.sort(key=lambda result: (-result[0], -result[1]))
+    else:
+        if after:
+            results = [result for result in results if result[1] < after[0]]
+        results.sort(key=lambda result: -result[1])
+
+    page = results[:limit + 1]
+    jobs = {
+        job.id: job
+        for job in db.scalars(select(JobListing).where(JobListing.id.in_([job_id for _, job_id in page])))
+    }
+
+    # a job deleted since it was indexed is skipped
+    return [(jobs[job_id], score) for score, job_id in page if job_id in jobs]
+
+
+# Keep the in-process index in step with ORM writes made by this process.
+if USE_INVERTED_INDEX:
+    @event.listens_for(Session, "after_flush")
+    def _collect_job_changes(session, flush_context):
+        pending = None
+        for obj in session.new | session.dirty:
+            if isinstance(obj, JobListing):
+                pending = pending if pending is not None else session.info.setdefault("job_search", {})
+                pending[obj.id] = _snapshot(obj)
+        for obj in session.deleted:
+            if isinstance(obj, JobListing):
+                pending = pending if pending is not None else session.info.setdefault("job_search", {})
+                pending[obj.id] = None
+
+    @event.listens_for(Session, "after_commit")
+    def _apply_job_changes(session):
+        changes = session.info.pop("job_search", None)
+        if changes and _index is not None:
+            _index.apply(changes)
+
+    @event.listens_for(Session, "after_rollback")
+    def _discard_job_changes(session):
+        session.info.pop("job_search", None)
+
+
+# ============================================================
+# ENTRY POINT
+# ============================================================
+def search_jobs(
+    db: Session,
+    q: str | None,
+    location: str | None,
+    mode: str | None,
+    experience: int | None,
+    status: str | None,
+    after: list | None,
+    limit: int
+):
+    """
+    One page of ``[(job, score)]``, best match first (newest first without
+    ``q``), plus whether more rows follow. ``after`` is the decoded cursor:
+    ``[score, id]`` with ``q``, ``[id]`` without.
+    """
+    q = (q or "").strip() or None
+
+    if USE_INVERTED_INDEX:
+        rows = _search_inverted(db, q, location, mode, experience, status, after, limit)
+    else:
+        rows = _search_postgres(db, q, _sql_filters(location, mode, experience, status), after, limit)
+
+    return rows[:limit], len(rows) > limit
@@ -0,0 +1,101 @@
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import threading
+
+from sqlalchemy.orm import Session
+
+from ..models.job import JobListing
+from ..models.job_artifact import JobTextArtifact
+from .idf_model import current_model
+from .resume_scoring import term_counts
+
+JOB_VECTOR_CACHE_SIZE = int(os.getenv("JOB_VECTOR_CACHE_SIZE", "512"))
+
+# (job_id, description_hash) -> {"terms": {term: count}, "model": IdfModel, "vector": SparseVector}
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+
+def description_hash(description: str | None):
+    return hashlib.sha256((description or "").encode("utf-8")).hexdigest()
+
+
+def _cache_get(key):
+    with _lock:
+        entry = _cache.get(key)
+        if entry is not None:
+            _cache.move_to_end(key)
+        return entry
+
+
+def _cache_put(key, terms):
+    entry = {"terms": terms, "model": None, "vector": None}
+    with _lock:
+        _cache[key] = entry
+        _cache.move_to_end(key)
+        while len(_cache) > JOB_VECTOR_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return entry
+
+
+def refresh_job_terms(db: Session, job: JobListing):
+    """
+    Tokenize the job description once and store the term counts.
+    Called when a job is created or its description changes; the caller commits.
+    Returns the cache entry.
+    """
+    digest = description_hash(job.description)
+    terms = term_counts(job.description)
+
+    artifact = db.get(JobTextArtifact, job.id)
+    if not artifact:
+        artifact = JobTextArtifact(job_id=job.id)
+        db.add(artifact)
+
+    artifact.description_hash = digest
+    artifact.term_counts = json.dumps(terms)
+
+    return _cache_put((job.id, digest), terms)
+
+
+def _get_entry(db: Session, job: JobListing):
+    """LRU -> job_text_artifact -> recompute, keyed by job id and description hash."""
+    digest = description_hash(job.description)
+    key = (job.id, digest)
+
+    entry = _cache_get(key)
+    if entry is not None:
+        return entry
+
+    artifact = db.get(JobTextArtifact, job.id)
+    if artifact and artifact.description_hash == digest:
+        return _cache_put(key, json.loads(artifact.term_counts))
+
+    # Missing or stale (description edited outside the jobs router);
+    # persisted with the caller's next commit.
+    return refresh_job_terms(db, job)
+
+
+def get_job_terms(db: Session, job: JobListing):
+    return _get_entry(db, job)["terms"]
+
+
+def get_job_vector(db: Session, job: JobListing, model=None):
+    """TF-IDF vector of the job under ``model``, recomputed only when the IDF snapshot changes."""
+    model = model or current_model()
+    entry = _get_entry(db, job)
+
+    with _lock:
+        cached_model, vector = entry["model"], entry["vector"]
+    if cached_model is model:
+        return vector
+
+    # computed outside the lock; the pair is swapped in together, so no
+    # reader sees one snapshot's vector labelled with another's model
+    vector = model.transform(entry["terms"])
+    with _lock:
+        entry["model"], entry["vector"] = model, vector
+
+    return vector
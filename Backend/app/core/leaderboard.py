@@ -0,0 +1,87 @@
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..models.application import CandidateApplication
+from ..models.user import User
+
+
+def update_performance_score(application: CandidateApplication):
+    """
+    Recompute the stored performance score (average of the available scores).
+    Call after any write that touches a score; the caller commits.
+    """
+    score_parts = [
+        application.resume_score,
+        application.voice_score,
+        application.communication_score,
+        application.technical_score,
+        application.confidence_score
+    ]
+
+    valid_scores = [s for s in score_parts if s is not None]
+
+    application.performance_score = (
+        round(sum(valid_scores) / len(valid_scores), 2)
+        if valid_scores else None
+    )
+
+    return application.performance_score
+
+
+def top_candidates(db: Session, job_id: int, limit: int):
+    """Top-N scored applications for a job, read straight off (job_id, performance_score)."""
+    return (
+        db.query(
+            CandidateApplication.id,
+            CandidateApplication.user_id,
+            User.name.label("candidate_name"),
+            CandidateApplication.performance_score,
+            CandidateApplication.status
+        )
+        .join(User, User.id == CandidateApplication.user_id)
+        .filter(
+            CandidateApplication.job_id == job_id,
+            CandidateApplication.performance_score.isnot(None)
+        )
+        .order_by(
+            CandidateApplication.performance_score.desc(),
+            CandidateApplication.id
+        )
+        .limit(limit)
+        .all()
+    )
+
+
+def candidate_rank(db: Session, application: CandidateApplication):
+    """Rank (1 = best) and percentile of an application among the scored ones for its job."""
+    score = application.performance_score
+
+    scored = CandidateApplication.performance_score.isnot(None)
+    same_job = CandidateApplication.job_id == application.job_id
+
+    total = (
+        db.query(func.count(CandidateApplication.id))
+        .filter(same_job, scored)
+        .scalar()
+    )
+
+    if score is None:
+        return {"rank": None, "out_of": total, "percentile": None}
+
+    better = (
+        db.query(func.count(CandidateApplication.id))
+        .filter(same_job, CandidateApplication.performance_score > score)
+        .scalar()
+    )
+    worse = (
+        db.query(func.count(CandidateApplication.id))
+        .filter(same_job, CandidateApplication.performance_score < score)
+        .scalar()
+    )
+
+    return {
+        "rank": better + 1,
+        "out_of": total,
+        # share of scored candidates this one beats
+        "percentile": round(100 * worse / total, 1) if total else None
+    }
@@ -0,0 +1,205 @@
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from ..db.database import SessionLocal
+from ..models.llm_cache import LLMResponseCache
+from .scheduler import task_handler
+
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "1024"))
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+
+# expired llm_response_cache rows are deleted this often, this many per statement
+LLM_CACHE_SWEEP_SECONDS = int(os.getenv("LLM_CACHE_SWEEP_SECONDS", "3600"))
+LLM_CACHE_SWEEP_BATCH = int(os.getenv("LLM_CACHE_SWEEP_BATCH", "1000"))
+
+
+def make_key(*parts: str):
+    """sha256 over model name, prompt template version and the (truncated) inputs."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update((part or "").encode("utf-8"))
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+
+
+class LLMCache:
+    """
+    Two-tier cache for parsed LLM responses: an in-process LRU with TTL in
+    front of the ``llm_response_cache`` table, so every worker process shares
+    results while hot keys never leave memory.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: int):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+        self.miss_seconds = 0.0
+
+    # ---------------- MEMORY TIER ----------------
+    def _memory_get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def _memory_put(self, key, value, ttl_seconds):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    # ---------------- DB TIER ----------------
+    def _db_get(self, key):
+        db = SessionLocal()
+        try:
+            row = db.get(LLMResponseCache, key)
+            if not row:
+                return None, 0
+
+            expires_at = row.expires_at
+            if expires_at.tzinfo is None:
+                # SQLite drops the offset; values are always written in UTC
+                expires_at = expires_at.replace(tzinfo=timezone.utc)
+
+            remaining = (expires_at - datetime.now(timezone.utc)).total_seconds()
+            if remaining <= 0:
+                return None, 0
+
+            return json.loads(row.response), remaining
+        finally:
+            db.close()
+
+    def _db_put(self, key, value, model):
+        db = SessionLocal()
+        try:
+            db.merge(LLMResponseCache(
+                cache_key=key,
+                model=model,
+                response=json.dumps(value),
+                expires_at=datetime.now(timezone.utc) + timedelta(seconds=self.ttl_seconds)
+            ))
+            db.commit()
+        finally:
+            db.close()
+
+    # ---------------- PUBLIC ----------------
+    def get_or_compute(self, key: str, compute, model: str):
+        """
+        Return the cached response for ``key`` or call ``compute()`` and cache
+        its result. Exceptions from ``compute`` propagate and nothing is cached.
+        """
+        value = self._memory_get(key)
+        if value is not None:
+            with self._lock:
+                self.memory_hits += 1
+            return copy.deepcopy(value)
+
+        try:
+            value, remaining = self._db_get(key)
+        except Exception as e:
+            print("LLM cache lookup failed:", e)
+            value, remaining = None, 0
+
+        if value is not None:
+            with self._lock:
+                self.db_hits += 1
+            self._memory_put(key, value, remaining)
+            return copy.deepcopy(value)
+
+        started = time.perf_counter()
+        value = compute()
+        with self._lock:
+            self.misses += 1
+            self.miss_seconds += time.perf_counter() - started
+
+        self._memory_put(key, value, self.ttl_seconds)
+        try:
+            self._db_put(key, value, model)
+        except Exception as e:
+            print("LLM cache write failed:", e)
+
+        return copy.deepcopy(value)
+
+    def stats(self):
+        with self._lock:
+            memory_hits, db_hits = self.memory_hits, self.db_hits
+            misses, miss_seconds = self.misses, self.miss_seconds
+            memory_entries = len(self._entries)
+
+        hits = memory_hits + db_hits
+        lookups = hits + misses
+        avg_miss_seconds = miss_seconds / misses if misses else 0.0
+
+        return {
+            "memory_hits": memory_hits,
+            "db_hits": db_hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": memory_entries,
+            "avg_miss_latency_ms": round(avg_miss_seconds * 1000, 1),
+            # every hit is one LLM round trip we did not pay for
+            "estimated_saved_calls": hits,
+            "estimated_saved_seconds": round(hits * avg_miss_seconds, 1),
+        }
+
+
+llm_cache = LLMCache(LLM_CACHE_SIZE, LLM_CACHE_TTL_SECONDS)
+
+
+# ============================================================
+# SWEEP (the DB tier only drops expired rows here)
+# ============================================================
+def sweep_expired(db: Session, batch: int = LLM_CACHE_SWEEP_BATCH):
+    """Delete expired cache rows, committing every ``batch`` so no delete holds locks for long."""
+    now = datetime.now(timezone.utc)
+    deleted = 0
+
+    while True:
+        expired = (
+            select(LLMResponseCache.cache_key)
+            .where(LLMResponseCache.expires_at < now)
+            .limit(batch)
+        )
+        gone = db.execute(
+            delete(LLMResponseCache)
+            .where(LLMResponseCache.cache_key.in_(expired))
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+
+        deleted += gone
+        if gone < batch:
+            break
+
+    print(f"🧹 LLM cache: {deleted} expired row(s) deleted")
+
+    return deleted
+
+
+@task_handler("llm_cache_sweep", every=LLM_CACHE_SWEEP_SECONDS)
+def run_llm_cache_sweep(db: Session, payload: dict):
+    sweep_expired(db)
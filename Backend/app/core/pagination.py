@@ -0,0 +1,36 @@
+import base64
+import json
+
+from fastapi import HTTPException
+
+
+def encode_cursor(values):
+    """Opaque keyset cursor: the sort-key values of the last row returned."""
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor: str, size: int):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception:
+        raise HTTPException(400, "Invalid cursor")
+
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(400, "Invalid cursor")
+
+    return values
+
+
+def is_number(value):
+    """A numeric cursor value; bool is an int subclass, but never a sort key."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def decode_id_cursor(cursor: str):
+    """The row id of a single-key cursor (``encode_cursor([id])``)."""
+    (after_id,) = decode_cursor(cursor, 1)
+
+    if not is_number(after_id) or not isinstance(after_id, int):
+        raise HTTPException(400, "Invalid cursor")
+
+    return after_id
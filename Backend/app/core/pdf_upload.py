@@ -0,0 +1,216 @@
+import os
+import re
+
+from fastapi import HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from python_multipart.exceptions import MultipartParseError
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+from .resume_parser import RESUME_MAX_BYTES
+from .resume_store import BlobStore
+
+# Uploads whose page tree declares more pages than this are refused up
+# front; accepted files are still only read up to RESUME_MAX_PAGES.
+RESUME_UPLOAD_MAX_PAGES = int(os.getenv("RESUME_UPLOAD_MAX_PAGES", "50"))
+
+# multipart framing (boundaries, part headers) allowed on top of the file
+_MULTIPART_OVERHEAD = 64 * 1024
+
+# readers accept the header anywhere in the first KB
+_MAGIC = b"%PDF-"
+_MAGIC_WINDOW = 1024
+
+# "/Type /Pages ... /Count N" (either order) inside one dictionary; only
+# visible when the page tree is not in a compressed object stream
+_PAGE_TREE_COUNT = re.compile(
+    rb"/Type\s*/Pages\b(?:(?!>>).){0,512}?/Count\s+(\d+)"
+    rb"|/Count\s+(\d+)(?:(?!>>).){0,512}?/Type\s*/Pages\b",
+    re.DOTALL
+)
+_SCAN_OVERLAP = 1024
+
+# staged bytes are handed to the store in blocks this big
+_FLUSH_BYTES = 1024 * 1024
+
+PDF_UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                    "required": ["file"]
+                }
+            }
+        }
+    }
+}
+
+
+def _too_large(max_bytes: int):
+    return HTTPException(413, f"Resume is larger than {max_bytes // (1024 * 1024)} MB")
+
+
+class PdfStreamCheck:
+    """
+    Checks on a PDF as its chunks arrive: the size cap, the ``%PDF-``
+    header and, when the page tree is stored in plain text, the declared
+    page count. ``feed`` returns the bytes that are safe to keep (nothing
+    until the header has been seen) and raises 413/415 as soon as a limit
+    is crossed.
+    """
+
+    def __init__(self, max_bytes: int = RESUME_MAX_BYTES, max_pages: int = RESUME_UPLOAD_MAX_PAGES):
+        self.max_bytes = max_bytes
+        self.max_pages = max_pages
+        self.size = 0
+        self.pages = None
+        self._is_pdf = False
+        self._head = b""
+        self._tail = b""
+
+    def feed(self, chunk: bytes):
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise _too_large(self.max_bytes)
+
+        if not self._is_pdf:
+            self._head += chunk
+            if _MAGIC not in self._head[:_MAGIC_WINDOW + len(_MAGIC)]:
+                if len(self._head) >= _MAGIC_WINDOW + len(_MAGIC):
+                    raise HTTPException(415, "Only PDF resumes are accepted")
+                return b""
+            self._is_pdf = True
+            chunk, self._head = self._head, b""
+
+        window = self._tail + chunk
+        for match in _PAGE_TREE_COUNT.finditer(window):
+            pages = int(match.group(1) or match.group(2))
+            self.pages = max(self.pages or 0, pages)
+        if self.pages is not None and self.pages > self.max_pages:
+            raise HTTPException(413, f"Resume has more than {self.max_pages} pages")
+        self._tail = window[-_SCAN_OVERLAP:]
+
+        return chunk
+
+    def finish(self):
+        if not self._is_pdf:
+            raise HTTPException(415, "Only PDF resumes are accepted")
+
+
+# ============================================================
+# MULTIPART STREAM
+# ============================================================
+async def iter_pdf_upload(
+    request: Request,
+    field: str = "file",
+    max_bytes: int = RESUME_MAX_BYTES,
+    max_pages: int = RESUME_UPLOAD_MAX_PAGES
+):
+    """
+    Chunks of the PDF sent in multipart ``field``, validated while the
+    request body streams in, so an oversized or non-PDF upload is refused
+    before it costs disk, memory or parser time. A Content-Length that is
+    already too big is refused without reading the body.
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    boundary = params.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise HTTPException(415, "Expected a multipart/form-data upload")
+
+    body_limit = max_bytes + _MULTIPART_OVERHEAD
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > body_limit:
+        raise _too_large(max_bytes)
+
+    # parser callbacks only record; validation happens between writes
+    part = {"headers": {}, "field": b"", "value": b""}
+    data, ended = [], []
+
+    def on_header_field(buffer, start, end):
+        part["field"] += buffer[start:end]
+
+    def on_header_value(buffer, start, end):
+        part["value"] += buffer[start:end]
+
+    def on_header_end():
+        part["headers"][part["field"].lower()] = part["value"]
+        part["field"], part["value"] = b"", b""
+
+    def on_headers_finished():
+        _, options = parse_options_header(part["headers"].get(b"content-disposition", b""))
+        part["wanted"] = options.get(b"name") == field.encode() and not ended
+
+    def on_part_data(buffer, start, end):
+        if part.get("wanted"):
+            data.append(bytes(buffer[start:end]))
+
+    def on_part_end():
+        if part.get("wanted"):
+            ended.append(True)
+        part["headers"], part["wanted"] = {}, False
+
+    parser = MultipartParser(boundary, {
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end,
+    })
+
+    check = PdfStreamCheck(max_bytes, max_pages)
+    received = 0
+
+    async for body in request.stream():
+        received += len(body)
+        if received > body_limit:
+            raise _too_large(max_bytes)
+
+        try:
+            parser.write(body)
+        except MultipartParseError:
+            raise HTTPException(400, "Malformed multipart body")
+
+        for chunk in data:
+            chunk = check.feed(chunk)
+            if chunk:
+                yield chunk
+        data.clear()
+
+        if ended:
+            break
+
+    if not ended:
+        raise HTTPException(422, f"Missing file field '{field}'")
+
+    check.finish()
+
+
+async def stage_pdf_upload(request: Request, store: BlobStore, field: str = "file"):
+    """Stream a validated PDF upload straight into ``store``; returns the StagedBlob."""
+    writer = await run_in_threadpool(store.writer)
+    pending = bytearray()
+    try:
+        async for chunk in iter_pdf_upload(request, field):
+            pending += chunk
+            if len(pending) >= _FLUSH_BYTES:
+                await run_in_threadpool(writer.write, bytes(pending))
+                pending.clear()
+
+        if pending:
+            await run_in_threadpool(writer.write, bytes(pending))
+    except BaseException:
+        writer.abort()
+        raise
+
+    return await run_in_threadpool(writer.close)
+
+
+async def read_pdf_upload(request: Request, field: str = "file"):
+    """A validated PDF upload, in memory (at most RESUME_MAX_BYTES)."""
+    data = bytearray()
+    async for chunk in iter_pdf_upload(request, field):
+        data += chunk
+    return bytes(data)
@@ -0,0 +1,407 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+import os
+import sys
+import time
+
+import numpy as np
+from sqlalchemy import exists, or_, select, update
+from sqlalchemy.orm import Session, aliased
+
+from ..db.database import SessionLocal
+from ..models.application import CandidateApplication
+from ..models.job import JobListing
+from ..models.rescore_run import RescoreRun
+from ..models.resume_artifact import ResumeArtifact
+from ..models.resume_job import ResumeJob
+from .idf_model import IdfModel, current_model
+from .interview_pipeline import apply_interview_decision
+from .job_vectors import get_job_vector
+from .leaderboard import update_performance_score
+from .resume_artifacts import get_or_create_artifact, unpack_features
+from .resume_parser import ResumeParseError, resume_parser
+from .resume_store import read_upload
+from .resume_pipeline import apply_shortlist, combine_scores, interview_call_key
+from .scheduler import pending_task_keys
+from .workers import PollingWorkerPool
+
+RESCORE_WORKERS = int(os.getenv("RESCORE_WORKERS", "1"))
+RESCORE_RUN_MAX_ATTEMPTS = int(os.getenv("RESCORE_RUN_MAX_ATTEMPTS", "3"))
+RESCORE_RUN_LEASE_SECONDS = int(os.getenv("RESCORE_RUN_LEASE_SECONDS", "600"))
+
+# applications written (and progress committed) per transaction
+RESCORE_BATCH_SIZE = int(os.getenv("RESCORE_BATCH_SIZE", "500"))
+
+# threads feeding the parser's process pool with resumes that predate artifacts
+RESCORE_PARSE_THREADS = int(os.getenv("RESCORE_PARSE_THREADS", str(resume_parser.workers)))
+
+
+# ============================================================
+# ENQUEUE
+# ============================================================
+def enqueue_rescore(db: Session, job: JobListing, reason: str = "manual"):
+    """
+    Queue a rescore of every application to ``job`` and commit. Edits made
+    while a run is still queued fold into that run.
+    """
+    run = db.scalar(
+        select(RescoreRun).where(
+            RescoreRun.job_id == job.id,
+            RescoreRun.status == "queued"
+        )
+    )
+
+    if not run:
+        run = RescoreRun(job_id=job.id, reason=reason, status="queued", attempts=0)
+        db.add(run)
+
+    db.commit()
+    db.refresh(run)
+
+    rescore_workers.wake()
+
+    return run
+
+
+def rescore_throughput(run: RescoreRun):
+    """(elapsed seconds, applications per second); (None, None) before the run starts."""
+    if run.started_at is None:
+        return None, None
+
+    # SQLite hands back naive UTC timestamps
+    started = run.started_at if run.started_at.tzinfo else run.started_at.replace(tzinfo=timezone.utc)
+    finished = run.finished_at or datetime.now(timezone.utc)
+    if finished.tzinfo is None:
+        finished = finished.replace(tzinfo=timezone.utc)
+
+    elapsed = max((finished - started).total_seconds(), 0.0)
+    return round(elapsed, 3), round(run.processed / elapsed, 1) if elapsed else None
+
+
+# ============================================================
+# ARTIFACT BACKFILL
+# ============================================================
+def _load_resume(item):
+    application_id, blob_hash, file_path = item
+    try:
+        data = read_upload(blob_hash, file_path)
+        # CPU-heavy part, runs in the parser's process pool
+        return application_id, data, resume_parser.extract(data)
+    except (OSError, ResumeParseError) as e:
+        print(f"Rescore skipped application {application_id}:", e)
+        return application_id, None, None
+
+
+def _backfill_artifacts(db: Session, run: RescoreRun):
+    """Applications scored before artifacts existed: parse their last processed upload once."""
+    # last processed upload per application
+    latest_uploads = {
+        row.id: row for row in db.execute(
+            select(CandidateApplication.id, ResumeJob.blob_hash, ResumeJob.file_path)
+            .join(ResumeJob, ResumeJob.application_id == CandidateApplication.id)
+            .where(
+                CandidateApplication.job_id == run.job_id,
+                CandidateApplication.resume_hash.is_(None),
+                ResumeJob.status == "completed"
+            )
+            .order_by(ResumeJob.id)
+        )
+    }
+
+    if not latest_uploads:
+        return
+
+    items = list(latest_uploads.values())
+    chunk = RESCORE_PARSE_THREADS * 8
+
+    with ThreadPoolExecutor(RESCORE_PARSE_THREADS) as executor:
+        for start in range(0, len(items), chunk):
+            for application_id, data, text in executor.map(_load_resume, items[start:start + chunk]):
+                if data is None:
+                    continue
+                # already counted in the IDF corpus when the upload was first scored
+                artifact, _ = get_or_create_artifact(db, data, text)
+                db.get(CandidateApplication, application_id).resume_hash = artifact.content_hash
+                run.parsed += 1
+
+            run.locked_at = datetime.now(timezone.utc)
+            db.commit()
+
+    print(f"🔁 Rescore run {run.id}: parsed {run.parsed} resume(s) without artifacts")
+
+
+# ============================================================
+# SCORING
+# ============================================================
+def score_job_applications(db: Session, job: JobListing, model: IdfModel):
+    """
+    TF-IDF score of every application to ``job`` that has a resume artifact,
+    as ``{application_id: score}``. One sparse product: the resumes become
+    the rows of a CSR matrix under ``model`` and are multiplied by the job
+    vector; the scale matches ``score_vectors``.
+    """
+    rows = db.execute(
+        select(CandidateApplication.id, ResumeArtifact.features)
+        .join(ResumeArtifact, ResumeArtifact.content_hash == CandidateApplication.resume_hash)
+        .where(CandidateApplication.job_id == job.id)
+        .order_by(CandidateApplication.id)
+        .execution_options(yield_per=1000)
+    )
+
+    application_ids, documents = [], []
+    for row in rows:
+        names, counts, _ = unpack_features(row.features)
+        application_ids.append(row.id)
+        documents.append(dict(zip(names, counts.tolist())))
+
+    if not application_ids:
+        return {}
+
+    job_vector = get_job_vector(db, job, model)
+    matrix = model.transform_many(documents)
+
+    column = np.zeros(matrix.shape[1], np.float32)
+    column[job_vector.indices] = job_vector.values
+    similarity = (matrix @ column).astype(np.float64)
+
+    return dict(zip(application_ids, (similarity * 100).astype(np.int64).tolist()))
+
+
+def _rescore_application(db: Session, application: CandidateApplication, tfidf_score: int, call_pending: bool):
+    """
+    New score plus re-applied threshold; returns (score changed, decision
+    changed). ``call_pending`` when the application's interview call has
+    not been dispatched yet.
+    """
+    previous_score, previous_status = application.resume_score, application.status
+
+    # The LLM is not consulted again; its last score is recombined as is.
+    application.tfidf_score = tfidf_score
+    application.resume_score = combine_scores(tfidf_score, application.ai_score)
+    update_performance_score(application)
+
+    # Only decisions nobody has overridden (recruiter, call in progress) are revisited.
+    if application.auto_status and application.status == application.auto_status:
+        if application.voice_score is not None:
+            if application.status in ["shortlisted", "rejected"]:
+                apply_interview_decision(application)
+        # A dispatched call is settled by its webhook; only a waiting one can be withdrawn.
+        elif application.status == "rejected" or (application.status == "interview_scheduled" and call_pending):
+            job = application.job
+            passes = not job.resume_min_score or application.resume_score >= job.resume_min_score
+            # apply_shortlist schedules or cancels the call; only when the decision flips
+            if passes != (application.status == "interview_scheduled"):
+                apply_shortlist(db, application)
+
+    return application.resume_score != previous_score, application.status != previous_status
+
+
+def rescore_job(db: Session, run: RescoreRun):
+    """Backfill missing artifacts, score the whole job in one pass, then write and commit in batches."""
+    started = time.perf_counter()
+
+    run.started_at = datetime.now(timezone.utc)
+    run.finished_at = None
+    run.total = run.processed = run.parsed = 0
+    run.scores_changed = run.decisions_changed = 0
+    db.commit()
+
+    _backfill_artifacts(db, run)
+
+    scores = score_job_applications(db, run.job, current_model())
+    application_ids = list(scores)
+
+    run.total = len(application_ids)
+    db.commit()
+
+    for start in range(0, len(application_ids), RESCORE_BATCH_SIZE):
+        batch = application_ids[start:start + RESCORE_BATCH_SIZE]
+
+        applications = db.query(CandidateApplication).filter(CandidateApplication.id.in_(batch))
+        calls_pending = pending_task_keys(db, "bland_interview", [interview_call_key(id) for id in batch])
+        for application in applications:
+            score_changed, decision_changed = _rescore_application(
+                db, application, scores[application.id], interview_call_key(application.id) in calls_pending
+            )
+            run.scores_changed += score_changed
+            run.decisions_changed += decision_changed
+
+        run.processed += len(batch)
+        # progress doubles as the lease heartbeat
+        run.locked_at = datetime.now(timezone.utc)
+        db.commit()
+
+        elapsed = time.perf_counter() - started
+        print(
+            f"🔁 Rescore run {run.id} (job {run.job_id}): {run.processed}/{run.total} "
+            f"({run.processed / elapsed:.0f} applications/s)"
+        )
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"✅ Rescore run {run.id} (job {run.job_id}) done: {run.total} applications in {elapsed:.2f}s, "
+        f"{run.scores_changed} score(s) and {run.decisions_changed} decision(s) changed"
+    )
+
+
+# ============================================================
+# WORKER
+# ============================================================
+def _fail_abandoned_runs(db: Session, lease_cutoff: datetime, now: datetime):
+    """Runs whose lease expired on their last attempt lost their worker every time; fail them."""
+    abandoned = (
+        (RescoreRun.status == "running")
+        & (RescoreRun.locked_at < lease_cutoff)
+        & (RescoreRun.attempts >= RESCORE_RUN_MAX_ATTEMPTS)
+    )
+
+    run_ids = db.scalars(
+        select(RescoreRun.id)
+        .where(abandoned)
+        .with_for_update(skip_locked=True)
+    ).all()
+
+    if not run_ids:
+        return
+
+    db.execute(
+        update(RescoreRun)
+        .where(RescoreRun.id.in_(run_ids), abandoned)
+        .values(
+            status="failed",
+            error="Worker lost on the last attempt",
+            locked_at=None,
+            finished_at=now
+        )
+    )
+    db.commit()
+
+    print(f"Failed {len(run_ids)} rescore run(s) whose worker was lost on every attempt")
+
+
+def claim_rescore_run():
+    db = SessionLocal()
+    try:
+        now = datetime.now(timezone.utc)
+        lease_cutoff = now - timedelta(seconds=RESCORE_RUN_LEASE_SECONDS)
+
+        _fail_abandoned_runs(db, lease_cutoff, now)
+
+        claimable = or_(
+            RescoreRun.status == "queued",
+            (RescoreRun.status == "running")
+            & (RescoreRun.locked_at < lease_cutoff)
+            & (RescoreRun.attempts < RESCORE_RUN_MAX_ATTEMPTS)
+        )
+
+        # one live run per job at a time
+        other = aliased(RescoreRun)
+        job_busy = exists().where(
+            other.job_id == RescoreRun.job_id,
+            other.id != RescoreRun.id,
+            other.status == "running",
+            other.locked_at >= lease_cutoff
+        )
+
+        candidate = (
+            db.query(RescoreRun.id)
+            .filter(claimable, ~job_busy)
+            .order_by(RescoreRun.id)
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+
+        if not candidate:
+            db.rollback()
+            return None
+
+        claimed = db.execute(
+            update(RescoreRun)
+            .where(RescoreRun.id == candidate.id, claimable)
+            .values(
+                status="running",
+                locked_at=now,
+                attempts=RescoreRun.attempts + 1
+            )
+        )
+        db.commit()
+
+        return candidate.id if claimed.rowcount == 1 else None
+
+    finally:
+        db.close()
+
+
+def process_rescore_run(run_id: int):
+    db = SessionLocal()
+    try:
+        run = db.get(RescoreRun, run_id)
+        if not run:
+            return
+
+        try:
+            rescore_job(db, run)
+        except Exception as e:
+            db.rollback()
+            print(f"Rescore run {run_id} failed:", e)
+
+            # batches already committed are simply rescored again
+            run.error = str(e)[:2000]
+            run.locked_at = None
+
+            if run.attempts >= RESCORE_RUN_MAX_ATTEMPTS:
+                run.status = "failed"
+                run.finished_at = datetime.now(timezone.utc)
+            else:
+                run.status = "queued"
+
+            db.commit()
+            return
+
+        run.status = "completed"
+        run.error = None
+        run.locked_at = None
+        run.finished_at = datetime.now(timezone.utc)
+
+        db.commit()
+
+    finally:
+        db.close()
+
+
+rescore_workers = PollingWorkerPool(
+    "rescore",
+    claim_rescore_run,
+    process_rescore_run,
+    size=RESCORE_WORKERS
+)
+
+
+if __name__ == "__main__":
+    # python -m app.core.rescoring rescore <job_id> [<job_id> ...] | all
+    if sys.argv[1:2] == ["rescore"] and sys.argv[2:]:
+        db = SessionLocal()
+        try:
+            if sys.argv[2:] == ["all"]:
+                job_ids = db.scalars(select(JobListing.id).order_by(JobListing.id)).all()
+            else:
+                job_ids = [int(job_id) for job_id in sys.argv[2:]]
+
+            for job_id in job_ids:
+                run = RescoreRun(
+                    job_id=job_id, reason="manual", status="running", attempts=1,
+                    locked_at=datetime.now(timezone.utc)
+                )
+                db.add(run)
+                db.commit()
+
+                rescore_job(db, run)
+
+                run.status = "completed"
+                run.finished_at = datetime.now(timezone.utc)
+                db.commit()
+        finally:
+            resume_parser.shutdown()
+            db.close()
+    else:
+        print("usage: python -m app.core.rescoring rescore <job_id> [<job_id> ...] | all")
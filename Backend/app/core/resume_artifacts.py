@@ -0,0 +1,129 @@
+import hashlib
+import struct
+import zlib
+
+import numpy as np
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from ..models.resume_artifact import ResumeArtifact
+from .idf_model import IdfModel, SparseVector, current_model
+from .resume_parser import resume_parser
+from .resume_scoring import term_counts
+
+# features blob, before zlib:
+#   <B format> <I terms> <I names bytes>
+#   names   - sorted terms, "\n"-separated UTF-8
+#   counts  - uint32 per term
+#   weights - float32 per term (l2-normalized TF-IDF under idf_version)
+FEATURES_FORMAT = 1
+_HEADER = struct.Struct("<BII")
+
+
+def content_hash(data: bytes):
+    return hashlib.sha256(data).hexdigest()
+
+
+# ============================================================
+# ENCODING
+# ============================================================
+def pack_features(terms: dict, model: IdfModel):
+    names = sorted(terms)
+    vector = model.transform(terms)
+    weight_of = dict(zip(vector.indices.tolist(), vector.values.tolist()))
+
+    names_blob = "\n".join(names).encode("utf-8")
+    counts = np.fromiter((terms[name] for name in names), np.uint32, len(names))
+    weights = np.fromiter((weight_of[model.index(name)] for name in names), np.float32, len(names))
+
+    return zlib.compress(
+        _HEADER.pack(FEATURES_FORMAT, len(names), len(names_blob))
+        + names_blob
+        + counts.tobytes()
+        + weights.tobytes()
+    )
+
+
+def unpack_features(blob: bytes):
+    """(sorted terms, uint32 counts, float32 weights)."""
+    payload = zlib.decompress(blob)
+    version, size, names_length = _HEADER.unpack_from(payload)
+    if version != FEATURES_FORMAT:
+        raise ValueError(f"Unknown resume features format {version}")
+
+    offset = _HEADER.size
+    names = payload[offset:offset + names_length].decode("utf-8").split("\n") if size else []
+    offset += names_length
+    counts = np.frombuffer(payload, np.uint32, size, offset)
+    weights = np.frombuffer(payload, np.float32, size, offset + 4 * size)
+
+    return names, counts, weights
+
+
+# ============================================================
+# READS
+# ============================================================
+def artifact_text(artifact: ResumeArtifact):
+    return zlib.decompress(artifact.text).decode("utf-8")
+
+
+def artifact_terms(artifact: ResumeArtifact):
+    names, counts, _ = unpack_features(artifact.features)
+    return dict(zip(names, counts.tolist()))
+
+
+def artifact_vector(artifact: ResumeArtifact, model: IdfModel | None = None):
+    """The resume's TF-IDF vector; the stored weights are reused while the IDF snapshot is unchanged."""
+    model = model or current_model()
+    names, counts, weights = unpack_features(artifact.features)
+
+    if artifact.idf_version != model.version:
+        return model.transform(dict(zip(names, counts.tolist())))
+
+    indices = np.fromiter((model.index(name) for name in names), np.int32, len(names))
+    # names that share an index were stored with the same, merged weight
+    indices, first = np.unique(indices, return_index=True)
+    return SparseVector(indices, weights[first].copy())
+
+
+# ============================================================
+# WRITES
+# ============================================================
+def _insert(db: Session):
+    dialect = db.get_bind().dialect.name
+    return (postgresql if dialect == "postgresql" else sqlite).insert
+
+
+def get_or_create_artifact(db: Session, data: bytes, text: str | None = None):
+    """
+    ``(artifact, created)`` for these PDF bytes, parsing them only the
+    first time the content is seen (``text`` skips the parse when it was
+    already done elsewhere). ``created`` is True for exactly one caller,
+    even when the same content is inserted concurrently; the caller commits.
+    """
+    digest = content_hash(data)
+
+    artifact = db.get(ResumeArtifact, digest)
+    if artifact:
+        return artifact, False
+
+    if text is None:
+        text = resume_parser.extract(data)
+    terms = term_counts(text)
+    model = current_model()
+
+    inserted = db.execute(
+        _insert(db)(ResumeArtifact)
+        .values(
+            content_hash=digest,
+            byte_size=len(data),
+            text=zlib.compress(text.encode("utf-8")),
+            token_count=sum(terms.values()),
+            term_count=len(terms),
+            features=pack_features(terms, model),
+            idf_version=model.version
+        )
+        .on_conflict_do_nothing(index_elements=[ResumeArtifact.content_hash])
+    ).rowcount
+
+    return db.get(ResumeArtifact, digest), inserted == 1
@@ -1,10 +1,196 @@
-import pdfplumber
+import io
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
 
-def extract_text_from_pdf(file_path: str):
-    text = ""
+# Bigger files are rejected; only the first RESUME_MAX_PAGES pages are read.
+RESUME_MAX_BYTES = int(os.getenv("RESUME_MAX_BYTES", str(10 * 1024 * 1024)))
+RESUME_MAX_PAGES = int(os.getenv("RESUME_MAX_PAGES", "20"))
+RESUME_PARSE_TIMEOUT_SECONDS = float(os.getenv("RESUME_PARSE_TIMEOUT_SECONDS", "20"))
 
-    with pdfplumber.open(file_path) as pdf:
-        for page in pdf.pages:
-            text += page.extract_text() or ""
+# pdfium output thinner than this (per page read) is retried with pdfplumber,
+# which handles multi-column and heavily positioned layouts better
+RESUME_MIN_CHARS_PER_PAGE = int(os.getenv("RESUME_MIN_CHARS_PER_PAGE", "200"))
 
-    return text
+RESUME_PARSE_WORKERS = int(os.getenv("RESUME_PARSE_WORKERS", str(min(2, os.cpu_count() or 1))))
+# recycle workers now and then; PDF libraries hold on to memory
+RESUME_PARSE_TASKS_PER_CHILD = int(os.getenv("RESUME_PARSE_TASKS_PER_CHILD", "200"))
+
+# extra time the parent waits past the deadline before killing the worker
+_KILL_GRACE_SECONDS = 5
+
+
+class ResumeParseError(Exception):
+    """The PDF was rejected (too big, unreadable) or took too long to parse."""
+
+
+# ============================================================
+# EXTRACTION (runs inside the pool)
+# ============================================================
+def _check_deadline(deadline: float):
+    if time.monotonic() > deadline:
+        raise ResumeParseError("Resume took too long to parse")
+
+
+def _extract_pdfium(data: bytes, max_pages: int, deadline: float):
+    import pypdfium2
+
+    pdf = pypdfium2.PdfDocument(data)
+    try:
+        pages = min(len(pdf), max_pages)
+        parts = []
+        for index in range(pages):
+            _check_deadline(deadline)
+            page = pdf[index]
+            textpage = page.get_textpage()
+            try:
+                parts.append(textpage.get_text_bounded())
+            finally:
+                textpage.close()
+                page.close()
+        return "\n".join(parts), pages
+    finally:
+        pdf.close()
+
+
+def _extract_pdfplumber(data: bytes, max_pages: int, deadline: float):
+    import pdfplumber
+
+    parts = []
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        for page in pdf.pages[:max_pages]:
+            _check_deadline(deadline)
+            parts.append(page.extract_text() or "")
+            page.close()
+    return "\n".join(parts)
+
+
+def parse_pdf_bytes(data: bytes, max_pages: int = RESUME_MAX_PAGES, timeout: float = RESUME_PARSE_TIMEOUT_SECONDS):
+    """pypdfium2 first; pdfplumber when pdfium fails or finds little text. Returns the page text joined by newlines."""
+    deadline = time.monotonic() + timeout
+
+    try:
+        text, pages = _extract_pdfium(data, max_pages, deadline)
+    except ResumeParseError:
+        raise
+    except Exception:
+        text, pages = "", 0
+
+    if len(text.strip()) >= RESUME_MIN_CHARS_PER_PAGE * max(pages, 1):
+        return text
+
+    try:
+        fallback = _extract_pdfplumber(data, max_pages, deadline)
+    except ResumeParseError:
+        raise
+    except Exception as e:
+        if pages:
+            return text
+        raise ResumeParseError(f"Could not read the resume PDF: {e}")
+
+    return fallback if len(fallback.strip()) > len(text.strip()) else text
+
+
+def _on_alarm(signum, frame):
+    raise ResumeParseError("Resume took too long to parse")
+
+
+def _parse_in_worker(data: bytes, max_pages: int, timeout: float):
+    # Hard stop for code that never reaches a deadline check; signals are
+    # only delivered between bytecodes, hence the parent-side kill as well.
+    if hasattr(signal, "setitimer"):
+        signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return parse_pdf_bytes(data, max_pages, timeout)
+    finally:
+        if hasattr(signal, "setitimer"):
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+# ============================================================
+# POOL
+# ============================================================
+class ResumeParser:
+    """
+    Parses PDFs in dedicated worker processes, so CPU-heavy extraction never
+    holds the API's GIL. Each of the ``workers`` slots owns a one-process
+    pool; at most ``workers`` parses run at once (callers beyond that wait
+    for a free slot, so the timeout only counts parse time). A parse that
+    overruns its deadline gets only its own process killed and replaced,
+    so parses running in the other slots are unaffected.
+    """
+
+    def __init__(self, workers: int, max_tasks_per_child: int):
+        self.workers = workers
+        self.max_tasks_per_child = max_tasks_per_child
+        # free slots; None until the slot's pool is first needed
+        self._idle = queue.LifoQueue()
+        for _ in range(workers):
+            self._idle.put(None)
+        self._live = set()
+        self._lock = threading.Lock()
+
+    def _start_pool(self):
+        # spawn: forking a process that already runs worker threads is unsafe
+        pool = multiprocessing.get_context("spawn").Pool(
+            processes=1,
+            maxtasksperchild=self.max_tasks_per_child
+        )
+        with self._lock:
+            self._live.add(pool)
+        return pool
+
+    def _kill(self, pool):
+        with self._lock:
+            self._live.discard(pool)
+        pool.terminate()
+
+    def extract(self, data: bytes, max_pages: int = RESUME_MAX_PAGES, timeout: float = RESUME_PARSE_TIMEOUT_SECONDS):
+        pool = self._idle.get()
+        try:
+            if pool not in self._live:
+                pool = self._start_pool()
+
+            result = pool.apply_async(_parse_in_worker, (data, max_pages, timeout))
+            try:
+                return result.get(timeout + _KILL_GRACE_SECONDS)
+            except multiprocessing.TimeoutError:
+                # the worker is stuck in native code; nothing else runs on it
+                self._kill(pool)
+                raise ResumeParseError("Resume took too long to parse")
+        finally:
+            with self._lock:
+                # a killed (or shut down) pool frees its slot for a fresh one
+                self._idle.put(pool if pool in self._live else None)
+
+    def shutdown(self):
+        with self._lock:
+            pools, self._live = self._live, set()
+        for pool in pools:
+            pool.terminate()
+
+
+resume_parser = ResumeParser(RESUME_PARSE_WORKERS, RESUME_PARSE_TASKS_PER_CHILD)
+
+
+def read_pdf(source, max_bytes: int = RESUME_MAX_BYTES):
+    """Bytes of a path or binary file object, refusing anything over ``max_bytes``."""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            data = f.read(max_bytes + 1)
+    else:
+        data = source.read(max_bytes + 1)
+
+    if len(data) > max_bytes:
+        raise ResumeParseError(f"Resume is larger than {max_bytes // (1024 * 1024)} MB")
+
+    return data
+
+
+def extract_text_from_pdf(source):
+    """Text of a resume PDF (path or binary file object), parsed in the pool with the page, size and time caps."""
+    return resume_parser.extract(read_pdf(source))
@@ -0,0 +1,313 @@
+from datetime import datetime, timedelta, timezone
+import os
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Session
+
+from .scheduler import cancel_task, schedule_task
+from ..db.database import SessionLocal
+from ..models.application import CandidateApplication
+from ..models.resume_job import ResumeJob
+from ..models.resume_artifact import ResumeArtifact
+from .resume_store import StagedBlob, attach_resume, read_upload, resume_store
+from .resume_artifacts import get_or_create_artifact, artifact_text, artifact_terms, artifact_vector
+from .resume_scoring import score_vectors
+from .idf_model import current_model, add_document
+from .job_vectors import get_job_vector
+from .candidate_vectors import store_resume_terms
+from .leaderboard import update_performance_score
+from .ai_resume_scoring import analyze_resume_with_ai
+from .workers import PollingWorkerPool
+
+RESUME_WORKERS = int(os.getenv("RESUME_WORKERS", "2"))
+RESUME_JOB_MAX_ATTEMPTS = int(os.getenv("RESUME_JOB_MAX_ATTEMPTS", "3"))
+RESUME_JOB_LEASE_SECONDS = int(os.getenv("RESUME_JOB_LEASE_SECONDS", "300"))
+
+# below this TF-IDF score the LLM is not consulted
+AI_MIN_TFIDF_SCORE = 35
+
+
+# ============================================================
+# ENQUEUE
+# ============================================================
+def enqueue_resume_job(db: Session, application: CandidateApplication, staged: StagedBlob):
+    """Queue processing of a staged upload; the blob is published once the job and its reference are committed."""
+    job = ResumeJob(
+        application_id=application.id,
+        blob_hash=staged.digest,
+        status="queued",
+        attempts=0
+    )
+
+    application.status = "resume_processing"
+    attach_resume(db, application, staged)
+
+    db.add(job)
+    try:
+        db.commit()
+    except Exception:
+        db.rollback()
+        resume_store.discard(staged)
+        raise
+
+    resume_store.publish(staged)
+    db.refresh(job)
+
+    resume_workers.wake()
+
+    return job
+
+
+# ============================================================
+# SCORING + SHORTLIST (previously inline in upload_resume)
+# ============================================================
+def combine_scores(tfidf_score: int, ai_score: int | None):
+    """Final resume score; ``ai_score`` is None when the LLM was skipped."""
+    if ai_score is None or tfidf_score < AI_MIN_TFIDF_SCORE:
+        return tfidf_score
+
+    if tfidf_score < 60:
+        return int((0.7 * tfidf_score) + (0.3 * ai_score))
+    return int((0.4 * tfidf_score) + (0.6 * ai_score))
+
+
+def interview_call_key(application_id: int):
+    """dedupe_key of the application's bland_interview task."""
+    return f"application:{application_id}"
+
+
+def apply_shortlist(db: Session, application: CandidateApplication):
+    """
+    Reject below the job's resume threshold, otherwise schedule the
+    interview call. Safe to repeat: an application never has more than one
+    call pending, and rejecting it cancels that call. The caller commits.
+    """
+    job = application.job
+    call_key = interview_call_key(application.id)
+
+    if job.resume_min_score and application.resume_score < job.resume_min_score:
+        application.status = "rejected"
+        cancel_task(db, "bland_interview", call_key)
+    else:
+        application.status = "interview_scheduled"
+
+        schedule_task(
+            db,
+            "bland_interview",
+            datetime.now(timezone.utc) + timedelta(minutes=2),
+            {"application_id": application.id},
+            dedupe_key=call_key
+        )
+
+    application.auto_status = application.status
+
+
+def score_resume(db: Session, application: CandidateApplication, artifact: ResumeArtifact, new_content: bool = False):
+    """Score the application's resume; ``new_content`` when its artifact was just created."""
+    job = application.job
+
+    # ---------------- TF-IDF SCORING ----------------
+    model = current_model()
+    resume_text = artifact_text(artifact)
+    resume_terms = artifact_terms(artifact)
+
+    tfidf_score = score_vectors(
+        artifact_vector(artifact, model),
+        get_job_vector(db, job, model)
+    )
+
+    # ---------------- CONDITIONAL GEMINI ----------------
+    if tfidf_score < AI_MIN_TFIDF_SCORE:
+        ai_score = None
+        ai_result = {
+            "score": tfidf_score,
+            "missing_skills": [],
+            "reason": "Low keyword similarity"
+        }
+    else:
+        ai_result = analyze_resume_with_ai(
+            resume_text=resume_text,
+            job_description=job.description or ""
+        )
+
+        ai_score = ai_result.get("score", tfidf_score)
+
+    resume_final_score = combine_scores(tfidf_score, ai_score)
+
+    # ---------------- CORPUS + SOURCING INDEX ----------------
+    # Both lock a counter row until the commit, so they wait for the LLM.
+    # Each distinct resume content is one corpus document, however often sent.
+    if new_content:
+        add_document(db, resume_terms)
+
+    # Latest resume wins in the candidate sourcing index.
+    store_resume_terms(db, application.user_id, resume_terms)
+
+    # ---------------- SAVE RESUME DATA ----------------
+    application.resume_score = resume_final_score
+    application.tfidf_score = tfidf_score
+    application.ai_score = ai_score
+    application.ai_reason = ai_result.get("reason")
+    application.missing_skills = ", ".join(
+        ai_result.get("missing_skills", [])
+    )
+    application.retry_count = 0
+    application.voice_score = None
+    update_performance_score(application)
+
+    apply_shortlist(db, application)
+
+    return resume_final_score
+
+
+# ============================================================
+# WORKER
+# ============================================================
+def _fail_abandoned_jobs(db: Session, lease_cutoff: datetime, now: datetime):
+    """
+    Jobs whose lease expired on their last attempt: the worker died on them
+    every time (OOM, a crash in native PDF code), so they are failed like
+    any other exhausted job instead of being handed out again.
+    """
+    abandoned = (
+        (ResumeJob.status == "processing")
+        & (ResumeJob.locked_at < lease_cutoff)
+        & (ResumeJob.attempts >= RESUME_JOB_MAX_ATTEMPTS)
+    )
+
+    jobs = db.execute(
+        select(ResumeJob.id, ResumeJob.application_id)
+        .where(abandoned)
+        .with_for_update(skip_locked=True)
+    ).all()
+
+    if not jobs:
+        return
+
+    db.execute(
+        update(ResumeJob)
+        .where(ResumeJob.id.in_([job.id for job in jobs]), abandoned)
+        .values(
+            status="failed",
+            error="Worker lost on the last attempt",
+            locked_at=None,
+            finished_at=now
+        )
+    )
+    # through the ORM, so the admin status rollups see the change
+    applications = db.scalars(
+        select(CandidateApplication)
+        .where(
+            CandidateApplication.id.in_([job.application_id for job in jobs]),
+            CandidateApplication.status == "resume_processing"
+        )
+        .with_for_update()
+    ).all()
+    for application in applications:
+        application.status = "resume_failed"
+
+    db.commit()
+
+    print(f"Failed {len(jobs)} resume job(s) whose worker was lost on every attempt")
+
+
+def claim_resume_job():
+    db = SessionLocal()
+    try:
+        now = datetime.now(timezone.utc)
+        lease_cutoff = now - timedelta(seconds=RESUME_JOB_LEASE_SECONDS)
+
+        _fail_abandoned_jobs(db, lease_cutoff, now)
+
+        # Queued jobs, plus jobs whose worker died mid-way (expired lease)
+        # and that have attempts left.
+        claimable = or_(
+            ResumeJob.status == "queued",
+            (ResumeJob.status == "processing")
+            & (ResumeJob.locked_at < lease_cutoff)
+            & (ResumeJob.attempts < RESUME_JOB_MAX_ATTEMPTS)
+        )
+
+        candidate = (
+            db.query(ResumeJob.id)
+            .filter(claimable)
+            .order_by(ResumeJob.id)
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+
+        if not candidate:
+            db.rollback()
+            return None
+
+        # Conditional update so two workers can never claim the same row,
+        # even on backends without SKIP LOCKED.
+        claimed = db.execute(
+            update(ResumeJob)
+            .where(ResumeJob.id == candidate.id, claimable)
+            .values(
+                status="processing",
+                locked_at=now,
+                attempts=ResumeJob.attempts + 1
+            )
+        )
+        db.commit()
+
+        return candidate.id if claimed.rowcount == 1 else None
+
+    finally:
+        db.close()
+
+
+def process_resume_job(job_id: int):
+    db = SessionLocal()
+    try:
+        job = db.query(ResumeJob).filter(ResumeJob.id == job_id).first()
+        if not job:
+            return
+
+        application = job.application
+
+        try:
+            # parsed once per distinct file; identical uploads are not even read again
+            artifact = db.get(ResumeArtifact, job.blob_hash) if job.blob_hash else None
+            created = False
+            if artifact is None:
+                artifact, created = get_or_create_artifact(db, read_upload(job.blob_hash, job.file_path))
+            application.resume_hash = artifact.content_hash
+            resume_score = score_resume(db, application, artifact, created)
+        except Exception as e:
+            db.rollback()
+            print(f"Resume job {job_id} failed:", e)
+
+            job.error = str(e)[:2000]
+            job.locked_at = None
+
+            if job.attempts >= RESUME_JOB_MAX_ATTEMPTS:
+                job.status = "failed"
+                job.finished_at = datetime.now(timezone.utc)
+                application.status = "resume_failed"
+            else:
+                job.status = "queued"
+
+            db.commit()
+            return
+
+        job.status = "completed"
+        job.error = None
+        job.resume_score = resume_score
+        job.application_status = application.status
+        job.finished_at = datetime.now(timezone.utc)
+
+        db.commit()
+
+    finally:
+        db.close()
+
+
+resume_workers = PollingWorkerPool(
+    "resume",
+    claim_resume_job,
+    process_resume_job,
+    size=RESUME_WORKERS
+)
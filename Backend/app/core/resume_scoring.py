@@ -1,17 +1,30 @@
+from collections import Counter
+
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 
-def calculate_resume_score(resume_text: str, job_description: str):
+from .idf_model import current_model, dot
+
+# Same tokenizer / stop-word filtering the per-call vectorizer used.
+analyze = TfidfVectorizer(stop_words="english").build_analyzer()
+
 
-    documents = [resume_text, job_description]
+def term_counts(text: str):
+    return dict(Counter(analyze(text or "")))
 
-    tfidf = TfidfVectorizer(stop_words="english")
-    matrix = tfidf.fit_transform(documents)
 
-    similarity = cosine_similarity(matrix[0:1], matrix[1:2])
+def score_vectors(resume_vector, job_vector):
+    return int(dot(resume_vector, job_vector) * 100)
 
-    score = int(similarity[0][0] * 100)
 
-    return score
+def calculate_resume_score(resume_text: str, job_description: str, model=None):
+    """
+    Cosine similarity between the resume and the job description under the
+    corpus-level IDF model. Hot paths should vectorize once and call
+    ``score_vectors`` with a cached job vector instead.
+    """
+    model = model or current_model()
 
+    resume_vector = model.transform(term_counts(resume_text))
+    job_vector = model.transform(term_counts(job_description))
 
+    return score_vectors(resume_vector, job_vector)
@@ -0,0 +1,347 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+import hashlib
+import os
+import re
+import sys
+import tempfile
+import time
+
+from sqlalchemy import case, delete, exists, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from ..db.database import SessionLocal
+from ..models.application import CandidateApplication
+from ..models.resume_blob import ResumeBlob
+from ..models.resume_job import ResumeJob
+from .resume_parser import read_pdf
+
+RESUME_STORE_DIR = os.getenv("RESUME_STORE_DIR", "uploads/blobs")
+
+# unreferenced blobs (and abandoned staged uploads) are kept this long
+RESUME_BLOB_GC_GRACE_SECONDS = int(os.getenv("RESUME_BLOB_GC_GRACE_SECONDS", str(24 * 3600)))
+
+_CHUNK_SIZE = 1024 * 1024
+_DIGEST = re.compile(r"^[0-9a-f]{64}$")
+
+
+@dataclass
+class StagedBlob:
+    """Bytes written and hashed, not yet readable under their digest."""
+    digest: str
+    size: int
+    # backend handle of the staged copy (a temp file for the local store)
+    key: str
+
+
+# ============================================================
+# STORAGE INTERFACE
+# ============================================================
+class BlobWriter:
+    """Incremental ``stage``: ``write`` chunks, then ``close`` (-> StagedBlob) or ``abort``."""
+
+    def write(self, chunk: bytes):
+        raise NotImplementedError
+
+    def close(self) -> StagedBlob:
+        raise NotImplementedError
+
+    def abort(self):
+        raise NotImplementedError
+
+
+class BlobStore:
+    """
+    Resume bytes addressed by their SHA-256. Writes take two steps:
+    ``stage`` streams the bytes to a private location while hashing them,
+    and ``publish`` makes them readable under the digest. Callers record
+    their reference in the database between the two, so the collector can
+    never remove a blob someone is about to point at. An object-storage
+    backend implements the same methods (staged key -> server-side copy).
+    """
+
+    def writer(self) -> BlobWriter:
+        raise NotImplementedError
+
+    def stage(self, stream) -> StagedBlob:
+        writer = self.writer()
+        try:
+            while chunk := stream.read(_CHUNK_SIZE):
+                writer.write(chunk)
+        except BaseException:
+            writer.abort()
+            raise
+        return writer.close()
+
+    def publish(self, staged: StagedBlob):
+        """Idempotent; identical content that is already stored is not written again."""
+        raise NotImplementedError
+
+    def discard(self, staged: StagedBlob):
+        raise NotImplementedError
+
+    def open(self, digest: str):
+        raise NotImplementedError
+
+    def delete(self, digest: str):
+        raise NotImplementedError
+
+    def sweep_staged(self, older_than: datetime):
+        """Remove staged copies left by uploads that never published; returns how many."""
+        raise NotImplementedError
+
+
+class LocalBlobStore(BlobStore):
+    """
+    Blobs under ``root/ab/cd/<digest>`` (two levels of two hex characters,
+    so no directory grows past 65k entries); staged uploads under
+    ``root/staging`` on the same filesystem, so publishing is one rename.
+    """
+
+    def __init__(self, root: str, levels: int = 2):
+        self.root = root
+        self.levels = levels
+        self._staging = os.path.join(root, "staging")
+
+    def path(self, digest: str):
+        if not _DIGEST.match(digest):
+            raise ValueError(f"Not a blob digest: {digest!r}")
+        shards = [digest[2 * level:2 * level + 2] for level in range(self.levels)]
+        return os.path.join(self.root, *shards, digest)
+
+    def writer(self):
+        os.makedirs(self._staging, exist_ok=True)
+        return _LocalBlobWriter(self._staging)
+
+    def publish(self, staged: StagedBlob):
+        path = self.path(staged.digest)
+
+        if os.path.exists(path):
+            os.unlink(staged.key)
+            return
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # atomic; a concurrent publish of the same content just wins or loses the rename
+        os.replace(staged.key, path)
+
+    def discard(self, staged: StagedBlob):
+        try:
+            os.unlink(staged.key)
+        except FileNotFoundError:
+            pass
+
+    def open(self, digest: str):
+        return open(self.path(digest), "rb")
+
+    def delete(self, digest: str):
+        try:
+            os.unlink(self.path(digest))
+        except FileNotFoundError:
+            pass
+
+    def sweep_staged(self, older_than: datetime):
+        if not os.path.isdir(self._staging):
+            return 0
+
+        cutoff = older_than.timestamp()
+        removed = 0
+        for entry in os.scandir(self._staging):
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                try:
+                    os.unlink(entry.path)
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+        return removed
+
+
+class _LocalBlobWriter(BlobWriter):
+    def __init__(self, staging: str):
+        fd, self._path = tempfile.mkstemp(dir=staging, suffix=".part")
+        self._file = os.fdopen(fd, "wb")
+        self._sha256 = hashlib.sha256()
+        self._size = 0
+
+    def write(self, chunk: bytes):
+        self._sha256.update(chunk)
+        self._file.write(chunk)
+        self._size += len(chunk)
+
+    def close(self):
+        self._file.close()
+        return StagedBlob(self._sha256.hexdigest(), self._size, self._path)
+
+    def abort(self):
+        self._file.close()
+        try:
+            os.unlink(self._path)
+        except FileNotFoundError:
+            pass
+
+
+resume_store = LocalBlobStore(RESUME_STORE_DIR)
+
+
+def read_upload(blob_hash: str | None, file_path: str | None = None):
+    """Bytes of a resume upload: its blob, or the file of an upload that predates the store."""
+    if blob_hash:
+        with resume_store.open(blob_hash) as f:
+            return read_pdf(f)
+    return read_pdf(file_path)
+
+
+# ============================================================
+# REFERENCES
+# ============================================================
+def _insert(db: Session):
+    dialect = db.get_bind().dialect.name
+    return (postgresql if dialect == "postgresql" else sqlite).insert
+
+
+def _release(db: Session, digest: str, now: datetime):
+    db.execute(
+        update(ResumeBlob)
+        .where(ResumeBlob.digest == digest)
+        .values(
+            # counts are repaired by the collector, never pushed below zero
+            ref_count=case((ResumeBlob.ref_count > 0, ResumeBlob.ref_count - 1), else_=0),
+            updated_at=now
+        )
+    )
+
+
+def attach_resume(db: Session, application: CandidateApplication, staged: StagedBlob):
+    """
+    Make the staged blob the application's current resume: count the new
+    reference and release the one it replaces. The caller commits, then
+    publishes the blob.
+    """
+    digest = staged.digest
+    if application.resume_blob == digest:
+        return
+
+    now = datetime.now(timezone.utc)
+    stmt = _insert(db)(ResumeBlob)
+    db.execute(
+        stmt.values(digest=digest, byte_size=staged.size, ref_count=1, updated_at=now)
+        .on_conflict_do_update(
+            index_elements=[ResumeBlob.digest],
+            set_={"ref_count": ResumeBlob.ref_count + 1, "updated_at": stmt.excluded.updated_at}
+        )
+    )
+
+    if application.resume_blob:
+        _release(db, application.resume_blob, now)
+
+    application.resume_blob = digest
+
+
+# ============================================================
+# GARBAGE COLLECTION
+# ============================================================
+def collect_garbage(db: Session, store: BlobStore = resume_store, grace_seconds: int = RESUME_BLOB_GC_GRACE_SECONDS):
+    """
+    Delete blobs nobody has referenced for ``grace_seconds``, and staged
+    uploads abandoned for as long. Returns (blobs deleted, staged removed).
+    """
+    now = datetime.now(timezone.utc)
+    cutoff = now - timedelta(seconds=grace_seconds)
+    referenced = exists().where(CandidateApplication.resume_blob == ResumeBlob.digest)
+
+    # Applications removed by a database cascade never released their
+    # reference; zero those counts so the grace period starts now.
+    repaired = db.execute(
+        update(ResumeBlob)
+        .where(ResumeBlob.ref_count > 0, ~referenced)
+        .values(ref_count=0, updated_at=now)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+
+    digests = db.scalars(
+        select(ResumeBlob.digest).where(
+            ResumeBlob.ref_count == 0,
+            ResumeBlob.updated_at < cutoff,
+            ~referenced
+        )
+    ).all()
+
+    deleted = 0
+    for digest in digests:
+        # The row delete holds its lock while the file goes, so an upload of
+        # the same content waits, re-creates the row and publishes afresh.
+        gone = db.execute(
+            delete(ResumeBlob)
+            .where(ResumeBlob.digest == digest, ResumeBlob.ref_count == 0, ~referenced)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if gone:
+            store.delete(digest)
+            deleted += 1
+        db.commit()
+
+    staged = store.sweep_staged(cutoff)
+
+    print(f"🧹 Resume store: {deleted} blob(s) deleted, {staged} staged upload(s) removed, {repaired} count(s) repaired")
+
+    return deleted, staged
+
+
+# ============================================================
+# LEGACY UPLOADS
+# ============================================================
+def import_legacy_uploads(db: Session, store: BlobStore = resume_store):
+    """
+    Move ``uploads/resumes/{application_id}.pdf`` files into the store: each
+    application's latest upload becomes a referenced blob and the old file
+    is removed. Older jobs of the same application pointed at the same,
+    since overwritten, file and are left as they are.
+    """
+    latest = dict(db.execute(
+        select(ResumeJob.application_id, ResumeJob.id)
+        .join(CandidateApplication, CandidateApplication.id == ResumeJob.application_id)
+        .where(CandidateApplication.resume_blob.is_(None), ResumeJob.file_path.isnot(None))
+        .order_by(ResumeJob.id)
+    ).all())
+
+    started = time.perf_counter()
+    imported = 0
+
+    for job_id in latest.values():
+        job = db.get(ResumeJob, job_id)
+        if not os.path.exists(job.file_path):
+            continue
+
+        with open(job.file_path, "rb") as f:
+            staged = store.stage(f)
+
+        try:
+            attach_resume(db, job.application, staged)
+            job.blob_hash = staged.digest
+            db.commit()
+        except Exception:
+            db.rollback()
+            store.discard(staged)
+            raise
+
+        store.publish(staged)
+        os.unlink(job.file_path)
+        imported += 1
+
+    print(f"📦 Imported {imported} legacy upload(s) into the resume store in {time.perf_counter() - started:.1f}s")
+
+    return imported
+
+
+if __name__ == "__main__":
+    # python -m app.core.resume_store gc | import-legacy
+    commands = {"gc": collect_garbage, "import-legacy": import_legacy_uploads}
+    if len(sys.argv) == 2 and sys.argv[1] in commands:
+        db = SessionLocal()
+        try:
+            commands[sys.argv[1]](db)
+        finally:
+            db.close()
+    else:
+        print("usage: python -m app.core.resume_store gc | import-legacy")
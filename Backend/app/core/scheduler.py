@@ -1,4 +1,372 @@
-from apscheduler.schedulers.background import BackgroundScheduler
+from datetime import datetime, timedelta, timezone
+import json
+import os
+import random
+import socket
 
-scheduler = BackgroundScheduler()
-scheduler.start()
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..db.database import SessionLocal
+from ..models.scheduled_task import ScheduledTask
+from .workers import PollingWorkerPool
+
+SCHEDULER_WORKERS = int(os.getenv("SCHEDULER_WORKERS", "2"))
+SCHEDULER_POLL_SECONDS = float(os.getenv("SCHEDULER_POLL_SECONDS", "2"))
+SCHEDULER_LEASE_SECONDS = int(os.getenv("SCHEDULER_LEASE_SECONDS", "120"))
+SCHEDULER_MAX_ATTEMPTS = int(os.getenv("SCHEDULER_MAX_ATTEMPTS", "3"))
+SCHEDULER_RETRY_SECONDS = int(os.getenv("SCHEDULER_RETRY_SECONDS", "30"))
+SCHEDULER_RETRY_MAX_SECONDS = int(os.getenv("SCHEDULER_RETRY_MAX_SECONDS", "900"))
+
+# identifies this process in lease_owner
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+# kind -> handler(db, payload); the handler's changes commit with the task
+_handlers = {}
+# kind -> seconds between runs, for handlers registered with ``every``
+_periodic = {}
+
+
+class RetryTask(Exception):
+    """
+    Raised by a handler to run the task again later. ``delay=None`` uses the
+    exponential backoff; ``count_attempt=False`` is for "not now" (e.g. a
+    rate limit) rather than a failure.
+    """
+
+    def __init__(self, reason: str, delay: float | None = None, count_attempt: bool = True):
+        super().__init__(reason)
+        self.delay = delay
+        self.count_attempt = count_attempt
+
+
+class FailTask(Exception):
+    """Raised by a handler to fail the task for good: running it again is unsafe or pointless."""
+
+
+def task_handler(kind: str, every: float | None = None):
+    """
+    Register ``func(db, payload)`` for tasks of ``kind``. With ``every``, the
+    task is periodic: after each successful run the same row is queued again
+    ``every`` seconds later (see schedule_periodic_tasks).
+    """
+    def register(func):
+        _handlers[kind] = func
+        if every:
+            _periodic[kind] = every
+        return func
+    return register
+
+
+def _live(kind: str, dedupe_key: str):
+    return and_(
+        ScheduledTask.kind == kind,
+        ScheduledTask.dedupe_key == dedupe_key,
+        ScheduledTask.status.in_(["pending", "running"])
+    )
+
+
+def schedule_task(db: Session, kind: str, run_at: datetime, payload: dict, dedupe_key: str | None = None):
+    """
+    Store a task to run at ``run_at``. The caller commits, so the task is
+    created atomically with whatever state change triggered it. With a
+    ``dedupe_key``, a task of the same kind and key that is still pending
+    or running is returned instead of adding a second one.
+    """
+    if dedupe_key is not None:
+        task = db.query(ScheduledTask).filter(_live(kind, dedupe_key)).first()
+        if task:
+            print(f"📅 {kind} already scheduled for {dedupe_key}")
+            return task
+
+    task = ScheduledTask(
+        kind=kind,
+        payload=json.dumps(payload),
+        dedupe_key=dedupe_key,
+        run_at=run_at,
+        status="pending",
+        attempts=0
+    )
+    db.add(task)
+
+    print(f"📅 {kind} scheduled at {run_at}")
+
+    return task
+
+
+def cancel_task(db: Session, kind: str, dedupe_key: str):
+    """
+    Cancel the pending task of this kind and key, if any; returns whether
+    one was. A task already running is left to its handler. The caller
+    commits.
+    """
+    cancelled = db.execute(
+        update(ScheduledTask)
+        .where(_live(kind, dedupe_key), ScheduledTask.status == "pending")
+        .values(status="cancelled", finished_at=datetime.now(timezone.utc))
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+    if cancelled:
+        print(f"📅 {kind} cancelled for {dedupe_key}")
+
+    return cancelled > 0
+
+
+def pending_task_keys(db: Session, kind: str, dedupe_keys: list[str]):
+    """The subset of ``dedupe_keys`` with a task of this kind still waiting to run."""
+    if not dedupe_keys:
+        return set()
+
+    return set(db.scalars(
+        select(ScheduledTask.dedupe_key).where(
+            ScheduledTask.kind == kind,
+            ScheduledTask.dedupe_key.in_(dedupe_keys),
+            ScheduledTask.status == "pending"
+        )
+    ))
+
+
+# ============================================================
+# DISPATCH
+# ============================================================
+def _claimable(now: datetime):
+    return or_(
+        and_(ScheduledTask.status == "pending", ScheduledTask.run_at <= now),
+        # a dispatcher died while holding the lease, with attempts left
+        and_(
+            ScheduledTask.status == "running",
+            ScheduledTask.lease_expires_at < now,
+            ScheduledTask.attempts < SCHEDULER_MAX_ATTEMPTS
+        )
+    )
+
+
+def _fail_abandoned_tasks(db: Session, now: datetime):
+    """
+    Tasks whose lease expired on their last attempt: the dispatcher died on
+    them every time. They are failed instead of being handed out again; for
+    a call, the process may have died after Bland accepted it. Periodic
+    tasks are queued again after the longest backoff instead.
+    """
+    abandoned = and_(
+        ScheduledTask.status == "running",
+        ScheduledTask.lease_expires_at < now,
+        ScheduledTask.attempts >= SCHEDULER_MAX_ATTEMPTS
+    )
+
+    tasks = db.execute(
+        select(ScheduledTask.id, ScheduledTask.kind)
+        .where(abandoned)
+        .with_for_update(skip_locked=True)
+    ).all()
+
+    if not tasks:
+        return
+
+    failed = [task.id for task in tasks if task.kind not in _periodic]
+    requeued = [task.id for task in tasks if task.kind in _periodic]
+    released = {"last_error": "Dispatcher lost on the last attempt", "lease_owner": None, "lease_expires_at": None}
+
+    if failed:
+        db.execute(
+            update(ScheduledTask)
+            .where(ScheduledTask.id.in_(failed), abandoned)
+            .values(status="failed", finished_at=now, **released)
+        )
+    if requeued:
+        db.execute(
+            update(ScheduledTask)
+            .where(ScheduledTask.id.in_(requeued), abandoned)
+            .values(
+                status="pending",
+                run_at=now + timedelta(seconds=SCHEDULER_RETRY_MAX_SECONDS),
+                **released
+            )
+        )
+    db.commit()
+
+    print(
+        f"Dispatcher lost on every attempt: failed {len(failed)} scheduled task(s), "
+        f"requeued {len(requeued)} periodic one(s)"
+    )
+
+
+def claim_due_task():
+    db = SessionLocal()
+    try:
+        now = datetime.now(timezone.utc)
+
+        _fail_abandoned_tasks(db, now)
+
+        candidate = (
+            db.query(ScheduledTask.id)
+            .filter(_claimable(now))
+            .order_by(ScheduledTask.run_at)
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+
+        if not candidate:
+            db.rollback()
+            return None
+
+        # Only one process can win the lease, with or without SKIP LOCKED.
+        claimed = db.execute(
+            update(ScheduledTask)
+            .where(ScheduledTask.id == candidate.id, _claimable(now))
+            .values(
+                status="running",
+                lease_owner=WORKER_ID,
+                lease_expires_at=now + timedelta(seconds=SCHEDULER_LEASE_SECONDS),
+                attempts=ScheduledTask.attempts + 1
+            )
+        )
+        db.commit()
+
+        return candidate.id if claimed.rowcount == 1 else None
+
+    finally:
+        db.close()
+
+
+def run_task(task_id: int):
+    db = SessionLocal()
+    try:
+        task = db.query(ScheduledTask).filter(ScheduledTask.id == task_id).first()
+        if not task or task.status != "running" or task.lease_owner != WORKER_ID:
+            return
+
+        handler = _handlers.get(task.kind)
+
+        try:
+            if handler is None:
+                raise ValueError(f"No handler registered for {task.kind}")
+
+            handler(db, json.loads(task.payload))
+
+        except FailTask as e:
+            db.rollback()
+            print(f"Scheduled task {task_id} ({task.kind}) failed without retry:", e)
+            task.status = "failed"
+            task.last_error = str(e)[:2000]
+            task.lease_owner = None
+            task.lease_expires_at = None
+            task.finished_at = datetime.now(timezone.utc)
+
+        except RetryTask as retry:
+            db.rollback()
+            if not retry.count_attempt:
+                task.attempts -= 1
+            delay = retry.delay if retry.delay is not None else _backoff(task.attempts)
+            _reschedule(task, delay, str(retry))
+
+        except Exception as e:
+            db.rollback()
+            print(f"Scheduled task {task_id} ({task.kind}) failed:", e)
+            _reschedule(task, _backoff(task.attempts), str(e))
+
+        else:
+            task.last_error = None
+            task.lease_owner = None
+            task.lease_expires_at = None
+
+            if task.kind in _periodic:
+                # the row comes round again, so it never has a second live copy
+                task.status = "pending"
+                task.attempts = 0
+                task.run_at = datetime.now(timezone.utc) + timedelta(seconds=_periodic[task.kind])
+            else:
+                task.status = "done"
+                task.finished_at = datetime.now(timezone.utc)
+
+        db.commit()
+
+    finally:
+        db.close()
+
+
+def _backoff(attempts: int):
+    delay = min(SCHEDULER_RETRY_SECONDS * 2 ** max(attempts - 1, 0), SCHEDULER_RETRY_MAX_SECONDS)
+    # jitter so a burst of failures does not retry in lockstep
+    return delay * random.uniform(1.0, 1.2)
+
+
+def _reschedule(task: ScheduledTask, delay: float, error: str):
+    task.last_error = error[:2000]
+    task.lease_owner = None
+    task.lease_expires_at = None
+
+    # periodic tasks never stop; they keep backing off (up to
+    # SCHEDULER_RETRY_MAX_SECONDS) until a run succeeds
+    if task.attempts >= SCHEDULER_MAX_ATTEMPTS and task.kind not in _periodic:
+        task.status = "failed"
+        task.finished_at = datetime.now(timezone.utc)
+    else:
+        task.status = "pending"
+        task.run_at = datetime.now(timezone.utc) + timedelta(seconds=delay)
+
+
+def recover_overdue_tasks():
+    """
+    Called on startup: release leases left behind by a crashed process so
+    overdue tasks are dispatched right away instead of being lost. Tasks
+    whose last attempt was the one that crashed are failed instead.
+    """
+    db = SessionLocal()
+    try:
+        now = datetime.now(timezone.utc)
+
+        _fail_abandoned_tasks(db, now)
+
+        released = db.execute(
+            update(ScheduledTask)
+            .where(
+                ScheduledTask.status == "running",
+                ScheduledTask.lease_expires_at < now,
+                ScheduledTask.attempts < SCHEDULER_MAX_ATTEMPTS
+            )
+            .values(status="pending", lease_owner=None, lease_expires_at=None)
+        )
+
+        overdue = (
+            db.query(ScheduledTask)
+            .filter(ScheduledTask.status == "pending", ScheduledTask.run_at <= now)
+            .count()
+        )
+
+        db.commit()
+
+        print(f"⏰ Scheduler recovered {released.rowcount} expired lease(s), {overdue} overdue task(s)")
+
+    finally:
+        db.close()
+
+
+def schedule_periodic_tasks():
+    """
+    Called on startup: queue every periodic handler's task unless it is
+    already live (e.g. left by an earlier run, or queued by another process).
+    """
+    db = SessionLocal()
+    try:
+        for kind in _periodic:
+            schedule_task(db, kind, datetime.now(timezone.utc), {}, dedupe_key=kind)
+            try:
+                db.commit()
+            except IntegrityError:
+                # uq_scheduled_task_live_key: another process got there first
+                db.rollback()
+
+    finally:
+        db.close()
+
+
+task_scheduler = PollingWorkerPool(
+    "scheduler",
+    claim_due_task,
+    run_task,
+    size=SCHEDULER_WORKERS,
+    poll_interval=SCHEDULER_POLL_SECONDS
+)
@@ -1,6 +1,25 @@
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import multiprocessing
+import os
+import threading
+
+from fastapi import HTTPException
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Raising this rehashes existing passwords on their owner's next login.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+# hashes running + waiting; beyond this requests are shed with a 503
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", str(PASSWORD_HASH_WORKERS * 8)))
+PASSWORD_HASH_RETRY_AFTER = os.getenv("PASSWORD_HASH_RETRY_AFTER", "1")
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=BCRYPT_ROUNDS
+)
 
 def hash_password(password: str):
     password = password[:72]   # 🔥 bcrypt limit fix
@@ -8,3 +27,60 @@ def hash_password(password: str):
 
 def verify_password(plain: str, hashed: str):
     return pwd_context.verify(plain[:72], hashed)
+
+def verify_and_update_password(plain: str, hashed: str):
+    """(valid, new_hash); new_hash is set when ``hashed`` uses an outdated cost."""
+    return pwd_context.verify_and_update(plain[:72], hashed)
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a dedicated process pool so a burst of logins neither
+    holds the GIL nor occupies the request threadpool. At most
+    ``max_pending`` hashes may be queued; further calls fail fast with 503.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a process that already runs worker threads is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    async def _run(self, func, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HTTPException(
+                status_code=503,
+                detail="Too many concurrent sign-ins, please retry",
+                headers={"Retry-After": PASSWORD_HASH_RETRY_AFTER}
+            )
+
+        try:
+            future = self._get_executor().submit(func, *args)
+            return await asyncio.wrap_future(future)
+        finally:
+            self._slots.release()
+
+    async def hash(self, password: str):
+        return await self._run(hash_password, password)
+
+    async def verify_and_update(self, plain: str, hashed: str):
+        return await self._run(verify_and_update_password, plain, hashed)
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(cancel_futures=True)
+                self._executor = None
+
+
+password_hasher = PasswordHasher(PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING)
@@ -0,0 +1,91 @@
+import json
+
+from sqlalchemy import func, or_, select
+
+from ..db.database import SessionLocal
+from ..models.user import User
+from .pagination import encode_cursor
+
+# rows fetched per round trip while streaming
+DIRECTORY_FETCH_SIZE = 200
+
+
+def _like_pattern(q: str, match: str):
+    term = (
+        q.strip().lower()
+        .replace("\\", "\\\\")
+        .replace("%", "\\%")
+        .replace("_", "\\_")
+    )
+    # "prefix" is served by the text_pattern_ops indexes, "contains" by pg_trgm
+    return f"{term}%" if match == "prefix" else f"%{term}%"
+
+
+def directory_filters(role: str | None, q: str | None, match: str = "prefix"):
+    filters = []
+
+    if role:
+        filters.append(User.role == role.strip().lower())
+
+    if q and q.strip():
+        pattern = _like_pattern(q, match)
+        filters.append(or_(
+            func.lower(User.email).like(pattern, escape="\\"),
+            func.lower(User.name).like(pattern, escape="\\")
+        ))
+
+    return filters
+
+
+def _row_json(row):
+    return json.dumps({
+        "id": row.id,
+        "name": row.name,
+        "email": row.email,
+        "phone": row.phone,
+        "role": row.role,
+        "created_at": row.created_at.isoformat() if row.created_at else None,
+    })
+
+
+def stream_user_directory(filters: list, after_id: int | None, limit: int):
+    """
+    Yield one page of the directory as ``{"items": [...], "next_cursor": ...}``,
+    newest first. Rows are serialized as they arrive from the database, so
+    memory stays flat whatever ``limit`` is. Opens its own session because
+    the body is produced after the endpoint has returned.
+    """
+    db = SessionLocal()
+    try:
+        stmt = (
+            select(User.id, User.name, User.email, User.phone, User.role, User.created_at)
+            .where(*filters)
+        )
+        if after_id is not None:
+            stmt = stmt.where(User.id < after_id)
+
+        rows = db.execute(
+            stmt.order_by(User.id.desc())
+            .limit(limit + 1)
+            .execution_options(yield_per=DIRECTORY_FETCH_SIZE)
+        )
+
+        yield '{"items":['
+
+        sent, last_id, has_more = 0, None, False
+        for row in rows:
+            if sent == limit:
+                has_more = True
+                break
+
+            yield ("," if sent else "") + _row_json(row)
+            sent += 1
+            last_id = row.id
+
+        rows.close()
+
+        next_cursor = encode_cursor([last_id]) if has_more else None
+        yield '],"next_cursor":' + json.dumps(next_cursor) + "}"
+
+    finally:
+        db.close()
@@ -0,0 +1,71 @@
+import threading
+
+
+class PollingWorkerPool:
+    """
+    Small pool of daemon threads that repeatedly claim a unit of work
+    from the database and handle it.
+
+    ``claim`` returns an identifier (or None when there is nothing to do)
+    and ``handle`` processes that identifier in its own DB session, so a
+    crashed process simply leaves rows behind for another worker to pick up.
+    """
+
+    def __init__(self, name: str, claim, handle, size: int = 2, poll_interval: float = 1.0):
+        self.name = name
+        self.claim = claim
+        self.handle = handle
+        self.size = size
+        self.poll_interval = poll_interval
+
+        self._threads = []
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+
+    def start(self):
+        if self._threads:
+            return
+
+        self._stop.clear()
+
+        for index in range(self.size):
+            thread = threading.Thread(
+                target=self._run,
+                name=f"{self.name}-worker-{index}",
+                daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+        print(f"🚀 {self.name} workers started ({self.size})")
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        self._wake.set()
+
+        for thread in self._threads:
+            thread.join(timeout)
+
+        self._threads = []
+
+    def wake(self):
+        """Skip the poll interval, e.g. right after enqueueing new work."""
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                item = self.claim()
+            except Exception as e:
+                print(f"{self.name} worker claim failed:", e)
+                item = None
+
+            if item is None:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+                continue
+
+            try:
+                self.handle(item)
+            except Exception as e:
+                print(f"{self.name} worker failed on {item}:", e)
@@ -1,17 +1,83 @@
+import asyncio
+
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from dotenv import load_dotenv
 import os
 
+from .instrumentation import instrument
+
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 print("DB CONNECTING TO:", DATABASE_URL)
 
-engine = create_engine(
-    DATABASE_URL,
-    echo=True  # shows SQL queries in terminal (good for debugging)
-)
+# DB_ASYNC=1 serves get_async_db from a native async engine (asyncpg /
+# aiosqlite); otherwise it wraps the sync engine on the threadpool.
+DB_ASYNC = os.getenv("DB_ASYNC", "0").lower() in ("1", "true", "yes")
+
+
+def _async_url(url: str):
+    driver, _, rest = url.partition("://")
+    if driver in ("postgresql", "postgres", "postgresql+psycopg2"):
+        return "postgresql+asyncpg://" + rest
+    if driver == "sqlite":
+        return "sqlite+aiosqlite://" + rest
+    return url
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _async_url(DATABASE_URL)
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# recycle before the server / a proxy drops idle connections
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "1").lower() in ("1", "true", "yes")
+# Postgres only; 0 disables
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+DB_ECHO = os.getenv("DB_ECHO", "0").lower() in ("1", "true", "yes")
+
+# A threaded session keeps its connection between threadpool hops, so more
+# open sessions than pooled connections would park threads waiting on each
+# other. Default leaves 5 connections for the background workers.
+DB_THREADED_SESSION_LIMIT = int(os.getenv(
+    "DB_THREADED_SESSION_LIMIT",
+    str(max(DB_POOL_SIZE + DB_MAX_OVERFLOW - 5, 1))
+))
+
+
+def _engine_options(url: str):
+    options = {"echo": DB_ECHO, "pool_pre_ping": DB_POOL_PRE_PING}
+
+    # in-memory SQLite uses a per-thread pool without size settings
+    if url.startswith("sqlite") and ":memory:" in url:
+        return options
+
+    options.update(
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE
+    )
+
+    if url.startswith("postgres") and DB_STATEMENT_TIMEOUT_MS > 0:
+        if "+asyncpg" in url:
+            options["connect_args"] = {
+                "server_settings": {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}
+            }
+        else:
+            options["connect_args"] = {
+                "options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"
+            }
+
+    return options
+
+
+engine = create_engine(DATABASE_URL, **_engine_options(DATABASE_URL))
+instrument(engine)
 
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -28,3 +94,85 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async_engine = None
+AsyncSessionLocal = None
+
+if DB_ASYNC:
+    print("ASYNC DB CONNECTING TO:", ASYNC_DATABASE_URL)
+
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, **_engine_options(ASYNC_DATABASE_URL))
+    instrument(async_engine.sync_engine)
+
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine,
+        autoflush=False,
+        # objects stay readable after commit without a lazy (sync) reload
+        expire_on_commit=False
+    )
+
+
+class ThreadedAsyncSession:
+    """
+    The subset of AsyncSession the routers use, backed by a sync Session
+    whose calls run on the threadpool. Lets the async routers run unchanged
+    when DB_ASYNC is off.
+    """
+
+    def __init__(self, session):
+        self.sync_session = session
+
+    def add(self, instance):
+        self.sync_session.add(instance)
+
+    async def execute(self, statement, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.execute, statement, *args, **kwargs)
+
+    async def scalar(self, statement, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.scalar, statement, *args, **kwargs)
+
+    async def scalars(self, statement, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.scalars, statement, *args, **kwargs)
+
+    async def get(self, entity, ident, **kwargs):
+        return await run_in_threadpool(self.sync_session.get, entity, ident, **kwargs)
+
+    async def flush(self):
+        await run_in_threadpool(self.sync_session.flush)
+
+    async def refresh(self, instance, attribute_names=None):
+        await run_in_threadpool(self.sync_session.refresh, instance, attribute_names)
+
+    async def delete(self, instance):
+        await run_in_threadpool(self.sync_session.delete, instance)
+
+    async def commit(self):
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self):
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def close(self):
+        await run_in_threadpool(self.sync_session.close)
+
+    async def run_sync(self, fn, *args, **kwargs):
+        """Same contract as AsyncSession.run_sync: ``fn(session, *args)``."""
+        return await run_in_threadpool(fn, self.sync_session, *args, **kwargs)
+
+
+_threaded_sessions = asyncio.Semaphore(DB_THREADED_SESSION_LIMIT)
+
+
+async def get_async_db():
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+
+    async with _threaded_sessions:
+        db = ThreadedAsyncSession(SessionLocal(expire_on_commit=False))
+        try:
+            yield db
+        finally:
+            await db.close()
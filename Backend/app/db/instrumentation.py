@@ -0,0 +1,155 @@
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import os
+import threading
+import time
+
+from sqlalchemy import event
+
+DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "200"))
+# adds X-DB-* headers to every response; meant for local debugging
+DB_DEBUG_HEADERS = os.getenv("DB_DEBUG_HEADERS", "0").lower() in ("1", "true", "yes")
+
+SLOW_QUERY_LOG_SIZE = 50
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    seconds: float = 0.0
+    slow: int = 0
+
+
+@dataclass
+class _Totals:
+    queries: int = 0
+    seconds: float = 0.0
+    slow: int = 0
+    requests: int = 0
+    request_queries: int = 0
+    max_request_queries: int = 0
+    max_request_path: str | None = None
+    slow_log: deque = field(default_factory=lambda: deque(maxlen=SLOW_QUERY_LOG_SIZE))
+
+
+# Set per HTTP request by DBMetricsMiddleware. The object is shared (not
+# copied) with the threadpool / greenlet that runs the queries.
+_request_stats: ContextVar[QueryStats | None] = ContextVar("db_request_stats", default=None)
+
+_totals = _Totals()
+_lock = threading.Lock()
+_engines = []
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    slow = elapsed * 1000 >= DB_SLOW_QUERY_MS
+
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+        stats.slow += slow
+
+    with _lock:
+        _totals.queries += 1
+        _totals.seconds += elapsed
+        if slow:
+            _totals.slow += 1
+            _totals.slow_log.append({
+                "ms": round(elapsed * 1000, 1),
+                "statement": " ".join(statement.split())[:500],
+                "at": time.time()
+            })
+
+    if slow:
+        print(f"🐢 slow query ({elapsed * 1000:.0f}ms): {' '.join(statement.split())[:200]}")
+
+
+def _handle_error(context):
+    # a failed statement never reaches after_cursor_execute; drop its start
+    # time so the next query on this connection is not timed against it
+    if context.connection is None or context.execution_context is None:
+        return
+    started = context.connection.info.get("query_started")
+    if started:
+        started.pop()
+
+
+def instrument(engine):
+    """Attach the query timers to a sync Engine (pass ``async_engine.sync_engine`` for async)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+    _engines.append(engine)
+
+
+def _record_request(path: str, stats: QueryStats):
+    with _lock:
+        _totals.requests += 1
+        _totals.request_queries += stats.count
+        if stats.count > _totals.max_request_queries:
+            _totals.max_request_queries = stats.count
+            _totals.max_request_path = path
+
+
+class DBMetricsMiddleware:
+    """Scopes query stats to each HTTP request and optionally reports them as headers."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _request_stats.set(stats)
+
+        async def send_with_headers(message):
+            if DB_DEBUG_HEADERS and message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers += [
+                    (b"x-db-query-count", str(stats.count).encode()),
+                    (b"x-db-time-ms", f"{stats.seconds * 1000:.1f}".encode()),
+                    (b"x-db-slow-queries", str(stats.slow).encode()),
+                ]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _request_stats.reset(token)
+            _record_request(scope.get("path", ""), stats)
+
+
+def metrics():
+    with _lock:
+        totals = {
+            "queries": _totals.queries,
+            "db_time_ms": round(_totals.seconds * 1000, 1),
+            "avg_query_ms": round(_totals.seconds * 1000 / _totals.queries, 2) if _totals.queries else 0.0,
+            "slow_queries": _totals.slow,
+            "slow_query_threshold_ms": DB_SLOW_QUERY_MS,
+            "requests": _totals.requests,
+            "avg_queries_per_request": (
+                round(_totals.request_queries / _totals.requests, 2) if _totals.requests else 0.0
+            ),
+            "max_queries_per_request": _totals.max_request_queries,
+            "max_queries_path": _totals.max_request_path,
+            "recent_slow_queries": list(_totals.slow_log),
+        }
+
+    totals["pools"] = [
+        {"engine": engine.url.render_as_string(hide_password=True), "status": engine.pool.status()}
+        for engine in _engines
+    ]
+
+    return totals
@@ -1,8 +1,17 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from .routers import users, auth, profile, jobs, applications, admin
+from .routers import users, auth, profile, jobs, applications, admin, candidates
 from .db.database import engine, Base
+from .db.instrumentation import DBMetricsMiddleware
 from fastapi.middleware.cors import CORSMiddleware
-from app.core.scheduler import scheduler
+from app.core.scheduler import task_scheduler, recover_overdue_tasks, schedule_periodic_tasks
+from app.core.resume_pipeline import resume_workers
+from app.core.interview_pipeline import webhook_workers
+from app.core.rescoring import rescore_workers
+from app.core.idf_model import load_idf_model
+from app.core.security import password_hasher
+from app.core.resume_parser import resume_parser
 
 
 # Import models so tables are registered
@@ -11,8 +20,47 @@ from .models.profile import Profile
 from .models.job import JobListing
 from .models.application import CandidateApplication
 from .models.interview import Interview
+from .models.resume_job import ResumeJob
+from .models.job_artifact import JobTextArtifact
+from .models.idf import IdfTerm, IdfCorpus
+from .models.llm_cache import LLMResponseCache
+from .models.webhook_event import WebhookEvent
+from .models.scheduled_task import ScheduledTask
+from .models.stats import StatCounter, RecruiterStats
+from .models.table_version import TableVersion
+from .models.candidate_vector import CandidateVector
+from .models.resume_artifact import ResumeArtifact
+from .models.rescore_run import RescoreRun
+from .models.resume_blob import ResumeBlob
+
+# Registers the ORM hooks that keep the admin rollups and table versions current
+from .core import admin_stats, http_cache
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    try:
+        load_idf_model()
+    except Exception as e:
+        print("IDF model not loaded:", e)
 
-app = FastAPI()
+    recover_overdue_tasks()
+    schedule_periodic_tasks()
+
+    resume_workers.start()
+    webhook_workers.start()
+    task_scheduler.start()
+    rescore_workers.start()
+    yield
+    rescore_workers.stop()
+    task_scheduler.stop()
+    webhook_workers.stop()
+    resume_workers.stop()
+    password_hasher.shutdown()
+    resume_parser.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -25,8 +73,11 @@ app.add_middleware(
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "X-DB-Query-Count", "X-DB-Time-Ms", "X-DB-Slow-Queries"],
 )
 
+app.add_middleware(DBMetricsMiddleware)
+
 
 # Base.metadata.create_all(bind=engine)
 
@@ -36,3 +87,4 @@ app.include_router(profile.router)
 app.include_router(jobs.router)
 app.include_router(applications.router)
 app.include_router(admin.router)
+app.include_router(candidates.router)
@@ -3,3 +3,15 @@ from .profile import Profile
 from .job import JobListing
 from .application import CandidateApplication
 from .interview import Interview
+from .resume_job import ResumeJob
+from .job_artifact import JobTextArtifact
+from .idf import IdfTerm, IdfCorpus
+from .llm_cache import LLMResponseCache
+from .webhook_event import WebhookEvent
+from .scheduled_task import ScheduledTask
+from .stats import StatCounter, RecruiterStats
+from .table_version import TableVersion
+from .candidate_vector import CandidateVector
+from .resume_artifact import ResumeArtifact
+from .rescore_run import RescoreRun
+from .resume_blob import ResumeBlob
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, Integer, String, Text, DateTime , ForeignKey 
+from sqlalchemy import Boolean, Column, Float, Integer, String, Text, DateTime , ForeignKey, Index, text
 from sqlalchemy.sql import func
 from ..db.database import Base
 from sqlalchemy.orm import relationship
@@ -7,6 +7,16 @@ from sqlalchemy.orm import relationship
 
 class CandidateApplication(Base):
     __tablename__ = "candidate_application"
+    __table_args__ = (
+        # per-job leaderboard: top-N / rank / percentile are index range scans
+        Index("ix_candidate_application_job_performance", "job_id", "performance_score"),
+        # recruiter view of a job, filtered by status
+        Index("ix_candidate_application_job_status", "job_id", "status"),
+        # candidate's "my applications", newest first
+        Index("ix_candidate_application_user_created", "user_id", text("created_at DESC")),
+        # one application per candidate per job
+        Index("uq_candidate_application_user_job", "user_id", "job_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
@@ -27,3 +37,31 @@ class CandidateApplication(Base):
     communication_score = Column(Integer, nullable=True)
     technical_score = Column(Integer, nullable=True)
     confidence_score = Column(Integer, nullable=True)
+
+    # average of the available scores, maintained by core.leaderboard
+    performance_score = Column(Float, nullable=True)
+
+    # parts of resume_score, kept so a rescore can recombine them without the LLM
+    tfidf_score = Column(Integer, nullable=True)
+    ai_score = Column(Integer, nullable=True)
+
+    # status last set by the automatic resume / interview decision; a rescore
+    # only revisits applications nobody has moved since
+    auto_status = Column(String(30), nullable=True)
+
+    # parsed text + features of the last processed resume
+    resume_hash = Column(
+        String(64),
+        ForeignKey("resume_artifact.content_hash", ondelete="SET NULL"),
+        nullable=True,
+        index=True
+    )
+    resume_artifact = relationship("ResumeArtifact")
+
+    # current upload in core.resume_store (counted in resume_blob.ref_count)
+    resume_blob = Column(
+        String(64),
+        ForeignKey("resume_blob.digest"),
+        nullable=True,
+        index=True
+    )
@@ -0,0 +1,28 @@
+from sqlalchemy import BigInteger, Column, Integer, Text, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from ..db.database import Base
+
+
+class CandidateVector(Base):
+    __tablename__ = "candidate_vector"
+
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+
+    # JSON objects {term: count}; weighted with the current IDF snapshot at
+    # query time, so they stay valid as the corpus grows
+    resume_terms = Column(Text, nullable=True)
+    skills_terms = Column(Text, nullable=True)
+
+    # candidate_vector table_version of the last write, so a cached matrix
+    # can fetch just the rows that changed since it was built
+    version = Column(BigInteger, nullable=False, default=0, server_default="0", index=True)
+
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now()
+    )
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from ..db.database import Base
+
+
+class IdfTerm(Base):
+    __tablename__ = "idf_term"
+
+    term = Column(String(100), primary_key=True)
+    doc_freq = Column(Integer, nullable=False, default=0)
+
+
+class IdfCorpus(Base):
+    __tablename__ = "idf_corpus"
+
+    # single row (id = 1) holding corpus-wide counters
+    id = Column(Integer, primary_key=True)
+    doc_count = Column(Integer, nullable=False, default=0)
+
+    # bumped on every added document; snapshots are reloaded when it moves
+    version = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now()
+    )
@@ -11,7 +11,8 @@ class Interview(Base):
 
     candidate_application_id = Column(
         Integer,
-        ForeignKey("candidate_application.id", ondelete="CASCADE")
+        ForeignKey("candidate_application.id", ondelete="CASCADE"),
+        index=True
     )
 
     audio_url = Column(Text, nullable=True)
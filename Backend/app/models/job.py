@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, Index, text
 import enum
 from sqlalchemy.sql import func
 from ..db.database import Base
@@ -12,9 +12,13 @@ class JobStatus(str, enum.Enum):
 
 class JobListing(Base):
     __tablename__ = "job_listing"
+    __table_args__ = (
+        # newest jobs first (admin overview)
+        Index("ix_job_listing_created_at", text("created_at DESC")),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    recruiter_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
+    recruiter_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), index=True)
 
     title = Column(String(150), nullable=False)
     role = Column(String(100))
@@ -31,4 +35,8 @@ class JobListing(Base):
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    # bumped on every update; the job's ETag (see core.http_cache)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
     recruiter = relationship("User", backref="job_listings")
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from ..db.database import Base
+
+
+class JobTextArtifact(Base):
+    __tablename__ = "job_text_artifact"
+
+    job_id = Column(
+        Integer,
+        ForeignKey("job_listing.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+
+    # sha256 of the description the terms were computed from
+    description_hash = Column(String(64), nullable=False)
+
+    # JSON object {term: count} after tokenization + stop-word filtering
+    term_counts = Column(Text, nullable=False)
+
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now()
+    )
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, String, Text, DateTime
+from sqlalchemy.sql import func
+from ..db.database import Base
+
+
+class LLMResponseCache(Base):
+    __tablename__ = "llm_response_cache"
+
+    # sha256(model, prompt version, inputs) - see core.llm_cache.make_key
+    cache_key = Column(String(64), primary_key=True)
+    model = Column(String(100), nullable=False)
+
+    # parsed JSON response
+    response = Column(Text, nullable=False)
+
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
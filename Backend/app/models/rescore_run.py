@@ -0,0 +1,38 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from ..db.database import Base
+from sqlalchemy.orm import relationship
+
+
+class RescoreRun(Base):
+    __tablename__ = "rescore_run"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(
+        Integer,
+        ForeignKey("job_listing.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+
+    # what asked for it: description / threshold / manual
+    reason = Column(String(20), nullable=False, default="manual")
+
+    # queued -> running -> completed / failed
+    status = Column(String(20), nullable=False, default="queued", index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+
+    # progress, committed after every batch
+    total = Column(Integer, nullable=False, default=0)
+    processed = Column(Integer, nullable=False, default=0)
+    parsed = Column(Integer, nullable=False, default=0)
+    scores_changed = Column(Integer, nullable=False, default=0)
+    decisions_changed = Column(Integer, nullable=False, default=0)
+
+    locked_at = Column(DateTime(timezone=True), nullable=True)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    job = relationship("JobListing")
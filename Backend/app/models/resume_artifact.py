@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, LargeBinary, DateTime
+from sqlalchemy.sql import func
+from ..db.database import Base
+
+
+class ResumeArtifact(Base):
+    __tablename__ = "resume_artifact"
+
+    # sha256 of the uploaded PDF bytes; identical uploads share one row
+    content_hash = Column(String(64), primary_key=True)
+    byte_size = Column(Integer, nullable=False)
+
+    # zlib-compressed UTF-8 text, as extracted by core.resume_parser
+    text = Column(LargeBinary, nullable=False)
+
+    token_count = Column(Integer, nullable=False)
+    term_count = Column(Integer, nullable=False)
+
+    # packed term counts + TF-IDF weights, see core.resume_artifacts
+    features = Column(LargeBinary, nullable=False)
+    # IDF corpus version the stored weights were computed under
+    idf_version = Column(Integer, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
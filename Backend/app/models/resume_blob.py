@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from ..db.database import Base
+
+
+class ResumeBlob(Base):
+    __tablename__ = "resume_blob"
+
+    # sha256 of the stored PDF bytes; the key in core.resume_store
+    digest = Column(String(64), primary_key=True)
+    byte_size = Column(Integer, nullable=False)
+
+    # applications whose current resume this is; 0 = collectable
+    ref_count = Column(Integer, nullable=False, default=0, index=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # last reference change; the collector waits a grace period after it
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from ..db.database import Base
+from sqlalchemy.orm import relationship
+
+
+class ResumeJob(Base):
+    __tablename__ = "resume_job"
+
+    id = Column(Integer, primary_key=True, index=True)
+    application_id = Column(
+        Integer,
+        ForeignKey("candidate_application.id", ondelete="CASCADE"),
+        nullable=False
+    )
+
+    # digest in core.resume_store; uploads from before the store have a file_path instead
+    blob_hash = Column(String(64), nullable=True)
+    file_path = Column(Text, nullable=True)
+
+    # queued -> processing -> completed / failed
+    status = Column(String(20), nullable=False, default="queued", index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+
+    resume_score = Column(Integer, nullable=True)
+    application_status = Column(String(30), nullable=True)
+
+    locked_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    application = relationship("CandidateApplication", backref="resume_jobs")
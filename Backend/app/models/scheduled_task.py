@@ -0,0 +1,39 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index, text
+from sqlalchemy.sql import func
+from ..db.database import Base
+
+
+class ScheduledTask(Base):
+    __tablename__ = "scheduled_task"
+    __table_args__ = (
+        Index("ix_scheduled_task_status_run_at", "status", "run_at"),
+        # at most one live task per (kind, dedupe_key), e.g. one pending call per application
+        Index(
+            "uq_scheduled_task_live_key",
+            "kind", "dedupe_key",
+            unique=True,
+            postgresql_where=text("status IN ('pending', 'running')"),
+            sqlite_where=text("status IN ('pending', 'running')")
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # handler name registered with core.scheduler.task_handler
+    kind = Column(String(50), nullable=False)
+    payload = Column(Text, nullable=False)
+    dedupe_key = Column(String(100), nullable=True)
+
+    run_at = Column(DateTime(timezone=True), nullable=False)
+
+    # pending -> running -> done / failed; pending -> cancelled
+    status = Column(String(20), nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+
+    # lease held by the process currently dispatching the task
+    lease_owner = Column(String(100), nullable=True)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
+
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
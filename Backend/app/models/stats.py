@@ -0,0 +1,22 @@
+from sqlalchemy import Column, BigInteger, Integer, String, ForeignKey
+from ..db.database import Base
+
+
+class StatCounter(Base):
+    __tablename__ = "stat_counter"
+
+    # "users", "jobs", "applications", "users.role:<role>", "applications.status:<status>"
+    name = Column(String(100), primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0)
+
+
+class RecruiterStats(Base):
+    __tablename__ = "recruiter_stats"
+
+    recruiter_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    jobs_posted = Column(Integer, nullable=False, default=0)
+    applications_received = Column(Integer, nullable=False, default=0)
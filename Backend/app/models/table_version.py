@@ -0,0 +1,19 @@
+from sqlalchemy import Column, BigInteger, String, DateTime
+from sqlalchemy.sql import func
+from ..db.database import Base
+
+
+class TableVersion(Base):
+    __tablename__ = "table_version"
+
+    # table name, e.g. "job_listing"
+    name = Column(String(100), primary_key=True)
+
+    # bumped on every flush that inserts, updates or deletes a row of the table
+    version = Column(BigInteger, nullable=False, default=0)
+
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now()
+    )
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
+from ..db.database import Base
+
+
+class WebhookEvent(Base):
+    __tablename__ = "webhook_event"
+    __table_args__ = (
+        # idempotency key: Bland re-delivers the same (call, status) pair on retries
+        UniqueConstraint("call_id", "status", name="uq_webhook_event_call_status"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    call_id = Column(String(100), nullable=False)
+    status = Column(String(30), nullable=False)
+    payload = Column(Text, nullable=False)
+
+    # pending -> processing -> processed / failed
+    state = Column(String(20), nullable=False, default="pending", index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    result = Column(Text, nullable=True)
+    error = Column(Text, nullable=True)
+
+    locked_at = Column(DateTime(timezone=True), nullable=True)
+    processed_at = Column(DateTime(timezone=True), nullable=True)
+    received_at = Column(DateTime(timezone=True), server_default=func.now())
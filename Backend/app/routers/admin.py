@@ -1,11 +1,17 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from ..core.admin_stats import overview_counters
 from ..core.auth import require_admin
+from ..core.llm_cache import llm_cache
+from ..core.pagination import encode_cursor, decode_id_cursor
+from ..core.user_directory import directory_filters, stream_user_directory
 from ..db.database import get_db
-from ..models.application import CandidateApplication
+from ..db import instrumentation
 from ..models.job import JobListing
+from ..models.stats import RecruiterStats
 from ..models.user import User
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
@@ -16,23 +22,9 @@ def get_admin_overview(
     db: Session = Depends(get_db),
     _: User = Depends(require_admin)
 ):
-    total_users = db.query(func.count(User.id)).scalar() or 0
-    total_jobs = db.query(func.count(JobListing.id)).scalar() or 0
-    total_applications = db.query(func.count(CandidateApplication.id)).scalar() or 0
-
-    role_counts = (
-        db.query(User.role, func.count(User.id))
-        .group_by(User.role)
-        .all()
-    )
-    user_by_role = {role: count for role, count in role_counts}
-
-    status_counts = (
-        db.query(CandidateApplication.status, func.count(CandidateApplication.id))
-        .group_by(CandidateApplication.status)
-        .all()
-    )
-    applications_by_status = {status: count for status, count in status_counts}
+    # Two reads whatever the table sizes: the rollup counters and the
+    # newest jobs. User / recruiter lists are paginated below.
+    overview = overview_counters(db)
 
     recent_jobs = (
         db.query(JobListing)
@@ -41,40 +33,8 @@ def get_admin_overview(
         .all()
     )
 
-    users = (
-        db.query(User)
-        .order_by(User.created_at.desc())
-        .all()
-    )
-
-    recruiters = (
-        db.query(User)
-        .filter(User.role == "recruiter")
-        .order_by(User.created_at.desc())
-        .all()
-    )
-
-    recruiter_job_counts = dict(
-        db.query(JobListing.recruiter_id, func.count(JobListing.id))
-        .group_by(JobListing.recruiter_id)
-        .all()
-    )
-
-    recruiter_application_counts = dict(
-        db.query(JobListing.recruiter_id, func.count(CandidateApplication.id))
-        .join(CandidateApplication, CandidateApplication.job_id == JobListing.id)
-        .group_by(JobListing.recruiter_id)
-        .all()
-    )
-
     return {
-        "totals": {
-            "users": total_users,
-            "jobs": total_jobs,
-            "applications": total_applications,
-        },
-        "users_by_role": user_by_role,
-        "applications_by_status": applications_by_status,
+        **overview,
         "recent_jobs": [
             {
                 "id": job.id,
@@ -86,27 +46,80 @@ def get_admin_overview(
             }
             for job in recent_jobs
         ],
-        "users": [
-            {
-                "id": user.id,
-                "name": user.name,
-                "email": user.email,
-                "phone": user.phone,
-                "role": user.role,
-                "created_at": user.created_at,
-            }
-            for user in users
-        ],
-        "recruiters": [
-            {
-                "id": recruiter.id,
-                "name": recruiter.name,
-                "email": recruiter.email,
-                "phone": recruiter.phone,
-                "created_at": recruiter.created_at,
-                "jobs_posted": recruiter_job_counts.get(recruiter.id, 0),
-                "applications_received": recruiter_application_counts.get(recruiter.id, 0),
-            }
-            for recruiter in recruiters
-        ],
     }
+
+
+@router.get("/users")
+def list_users(
+    role: str | None = None,
+    q: str | None = Query(None, max_length=100, description="search name / email"),
+    match: str = Query("prefix", pattern="^(prefix|contains)$"),
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=200),
+    _: User = Depends(require_admin)
+):
+    # same directory as GET /users/, with the admin page's page size cap
+    after_id = decode_id_cursor(cursor) if cursor else None
+
+    return StreamingResponse(
+        stream_user_directory(directory_filters(role, q, match), after_id, limit),
+        media_type="application/json"
+    )
+
+
+@router.get("/recruiters")
+def list_recruiters(
+    response: Response,
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    _: User = Depends(require_admin)
+):
+    query = (
+        db.query(
+            User,
+            func.coalesce(RecruiterStats.jobs_posted, 0).label("jobs_posted"),
+            func.coalesce(RecruiterStats.applications_received, 0).label("applications_received")
+        )
+        .outerjoin(RecruiterStats, RecruiterStats.recruiter_id == User.id)
+        .filter(User.role == "recruiter")
+    )
+
+    if cursor:
+        after_id = decode_id_cursor(cursor)
+        query = query.filter(User.id < after_id)
+
+    rows = query.order_by(User.id.desc()).limit(limit + 1).all()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor([rows[-1].User.id])
+
+    return [
+        {
+            "id": recruiter.id,
+            "name": recruiter.name,
+            "email": recruiter.email,
+            "phone": recruiter.phone,
+            "created_at": recruiter.created_at,
+            "jobs_posted": jobs_posted,
+            "applications_received": applications_received,
+        }
+        for recruiter, jobs_posted, applications_received in rows
+    ]
+
+
+@router.get("/llm-cache")
+def get_llm_cache_stats(
+    _: User = Depends(require_admin)
+):
+    # Counters are per API process.
+    return llm_cache.stats()
+
+
+@router.get("/db-metrics")
+def get_db_metrics(
+    _: User = Depends(require_admin)
+):
+    # Counters are per API process.
+    return instrumentation.metrics()
@@ -1,46 +1,59 @@
-from datetime import datetime, timedelta
 import os
-import shutil
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Request
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, Query
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
-from app.core.scheduler import scheduler
-from ..db.database import get_db
+from ..db.database import get_async_db
 from ..models.application import CandidateApplication
 from ..models.interview import Interview
 from ..models.job import JobListing
+from ..models.resume_job import ResumeJob
+from ..models.user import User
 from ..schemas.application import (
     ApplicationCreate,
     ApplicationResponse,
+    ResumeJobResponse,
     UpdateApplicationStatus
 )
 
-from ..core.auth import get_current_user
-from ..core.resume_parser import extract_text_from_pdf
-from ..core.resume_scoring import calculate_resume_score
-from ..core.ai_resume_scoring import analyze_resume_with_ai
-from ..core.bland_ai import start_bland_interview
-
-from ..core.ai_interview_evaluator import evaluate_interview
+from ..core.auth import get_current_user, get_token_claims, TokenClaims
+from ..core.resume_pipeline import enqueue_resume_job
+from ..core.resume_store import resume_store
+from ..core.pdf_upload import PDF_UPLOAD_OPENAPI, stage_pdf_upload
+from ..core.interview_pipeline import store_webhook_event
+from ..core.leaderboard import update_performance_score, top_candidates, candidate_rank
+from ..core.pagination import encode_cursor, decode_cursor, is_number
 
 router = APIRouter(prefix="/applications", tags=["Applications"])
 BLAND_WEBHOOK_SECRET = os.getenv("BLAND_WEBHOOK_SECRET")
 
 
+async def _get_application(db: AsyncSession, application_id: int, *filters):
+    """Application with its job eagerly loaded (no lazy loads under AsyncSession)."""
+    return await db.scalar(
+        select(CandidateApplication)
+        .options(joinedload(CandidateApplication.job))
+        .where(CandidateApplication.id == application_id, *filters)
+        .execution_options(populate_existing=True)
+    )
+
+
 # ============================================================
 # CANDIDATE APPLIES TO JOB
 # ============================================================
 @router.post("/", response_model=ApplicationResponse)
-def apply_job(
+async def apply_job(
     data: ApplicationCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_current_user)
 ):
     if (current_user.role or "").lower() != "candidate":
         raise HTTPException(403, "Only candidates can apply")
 
-    job = db.query(JobListing).filter(JobListing.id == data.job_id).first()
+    job = await db.get(JobListing, data.job_id)
     if not job:
         raise HTTPException(404, "Job not found")
     if job.status != "open":
@@ -55,113 +68,225 @@ def apply_job(
     )
 
     db.add(application)
-    db.commit()
-    db.refresh(application)
-    return application
+    try:
+        await db.commit()
+    except IntegrityError:
+        # uq_candidate_application_user_job
+        await db.rollback()
+        raise HTTPException(400, "You have already applied to this job")
+
+    return await _get_application(db, application.id)
 
 
 # ============================================================
 # CANDIDATE - VIEW OWN APPLICATIONS
 # ============================================================
 @router.get("/my", response_model=list[ApplicationResponse])
-def my_applications(
-    db: Session = Depends(get_db),
-    current_user=Depends(get_current_user)
+async def my_applications(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TokenClaims = Depends(get_token_claims)
 ):
-    return (
-        db.query(CandidateApplication)
-        .filter(CandidateApplication.user_id == current_user.id)
+    return (await db.scalars(
+        select(CandidateApplication)
+        .options(joinedload(CandidateApplication.job))
+        .where(CandidateApplication.user_id == current_user.id)
         .order_by(CandidateApplication.created_at.desc())
-        .all()
-    )
+    )).all()
 
 
 # ============================================================
 # RECRUITER - VIEW ALL APPLICATIONS FOR A JOB
 # ============================================================
+# Sort keys for the ranking; nulls are coalesced so keyset comparisons stay total.
+RANKING_SORTS = {
+    "rank": [
+        CandidateApplication.status,
+        func.coalesce(CandidateApplication.voice_score, -1),
+        func.coalesce(CandidateApplication.resume_score, -1)
+    ],
+    "performance": [func.coalesce(CandidateApplication.performance_score, -1)],
+    "resume_score": [func.coalesce(CandidateApplication.resume_score, -1)],
+    "voice_score": [func.coalesce(CandidateApplication.voice_score, -1)],
+    # ids are assigned in created_at order, and the PK makes a cheaper keyset
+    "applied_at": []
+}
+
+
+async def _own_job_id(db: AsyncSession, job_id: int, recruiter_id: int):
+    return await db.scalar(
+        select(JobListing.id).where(
+            JobListing.id == job_id,
+            JobListing.recruiter_id == recruiter_id
+        )
+    )
+
+
 @router.get("/job/{job_id}")
-def job_applications(
+async def job_applications(
     job_id: int,
-    db: Session = Depends(get_db),
+    response: Response,
+    sort: str = Query("rank", description="rank | performance | resume_score | voice_score | applied_at"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    status: str | None = Query(None, description="comma-separated statuses"),
+    min_score: float | None = Query(None, description="minimum performance score"),
+    cursor: str | None = None,
+    limit: int = Query(100, ge=1, le=500),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_current_user)
 ):
     if (current_user.role or "").lower() != "recruiter":
         raise HTTPException(403, "Not allowed")
 
-    job = (
-        db.query(JobListing)
-        .filter(
-            JobListing.id == job_id,
-            JobListing.recruiter_id == current_user.id
-        )
-        .first()
-    )
+    if sort not in RANKING_SORTS:
+        raise HTTPException(400, "Invalid sort")
 
-    if not job:
+    if not await _own_job_id(db, job_id, current_user.id):
         raise HTTPException(404, "Job not found")
 
-    applications = (
-        db.query(CandidateApplication)
-        .filter(CandidateApplication.job_id == job_id)
-        .order_by(
-            CandidateApplication.status.desc(),
-            CandidateApplication.voice_score.desc().nullslast(),
-            CandidateApplication.resume_score.desc()
+    sort_keys = RANKING_SORTS[sort] + [CandidateApplication.id]
+    descending = order == "desc"
+
+    # One projected query: application columns + candidate name, no ORM rows.
+    query = (
+        select(
+            CandidateApplication.id,
+            CandidateApplication.user_id,
+            User.name.label("candidate_name"),
+            CandidateApplication.resume_score,
+            CandidateApplication.voice_score,
+            CandidateApplication.performance_score,
+            CandidateApplication.communication_score,
+            CandidateApplication.technical_score,
+            CandidateApplication.confidence_score,
+            CandidateApplication.interview_feedback,
+            CandidateApplication.status,
+            CandidateApplication.created_at,
+            *[key.label(f"sort_{i}") for i, key in enumerate(sort_keys[:-1])]
         )
-        .all()
+        .join(User, User.id == CandidateApplication.user_id)
+        .where(CandidateApplication.job_id == job_id)
     )
 
-    result = []
+    if status:
+        query = query.where(CandidateApplication.status.in_(status.split(",")))
+
+    if min_score is not None:
+        query = query.where(CandidateApplication.performance_score >= min_score)
+
+    if cursor:
+        values = decode_cursor(cursor, len(sort_keys))
+        # the status sort key is text, every other key a number
+        if not all(
+            isinstance(value, str) if key is CandidateApplication.status else is_number(value)
+            for key, value in zip(sort_keys, values)
+        ):
+            raise HTTPException(400, "Invalid cursor")
+
+        keys = tuple_(*sort_keys)
+        after = tuple_(*values)
+        query = query.where(keys < after if descending else keys > after)
+
+    rows = (await db.execute(
+        query
+        .order_by(*[key.desc() if descending else key.asc() for key in sort_keys])
+        .limit(limit + 1)
+    )).all()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(
+            [getattr(last, f"sort_{i}") for i in range(len(sort_keys) - 1)] + [last.id]
+        )
 
-    for app in applications:
-        score_parts = [
-            app.resume_score,
-            app.voice_score,
-            app.communication_score,
-            app.technical_score,
-            app.confidence_score
-        ]
+    return [
+        {
+            "application_id": row.id,
+            "user_id": row.user_id,
+            "candidate_name": row.candidate_name,
+            "resume_score": row.resume_score,
+            "voice_score": row.voice_score,
+            "performance_score": row.performance_score,
+            "communication_score": row.communication_score,
+            "technical_score": row.technical_score,
+            "confidence_score": row.confidence_score,
+            "interview_feedback": row.interview_feedback,
+            "status": row.status,
+            "applied_at": row.created_at
+        }
+        for row in rows
+    ]
 
-        valid_scores = [s for s in score_parts if s is not None]
 
-        performance_score = (
-            round(sum(valid_scores) / len(valid_scores), 2)
-            if valid_scores else None
-        )
+# ============================================================
+# RECRUITER - JOB LEADERBOARD (top N by stored performance score)
+# ============================================================
+@router.get("/job/{job_id}/leaderboard")
+async def job_leaderboard(
+    job_id: int,
+    limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(get_current_user)
+):
+    if (current_user.role or "").lower() != "recruiter":
+        raise HTTPException(403, "Not allowed")
 
-        result.append({
-            "application_id": app.id,
-            "user_id": app.user_id,
-            "candidate_name": app.user.name,
-            "resume_score": app.resume_score,
-            "voice_score": app.voice_score,
-            "performance_score": performance_score,
-            "communication_score": app.communication_score,
-            "technical_score": app.technical_score,
-            "confidence_score": app.confidence_score,
-            "interview_feedback": app.interview_feedback,
-            "status": app.status,
-            "applied_at": app.created_at
-        })
+    if not await _own_job_id(db, job_id, current_user.id):
+        raise HTTPException(404, "Job not found")
 
-    return result
+    rows = await db.run_sync(top_candidates, job_id, limit)
+
+    return [
+        {
+            "rank": index + 1,
+            "application_id": row.id,
+            "user_id": row.user_id,
+            "candidate_name": row.candidate_name,
+            "performance_score": row.performance_score,
+            "status": row.status
+        }
+        for index, row in enumerate(rows)
+    ]
+
+
+# ============================================================
+# RANK + PERCENTILE OF ONE APPLICATION
+# ============================================================
+@router.get("/{application_id}/rank")
+async def application_rank(
+    application_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(get_current_user)
+):
+    application = await _get_application(db, application_id)
+
+    if not application:
+        raise HTTPException(404, "Application not found")
+
+    if application.user_id != current_user.id and application.job.recruiter_id != current_user.id:
+        raise HTTPException(403, "Not allowed")
+
+    return {
+        "application_id": application.id,
+        "job_id": application.job_id,
+        "performance_score": application.performance_score,
+        **(await db.run_sync(candidate_rank, application))
+    }
 
 
 # ============================================================
 # GET INTERVIEW TRANSCRIPT
 # ============================================================
 @router.get("/{application_id}/transcript")
-def get_application_transcript(
+async def get_application_transcript(
     application_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_current_user)
 ):
     if (current_user.role or "").lower() != "recruiter":
         raise HTTPException(403, "Not allowed")
 
-    application = db.query(CandidateApplication).filter(
-        CandidateApplication.id == application_id
-    ).first()
+    application = await _get_application(db, application_id)
 
     if not application:
         raise HTTPException(404, "Application not found")
@@ -169,9 +294,11 @@ def get_application_transcript(
     if application.job.recruiter_id != current_user.id:
         raise HTTPException(403, "Not allowed")
 
-    interview = db.query(Interview).filter(
-        Interview.candidate_application_id == application_id
-    ).first()
+    interview = await db.scalar(
+        select(Interview).where(
+            Interview.candidate_application_id == application_id
+        )
+    )
 
     if not interview or not interview.transcript:
         return {
@@ -187,100 +314,74 @@ def get_application_transcript(
 
 
 # ============================================================
-# UPLOAD RESUME + AI SCORING
+# UPLOAD RESUME (scoring runs on the resume workers)
 # ============================================================
-@router.post("/{application_id}/upload-resume")
-def upload_resume(
+@router.post("/{application_id}/upload-resume", status_code=202, openapi_extra=PDF_UPLOAD_OPENAPI)
+async def upload_resume(
     application_id: int,
-    file: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_current_user)
 ):
-    application = (
-        db.query(CandidateApplication)
-        .filter(
-            CandidateApplication.id == application_id,
-            CandidateApplication.user_id == current_user.id
-        )
-        .first()
+    application = await _get_application(
+        db,
+        application_id,
+        CandidateApplication.user_id == current_user.id
     )
 
     if not application:
         raise HTTPException(404, "Application not found")
 
-    # ---------------- SAVE FILE ----------------
-    upload_dir = "uploads/resumes"
-    os.makedirs(upload_dir, exist_ok=True)
-    file_path = f"{upload_dir}/{application_id}.pdf"
+    # don't hold a pooled connection while the body streams in
+    await db.rollback()
 
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    # ---------------- STAGE FILE (validated + hashed while it arrives) ----------------
+    staged = await stage_pdf_upload(request, resume_store)
 
-    resume_text = extract_text_from_pdf(file_path)
-    job = application.job
+    # ---------------- ENQUEUE PROCESSING ----------------
+    job = await db.run_sync(enqueue_resume_job, application, staged)
 
-    # ---------------- TF-IDF SCORING ----------------
-    tfidf_score = calculate_resume_score(resume_text, job.description or "")
-
-    # ---------------- CONDITIONAL GEMINI ----------------
-    if tfidf_score < 35:
-        resume_final_score = tfidf_score
-        ai_result = {
-            "score": tfidf_score,
-            "missing_skills": [],
-            "reason": "Low keyword similarity"
-        }
-    else:
-        ai_result = analyze_resume_with_ai(
-            resume_text=resume_text,
-            job_description=job.description or ""
-        )
-
-        ai_score = ai_result.get("score", tfidf_score)
+    return {
+        "message": "Resume uploaded, processing started",
+        "job_id": job.id,
+        "status": job.status
+    }
 
-        if tfidf_score < 60:
-            resume_final_score = int((0.7 * tfidf_score) + (0.3 * ai_score))
-        else:
-            resume_final_score = int((0.4 * tfidf_score) + (0.6 * ai_score))
 
-    # ---------------- SAVE RESUME DATA ----------------
-    application.resume_score = resume_final_score
-    application.ai_reason = ai_result.get("reason")
-    application.missing_skills = ", ".join(
-        ai_result.get("missing_skills", [])
+# ============================================================
+# RESUME PROCESSING STATUS (polled by the frontend)
+# ============================================================
+@router.get("/resume-jobs/{job_id}", response_model=ResumeJobResponse)
+async def resume_job_status(
+    job_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(get_current_user)
+):
+    job = await db.scalar(
+        select(ResumeJob)
+        .options(joinedload(ResumeJob.application).joinedload(CandidateApplication.job))
+        .where(ResumeJob.id == job_id)
     )
-    application.retry_count = 0
-    application.voice_score = None
-
-    # ---------------- SHORTLIST LOGIC ----------------
-    if job.resume_min_score and resume_final_score < job.resume_min_score:
-        application.status = "rejected"
-    else:
-        application.status = "interview_scheduled"
-        candidate = application.user
-
-        run_time = datetime.now() + timedelta(minutes=2)
-
-        scheduler.add_job(
-            start_bland_interview,
-            "date",
-            run_date=run_time,
-            args=[
-                candidate.phone,
-                candidate.name,
-                job.title,
-                application.id
-            ]
-        )
 
-        print(f"📅 Interview scheduled at {run_time}")
+    if not job:
+        raise HTTPException(404, "Resume job not found")
+
+    application = job.application
 
-    db.commit()
+    if application.user_id != current_user.id and application.job.recruiter_id != current_user.id:
+        raise HTTPException(403, "Not allowed")
 
     return {
-        "message": "Resume uploaded and analyzed",
-        "resume_score": resume_final_score,
-        "status": application.status
+        "job_id": job.id,
+        "application_id": application.id,
+        "status": job.status,
+        "attempts": job.attempts,
+        "error": job.error if job.status == "failed" else None,
+        "resume_score": job.resume_score,
+        "application_status": job.application_status,
+        "min_required_score": application.job.resume_min_score,
+        "created_at": job.created_at,
+        "finished_at": job.finished_at
     }
 
 
@@ -288,18 +389,16 @@ def upload_resume(
 # RECRUITER MANUAL STATUS UPDATE
 # ============================================================
 @router.patch("/{application_id}/status")
-def update_application_status(
+async def update_application_status(
     application_id: int,
     data: UpdateApplicationStatus,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_current_user)
 ):
     if (current_user.role or "").lower() != "recruiter":
         raise HTTPException(403, "Not allowed")
 
-    application = db.query(CandidateApplication).filter(
-        CandidateApplication.id == application_id
-    ).first()
+    application = await _get_application(db, application_id)
 
     if not application:
         raise HTTPException(404, "Application not found")
@@ -313,18 +412,19 @@ def update_application_status(
         raise HTTPException(400, "Invalid status")
 
     application.status = data.status
-    db.commit()
+    update_performance_score(application)
+    await db.commit()
 
     return {"message": "Status updated", "status": application.status}
 
 
 # ============================================================
-# BLAND AI WEBHOOK
+# BLAND AI WEBHOOK (ack fast, processed by the webhook workers)
 # ============================================================
 @router.post("/bland-webhook")
 async def bland_webhook(
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
 
     # ---------- SECURITY ----------
@@ -337,120 +437,12 @@ async def bland_webhook(
     except Exception:
         return {"message": "Invalid JSON payload"}
 
-    status = (data.get("status") or "").lower()
-    metadata = data.get("metadata", {})
-    application_id = metadata.get("application_id")
-
-    if not application_id:
-        return {"message": "Missing application_id"}
-
-    application = db.query(CandidateApplication).filter(
-        CandidateApplication.id == application_id
-    ).first()
-
-    if not application:
-        return {"message": "Application not found"}
-
-    # ============================================================
-    # FAILED CALL HANDLING
-    # ============================================================
-    if status in ["no_answer", "busy", "failed"]:
-        application.status = status
-
-        if application.retry_count < 1:
-            application.retry_count += 1
-            db.commit()
-
-            retry_time = datetime.now() + timedelta(minutes=2)
-
-            scheduler.add_job(
-                start_bland_interview,
-                "date",
-                run_date=retry_time,
-                args=[
-                    application.user.phone,
-                    application.user.name,
-                    application.job.title,
-                    application.id
-                ]
-            )
-
-            return {"message": "Retry scheduled"}
-
-        else:
-            db.commit()
-            return {"message": f"Call ended with status: {status}", "status": application.status}
-
-    # ============================================================
-    # CALL STARTED
-    # ============================================================
-    if status in ["answered", "in_progress"]:
-        application.status = "interview_in_progress"
-        db.commit()
-        return {"message": "Interview started"}
-
-    if status != "completed":
-        return {"message": "Ignoring non-completed event"}
-
-    transcript = data.get("concatenated_transcript")
-    if not transcript:
-        return {"message": "Missing transcript"}
-
-    # ============================================================
-    # SAVE INTERVIEW
-    # ============================================================
-    interview = db.query(Interview).filter(
-        Interview.candidate_application_id == application.id
-    ).first()
-
-    if not interview:
-        interview = Interview(
-            candidate_application_id=application.id
-        )
-        db.add(interview)
-
-    interview.transcript = transcript
-    interview.duration = int(data.get("corrected_duration", 0))
-    interview.started_at = data.get("started_at")
-    interview.ended_at = data.get("ended_at")
-
-    # ============================================================
-    # VOICE SCORING (Gemini AI)
-    # ============================================================
-    # ============================================================
-    # AI INTERVIEW ANALYSIS (Gemini AI)
-    # ============================================================
-    evaluation = evaluate_interview(
-    transcript=transcript,
-    job_description=application.job.description
-    )
-
-    application.voice_score = evaluation["voice_score"]
-    application.communication_score = evaluation["communication_score"]
-    application.technical_score = evaluation["technical_score"]
-    application.confidence_score = evaluation["confidence_score"]
-    application.interview_feedback = evaluation["feedback"]
-
-    interview.strengths = evaluation["strengths"]
-    interview.weaknesses = evaluation["weaknesses"]
-    interview.recommendation = evaluation["recommendation"]
-    application.retry_count = 0
-
-
-    
-    
-
-
-    # ============================================================
-    # FINAL DECISION (Your Existing Logic)
-    # ============================================================
-    job = application.job
+    if not isinstance(data, dict):
+        return {"message": "Invalid JSON payload"}
 
-    if job.interview_min_score and application.voice_score >= job.interview_min_score:
-        application.status = "shortlisted"
-    else:
-        application.status = "rejected"
+    stored = await db.run_sync(store_webhook_event, data)
 
-    db.commit()
+    if not stored:
+        return {"message": "Duplicate event ignored"}
 
-    return {"message": "Interview processed successfully"}
\ No newline at end of file
+    return {"message": "Event received"}
@@ -1,33 +1,43 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..db.database import get_db
+from ..db.database import get_async_db
 from ..models.user import User
 from ..schemas.user import LoginRequest, TokenResponse
-from ..core.security import verify_password
+from ..core.security import password_hasher
 from ..core.auth import create_access_token
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(
+async def login(
     data: LoginRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = db.query(User).filter(
-        User.email == data.email
-    ).first()
-
-    if not user or not verify_password(
-        data.password,
-        user.password
-    ):
+    user = await db.scalar(
+        select(User).where(User.email == data.email)
+    )
+
+    valid, new_hash = False, None
+    if user:
+        valid, new_hash = await password_hasher.verify_and_update(
+            data.password,
+            user.password
+        )
+
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
         )
 
+    # Hash was made with an older BCRYPT_ROUNDS; upgrade it transparently.
+    if new_hash:
+        user.password = new_hash
+        await db.commit()
+
     # ✅ Candidate validation for AI interview
     if user.role == "candidate":
         if not user.name or not user.phone:
@@ -0,0 +1,67 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..db.database import get_async_db
+from ..models.application import CandidateApplication
+from ..models.resume_job import ResumeJob
+from ..models.resume_artifact import ResumeArtifact
+from ..schemas.candidate import JobMatch
+from ..core.auth import require_candidate
+from ..core.job_matrix import match_jobs
+from ..core.resume_parser import resume_parser, ResumeParseError
+from ..core.pdf_upload import PDF_UPLOAD_OPENAPI, read_pdf_upload
+from ..core.resume_artifacts import artifact_terms
+from ..core.resume_scoring import term_counts
+
+router = APIRouter(prefix="/candidates", tags=["Candidates"])
+
+
+def _resume_terms(data: bytes):
+    # parsed and tokenized once, then scored against every open job
+    return term_counts(resume_parser.extract(data))
+
+
+# ✅ Best Open Jobs For My Latest Resume
+@router.get("/me/matches", response_model=list[JobMatch])
+async def my_matches(
+    k: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(require_candidate)
+):
+    # terms stored when the resume was processed; nothing is re-parsed
+    artifact = await db.scalar(
+        select(ResumeArtifact)
+        .join(CandidateApplication, CandidateApplication.resume_hash == ResumeArtifact.content_hash)
+        .join(ResumeJob, ResumeJob.application_id == CandidateApplication.id)
+        .where(
+            CandidateApplication.user_id == current_user.id,
+            ResumeJob.status == "completed"
+        )
+        .order_by(ResumeJob.id.desc())
+        .limit(1)
+    )
+
+    if not artifact:
+        raise HTTPException(404, "No processed resume yet")
+
+    return await db.run_sync(match_jobs, artifact_terms(artifact), k)
+
+
+# ✅ Best Open Jobs For An Uploaded Resume (nothing is stored)
+@router.post("/me/matches", response_model=list[JobMatch], openapi_extra=PDF_UPLOAD_OPENAPI)
+async def match_uploaded_resume(
+    request: Request,
+    k: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(require_candidate)
+):
+    data = await read_pdf_upload(request)
+
+    try:
+        resume_terms = await run_in_threadpool(_resume_terms, data)
+    except ResumeParseError as e:
+        raise HTTPException(400, str(e))
+
+    return await db.run_sync(match_jobs, resume_terms, k)
@@ -1,20 +1,47 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from ..db.database import get_db
+from ..db.database import get_async_db
 from ..models.job import JobListing
 from ..models.user import User
-from ..schemas.job import JobCreate, JobResponse
-from ..core.auth import require_recruiter, get_current_user
+from ..models.rescore_run import RescoreRun
+from ..schemas.job import (
+    JobCreate, JobResponse, JobSearchPage, JobSearchResult, JobUpdate, JobUpdateResponse, RescoreRunResponse
+)
+from ..schemas.candidate import SourcedCandidate
+from ..core.auth import require_recruiter, require_recruiter_claims, get_current_user, TokenClaims
+from ..core.job_vectors import refresh_job_terms, description_hash, get_job_terms
+from ..core.idf_model import add_document, replace_document
+from ..core.job_search import search_jobs as run_job_search
+from ..core.pagination import encode_cursor, decode_cursor, is_number
+from ..core.candidate_vectors import source_candidates
+from ..core.rescoring import enqueue_rescore, rescore_throughput
+from ..core.http_cache import (
+    job_list_cache, read_table_version, is_not_modified, not_modified, json_response,
+    job_etag, job_list_etag
+)
 
 router = APIRouter(prefix="/jobs", tags=["Jobs"])
 
+_job_list = TypeAdapter(list[JobResponse])
+
+
+def _index_description(db: Session, job: JobListing):
+    # Tokenize the description once; resume scoring reuses these terms.
+    entry = refresh_job_terms(db, job)
+    add_document(db, entry["terms"])
+
 
 # ✅ Recruiter Creates Job
 @router.post("/", response_model=JobResponse)
-def create_job(
+async def create_job(
     job_data: JobCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_recruiter)
 ):
     job = JobListing(
@@ -23,55 +50,237 @@ def create_job(
     )
 
     db.add(job)
-    db.commit()
-    db.refresh(job)
+    await db.flush()
+
+    await db.run_sync(_index_description, job)
+
+    await db.commit()
+    await db.refresh(job)
 
     return job
 
 
 # ✅ List All Jobs (Public)
 @router.get("/", response_model=list[JobResponse])
-def list_jobs(db: Session = Depends(get_db)):
-    return db.query(JobListing).all()
+async def list_jobs(request: Request, db: AsyncSession = Depends(get_async_db)):
+    entry = job_list_cache.fresh("all")
+
+    if entry is None:
+        version, updated_at = await db.run_sync(read_table_version, JobListing.__tablename__)
+        entry = job_list_cache.revalidate("all", version)
+
+        if entry is None:
+            etag = job_list_etag(version)
+            if is_not_modified(request, etag, updated_at):
+                return not_modified(etag, updated_at)
+
+            jobs = (await db.scalars(select(JobListing).order_by(JobListing.id))).all()
+            body = _job_list.dump_json(_job_list.validate_python(jobs, from_attributes=True))
+            entry = job_list_cache.put("all", version, body, etag, updated_at)
+
+    if is_not_modified(request, entry.etag, entry.last_modified):
+        return not_modified(entry.etag, entry.last_modified)
+
+    return json_response(entry.body, entry.etag, entry.last_modified)
 
 # ✅ Recruiter’s Own Jobs
 @router.get("/my", response_model=list[JobResponse])
-def get_my_jobs(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_recruiter)
+async def get_my_jobs(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TokenClaims = Depends(require_recruiter_claims)
 ):
-    return db.query(JobListing).filter(
-        JobListing.recruiter_id == current_user.id
-    ).all()
+    return (await db.scalars(
+        select(JobListing).where(JobListing.recruiter_id == current_user.id)
+    )).all()
+
+
+# ✅ Search Jobs (Public)
+@router.get("/search", response_model=JobSearchPage)
+async def search_jobs(
+    q: str | None = Query(None, max_length=200),
+    location: str | None = Query(None, max_length=100),
+    mode: str | None = Query(None, max_length=20),
+    experience: int | None = Query(None, ge=0, description="Years of experience; hides jobs that need more"),
+    status: Literal["open", "closed"] | None = None,
+    cursor: str | None = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db)
+):
+    ranked = bool(q and q.strip())
+    after = decode_cursor(cursor, 2 if ranked else 1) if cursor else None
+    if after and not all(is_number(value) for value in after):
+        raise HTTPException(400, "Invalid cursor")
+
+    rows, has_more = await db.run_sync(
+        run_job_search, q, location, mode, experience, status, after, limit
+    )
+
+    next_cursor = None
+    if has_more:
+        job, score = rows[-1]
+        next_cursor = encode_cursor([score, job.id] if ranked else [job.id])
+
+    return {
+        "items": [
+            JobSearchResult.model_validate(job).model_copy(update={"score": score})
+            for job, score in rows
+        ],
+        "next_cursor": next_cursor
+    }
 
 
 # ✅ Job Details
 @router.get("/{job_id}", response_model=JobResponse)
-def get_job(job_id: int, db: Session = Depends(get_db)):
-    job = db.query(JobListing).filter(
-        JobListing.id == job_id
-    ).first()
+async def get_job(job_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    job = await db.get(JobListing, job_id)
+
+    if not job:
+        raise HTTPException(404, "Job not found")
+
+    etag = job_etag(job)
+    last_modified = job.updated_at or job.created_at
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified)
+
+    return json_response(
+        JobResponse.model_validate(job).model_dump_json().encode(), etag, last_modified
+    )
+
+# ✅ Best Stored Candidates For A Job (Owning Recruiter)
+@router.get("/{job_id}/candidates", response_model=list[SourcedCandidate])
+async def get_job_candidates(
+    job_id: int,
+    limit: int = Query(20, ge=1, le=200),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_recruiter)
+):
+    job = await db.scalar(
+        select(JobListing).where(
+            JobListing.id == job_id,
+            JobListing.recruiter_id == current_user.id
+        )
+    )
+
+    if not job:
+        raise HTTPException(404, "Job not found")
+
+    return await db.run_sync(source_candidates, job, limit)
+
+
+async def _owned_job(db: AsyncSession, job_id: int, recruiter_id: int):
+    job = await db.scalar(
+        select(JobListing).where(
+            JobListing.id == job_id,
+            JobListing.recruiter_id == recruiter_id
+        )
+    )
 
     if not job:
         raise HTTPException(404, "Job not found")
 
     return job
 
+
+def _rescore_run_response(run: RescoreRun):
+    elapsed, rate = rescore_throughput(run)
+    return RescoreRunResponse.model_validate(run).model_copy(
+        update={"elapsed_seconds": elapsed, "applications_per_second": rate}
+    )
+
+
+def _save_job_update(db: Session, job: JobListing, changes: dict):
+    old_description = description_hash(job.description)
+    old_terms = get_job_terms(db, job)
+    old_thresholds = (job.resume_min_score, job.interview_min_score)
+
+    for field, value in changes.items():
+        setattr(job, field, value)
+
+    if description_hash(job.description) != old_description:
+        # still one corpus document, now counted under its new terms
+        entry = refresh_job_terms(db, job)
+        replace_document(db, old_terms, entry["terms"])
+        reason = "description"
+    elif (job.resume_min_score, job.interview_min_score) != old_thresholds:
+        reason = "threshold"
+    else:
+        db.commit()
+        return None
+
+    # commits the edit together with the queued run
+    return enqueue_rescore(db, job, reason)
+
+
+# ✅ Recruiter Edits Job (rescores its applications when scoring inputs change)
+@router.patch("/{job_id}", response_model=JobUpdateResponse)
+async def update_job(
+    job_id: int,
+    job_data: JobUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_recruiter)
+):
+    job = await _owned_job(db, job_id, current_user.id)
+
+    changes = job_data.model_dump(exclude_unset=True)
+    if "title" in changes and not changes["title"]:
+        raise HTTPException(400, "Title is required")
+
+    run = await db.run_sync(_save_job_update, job, changes)
+    await db.refresh(job)
+
+    return JobUpdateResponse.model_validate(job).model_copy(
+        update={"rescore_run_id": run.id if run else None}
+    )
+
+
+# ✅ Rescore Every Application To A Job
+@router.post("/{job_id}/rescore", response_model=RescoreRunResponse, status_code=202)
+async def rescore_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_recruiter)
+):
+    job = await _owned_job(db, job_id, current_user.id)
+
+    run = await db.run_sync(enqueue_rescore, job)
+
+    return _rescore_run_response(run)
+
+
+# ✅ Rescore Progress
+@router.get("/{job_id}/rescore/{run_id}", response_model=RescoreRunResponse)
+async def rescore_status(
+    job_id: int,
+    run_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_recruiter)
+):
+    await _owned_job(db, job_id, current_user.id)
+
+    run = await db.get(RescoreRun, run_id)
+    if not run or run.job_id != job_id:
+        raise HTTPException(404, "Rescore run not found")
+
+    return _rescore_run_response(run)
+
+
 @router.patch("/{job_id}/status")
-def update_job_status(
+async def update_job_status(
     job_id: int,
     status: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_current_user)
 ):
 
     if current_user.role != "recruiter":
         raise HTTPException(403, "Not allowed")
 
-    job = db.query(JobListing).filter(
-        JobListing.id == job_id,
-        JobListing.recruiter_id == current_user.id
-    ).first()
+    job = await db.scalar(
+        select(JobListing).where(
+            JobListing.id == job_id,
+            JobListing.recruiter_id == current_user.id
+        )
+    )
 
     if not job:
         raise HTTPException(404, "Job not found")
@@ -80,7 +289,7 @@ def update_job_status(
         raise HTTPException(400, "Invalid status")
 
     job.status = status
-    db.commit()
+    await db.commit()
 
     return {
         "message": f"Job status updated to {status}",
@@ -13,6 +13,7 @@ from ..schemas.profile import (
     RecruiterCandidateProfileResponse
 )
 from ..core.auth import get_current_user
+from ..core.candidate_vectors import store_skills_terms
 
 router = APIRouter(
     prefix="/profile",
@@ -44,6 +45,9 @@ def create_or_update_profile(
         )
         db.add(profile)
 
+    if current_user.role == "candidate":
+        store_skills_terms(db, current_user.id, profile.skills)
+
     db.commit()
     db.refresh(profile)
 
@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from typing import List
-from ..core.security import hash_password
+from ..core.security import password_hasher
 from ..core.auth import get_current_user, require_admin
+from ..core.pagination import decode_id_cursor
+from ..core.user_directory import directory_filters, stream_user_directory
 from ..db.database import get_db
 from ..models.user import User
 from ..schemas.user import UserCreate, UserResponse
@@ -13,10 +16,7 @@ router = APIRouter(
     tags=["Users"]
 )
 
-@router.post("/", response_model=UserResponse)
-def create_user(user: UserCreate, db: Session = Depends(get_db)):
-    role = (user.role or "").strip().lower()
-
+def _check_signup(db: Session, role: str, email: str):
     # Allow bootstrap creation of the first admin only.
     if role == "admin":
         admin_exists = db.query(User).filter(User.role == "admin").first()
@@ -32,7 +32,7 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
         )
 
     existing_user = db.query(User).filter(
-        User.email == user.email
+        User.email == email
     ).first()
 
     if existing_user:
@@ -41,21 +41,45 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
             detail="Email already registered"
         )
 
+
+def _insert_user(db: Session, user: UserCreate, role: str, password_hash: str):
     new_user = User(
         email=user.email,
-        password=hash_password(user.password),
+        password=password_hash,
         role=role,
         name=user.name,
         phone=user.phone
     )
-    db.add(new_user)
-    db.commit()
+
+    try:
+        db.add(new_user)
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
+
     db.refresh(new_user)
     return new_user
 
 
+# bcrypt runs in the password hasher's process pool; the DB work stays on
+# the threadpool, so these handlers never block the event loop.
+@router.post("/", response_model=UserResponse)
+async def create_user(user: UserCreate, db: Session = Depends(get_db)):
+    role = (user.role or "").strip().lower()
+
+    await run_in_threadpool(_check_signup, db, role, user.email)
+
+    password_hash = await password_hasher.hash(user.password)
+
+    return await run_in_threadpool(_insert_user, db, user, role, password_hash)
+
+
 @router.post("/admin/create", response_model=UserResponse)
-def create_user_as_admin(
+async def create_user_as_admin(
     user: UserCreate,
     db: Session = Depends(get_db),
     _: User = Depends(require_admin)
@@ -69,33 +93,26 @@ def create_user_as_admin(
             detail="Invalid role"
         )
 
-    new_user = User(
-        email=user.email,
-        password=hash_password(user.password),
-        role=role,
-        name=user.name,
-        phone=user.phone
-    )
+    password_hash = await password_hasher.hash(user.password)
 
-    try:
-        db.add(new_user)
-        db.commit()
-    except IntegrityError:
-        db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered"
-        )
-
-    db.refresh(new_user)
-    return new_user
+    return await run_in_threadpool(_insert_user, db, user, role, password_hash)
 
-@router.get("/", response_model=List[UserResponse])
+# ✅ User Directory (admin): filtered, cursor-paginated, streamed
+@router.get("/")
 def get_users(
-    db: Session = Depends(get_db),
+    role: str | None = None,
+    q: str | None = Query(None, max_length=100, description="search name / email"),
+    match: str = Query("prefix", pattern="^(prefix|contains)$"),
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=1000),
     _: User = Depends(require_admin)
 ):
-    return db.query(User).all()
+    after_id = decode_id_cursor(cursor) if cursor else None
+
+    return StreamingResponse(
+        stream_user_directory(directory_filters(role, q, match), after_id, limit),
+        media_type="application/json"
+    )
 
 @router.get("/me", response_model=UserResponse)
 def get_me(current_user: User = Depends(get_current_user)):
@@ -24,3 +24,16 @@ class ApplicationResponse(BaseModel):
 
 class UpdateApplicationStatus(BaseModel):
     status: str
+
+
+class ResumeJobResponse(BaseModel):
+    job_id: int
+    application_id: int
+    status: str
+    attempts: int
+    error: str | None = None
+    resume_score: int | None = None
+    application_status: str | None = None
+    min_required_score: int | None = None
+    created_at: datetime
+    finished_at: datetime | None = None
@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+
+
+class JobMatch(BaseModel):
+    job_id: int
+    title: str
+    # 0-100, same scale as the resume score on an application
+    score: int
+    # shared terms, strongest contribution first
+    matched_terms: list[str]
+
+
+class SourcedCandidate(BaseModel):
+    user_id: int
+    name: str | None
+    # 0-100 similarity of the candidate's resume + skills to the job
+    score: int
+    matched_terms: list[str]
+    # already applied to this job
+    applied: bool
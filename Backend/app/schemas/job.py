@@ -15,6 +15,20 @@ class JobCreate(BaseModel):
 
 
 
+class JobUpdate(BaseModel):
+    # only the fields sent are changed
+    title: str | None = None
+    role: str | None = None
+    description: str | None = None
+    package: str | None = None
+    location: str | None = None
+    mode: str | None = None
+    experience_required: int | None = None
+
+    resume_min_score: int | None = None
+    interview_min_score: int | None = None
+
+
 class JobResponse(BaseModel):
     id: int
     title: str
@@ -28,3 +42,43 @@ class JobResponse(BaseModel):
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class JobSearchResult(JobResponse):
+    # relevance; None when browsing without a query
+    score: float | None = None
+
+
+class JobSearchPage(BaseModel):
+    items: list[JobSearchResult]
+    next_cursor: str | None
+
+
+class JobUpdateResponse(JobResponse):
+    resume_min_score: int | None
+    interview_min_score: int | None
+    # queued when the description or a threshold changed
+    rescore_run_id: int | None = None
+
+
+class RescoreRunResponse(BaseModel):
+    id: int
+    job_id: int
+    reason: str
+    status: str
+    attempts: int
+    error: str | None = None
+
+    total: int
+    processed: int
+    parsed: int
+    scores_changed: int
+    decisions_changed: int
+    elapsed_seconds: float | None = None
+    applications_per_second: float | None = None
+
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    model_config = ConfigDict(from_attributes=True)
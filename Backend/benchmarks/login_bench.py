@@ -0,0 +1,100 @@
+"""
+Login latency under concurrent load.
+
+Fires ``--requests`` logins from ``--concurrency`` threads at a running API
+while a background thread keeps polling a cheap endpoint, and reports the
+p50/p95/p99 of both. With bcrypt in its own process pool the probe latency
+should stay flat however hard logins are pushed; shed logins show up as 503.
+
+    python benchmarks/login_bench.py --email c@x.com --password secret \\
+        --concurrency 32 --requests 400
+"""
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
+import argparse
+import statistics
+import threading
+import time
+
+import requests
+
+
+def percentile(samples, p):
+    if not samples:
+        return 0.0
+    samples = sorted(samples)
+    index = min(len(samples) - 1, int(round(p / 100 * (len(samples) - 1))))
+    return samples[index]
+
+
+def summarize(name, samples):
+    ms = [s * 1000 for s in samples]
+    print(
+        f"{name:<8} n={len(ms):<5} "
+        f"p50={percentile(ms, 50):7.1f}ms "
+        f"p95={percentile(ms, 95):7.1f}ms "
+        f"p99={percentile(ms, 99):7.1f}ms "
+        f"mean={statistics.fmean(ms) if ms else 0:7.1f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--probe", default="/jobs/", help="endpoint polled while logins run")
+    args = parser.parse_args()
+
+    local = threading.local()
+
+    def session():
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        return local.session
+
+    def login(_):
+        started = time.perf_counter()
+        response = session().post(
+            f"{args.url}/auth/login",
+            json={"email": args.email, "password": args.password},
+            timeout=60
+        )
+        return response.status_code, time.perf_counter() - started
+
+    probe_samples = []
+    done = threading.Event()
+
+    def probe():
+        with requests.Session() as s:
+            while not done.is_set():
+                started = time.perf_counter()
+                s.get(f"{args.url}{args.probe}", timeout=60)
+                probe_samples.append(time.perf_counter() - started)
+                time.sleep(0.05)
+
+    prober = threading.Thread(target=probe, daemon=True)
+    prober.start()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(login, range(args.requests)))
+    elapsed = time.perf_counter() - started
+
+    done.set()
+    prober.join()
+
+    statuses = Counter(status for status, _ in results)
+    ok = [seconds for status, seconds in results if status == 200]
+
+    print(f"{args.requests} logins, concurrency {args.concurrency}, {elapsed:.1f}s "
+          f"({args.requests / elapsed:.1f} req/s)")
+    print("status codes:", dict(statuses))
+    summarize("login", ok)
+    summarize("probe", probe_samples)
+
+
+if __name__ == "__main__":
+    main()
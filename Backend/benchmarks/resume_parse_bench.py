@@ -0,0 +1,179 @@
+"""
+Resume PDF extraction over a generated corpus.
+
+Builds a handful of synthetic resumes (a typical one-pager, a two-column
+layout, a 60-page document, a near-empty page that forces the pdfplumber
+fallback and an oversized file) and reports, per document, the p50/p95 of
+pypdfium2 alone, pdfplumber alone and the bounded engine behind the
+process pool, plus how many characters each produced. Then pushes the
+whole corpus through the pool from ``--concurrency`` threads.
+
+    cd Backend && python benchmarks/resume_parse_bench.py --repeat 20 --concurrency 4
+"""
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.core.resume_parser import (  # noqa: E402
+    RESUME_MAX_BYTES, RESUME_MAX_PAGES, RESUME_PARSE_TIMEOUT_SECONDS,
+    ResumeParseError, _extract_pdfium, _extract_pdfplumber, read_pdf, resume_parser
+)
+
+WORDS = (
+    "python fastapi postgres docker kubernetes react typescript aws terraform "
+    "led built designed shipped migrated scaled team platform services api "
+    "latency throughput customers revenue pipeline data models testing"
+).split()
+
+
+# ============================================================
+# CORPUS
+# ============================================================
+def _escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(pages, padding=0):
+    """``pages`` is a list of [(x, y, text)]; ``padding`` appends an unused stream of that many bytes."""
+    objects = {1: "<< /Type /Catalog /Pages 2 0 R >>", 3: "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"}
+    kids = []
+    number = 4
+
+    for lines in pages:
+        content = "BT /F1 10 Tf " + " ".join(
+            f"1 0 0 1 {x} {y} Tm ({_escape(text)}) Tj" for x, y, text in lines
+        ) + " ET"
+        objects[number] = (
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {number + 1} 0 R >>"
+        )
+        objects[number + 1] = f"<< /Length {len(content)} >>\nstream\n{content}\nendstream"
+        kids.append(f"{number} 0 R")
+        number += 2
+
+    if padding:
+        objects[number] = f"<< /Length {padding} >>\nstream\n{'0' * padding}\nendstream"
+
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for key in sorted(objects):
+        offsets[key] = len(out)
+        out += f"{key} 0 obj\n{objects[key]}\nendobj\n".encode("latin-1")
+
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for key in sorted(objects):
+        out += f"{offsets[key]:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+
+    return bytes(out)
+
+
+def _sentence(rng, words=12):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def _single_column(rng, lines=60):
+    return [(72, 740 - i * 11, _sentence(rng)) for i in range(lines)]
+
+
+def _two_column(rng, lines=60):
+    left = [(50, 740 - i * 11, _sentence(rng, 6)) for i in range(lines)]
+    right = [(320, 740 - i * 11, _sentence(rng, 6)) for i in range(lines)]
+    # interleaved in the content stream, as many resume builders emit them
+    return [line for pair in zip(left, right) for line in pair]
+
+
+def build_corpus(seed=7):
+    rng = random.Random(seed)
+    return {
+        "one_page": make_pdf([_single_column(rng)]),
+        "two_column": make_pdf([_two_column(rng), _two_column(rng)]),
+        "sixty_pages": make_pdf([_single_column(rng) for _ in range(60)]),
+        "sparse": make_pdf([[(72, 700, "Jane Doe"), (72, 680, "python")]]),
+        "oversized": make_pdf([_single_column(rng)], padding=RESUME_MAX_BYTES),
+    }
+
+
+# ============================================================
+# MEASUREMENT
+# ============================================================
+def percentile(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(round(p / 100 * (len(samples) - 1))))]
+
+
+def timed(func, repeat):
+    samples, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        try:
+            result = func()
+        except ResumeParseError as e:
+            result = e
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples, result
+
+
+def describe(result):
+    if isinstance(result, Exception):
+        return f"rejected: {result}"
+    if isinstance(result, tuple):
+        result = result[0]
+    return f"{len(result):>7} chars"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    corpus = build_corpus()
+    no_deadline = time.monotonic() + 3600
+
+    print(f"caps: {RESUME_MAX_PAGES} pages, {RESUME_MAX_BYTES // (1024 * 1024)} MB, {RESUME_PARSE_TIMEOUT_SECONDS:.0f}s\n")
+
+    # first call spawns the pool; keep it out of the numbers
+    resume_parser.extract(corpus["one_page"])
+
+    for name, data in corpus.items():
+        print(f"{name}  ({len(data) / 1024:.0f} KB)")
+        runs = {
+            "pdfium": lambda: _extract_pdfium(data, RESUME_MAX_PAGES, no_deadline),
+            "pdfplumber": lambda: _extract_pdfplumber(data, RESUME_MAX_PAGES, no_deadline),
+            "engine": lambda: resume_parser.extract(read_pdf(io.BytesIO(data))),
+        }
+        for label, func in runs.items():
+            if name == "oversized" and label != "engine":
+                continue
+            samples, result = timed(func, args.repeat)
+            print(
+                f"  {label:<10} p50={percentile(samples, 50):8.1f}ms "
+                f"p95={percentile(samples, 95):8.1f}ms  {describe(result)}"
+            )
+
+    documents = [data for name, data in corpus.items() if name != "oversized"] * args.repeat
+    started = time.perf_counter()
+    with ThreadPoolExecutor(args.concurrency) as executor:
+        list(executor.map(resume_parser.extract, documents))
+    elapsed = time.perf_counter() - started
+    print(
+        f"\npool: {len(documents)} documents from {args.concurrency} threads "
+        f"in {elapsed:.2f}s ({len(documents) / elapsed:.1f} docs/s, "
+        f"{resume_parser.workers} workers)"
+    )
+
+    resume_parser.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+import os
+import tempfile
+
+# The app reads its settings at import time; point it at a throwaway SQLite file.
+_db_dir = tempfile.mkdtemp(prefix="backend-tests-")
+DATABASE_PATH = os.path.join(_db_dir, "test.db")
+
+os.environ["DATABASE_URL"] = f"sqlite:///{DATABASE_PATH}"
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+os.environ.setdefault("GOOGLE_API_KEY", "test")
+os.environ.setdefault("GEMINI_API_KEY", "test")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("RESUME_STORE_DIR", os.path.join(_db_dir, "blobs"))
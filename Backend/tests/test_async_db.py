@@ -0,0 +1,240 @@
+"""
+The routers ported to ``get_async_db`` must behave the same on both of its
+backends: a native AsyncSession (DB_ASYNC=1, here sqlite+aiosqlite) and the
+ThreadedAsyncSession wrapper around the sync engine (DB_ASYNC=0).
+"""
+import anyio
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from conftest import DATABASE_PATH
+
+from app.core import auth
+from app.core.security import password_hasher
+from app.db import database
+from app.db.database import Base, ThreadedAsyncSession
+from app.main import app
+
+
+@pytest.fixture(params=["async", "threaded"])
+def client(request, monkeypatch):
+    Base.metadata.drop_all(database.engine)
+    Base.metadata.create_all(database.engine)
+    auth._verified_tokens.clear()
+    auth._principals.clear()
+
+    async_engine = None
+    if request.param == "async":
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{DATABASE_PATH}")
+        monkeypatch.setattr(
+            database,
+            "AsyncSessionLocal",
+            async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+        )
+    else:
+        monkeypatch.setattr(database, "AsyncSessionLocal", None)
+
+    sessions = []
+
+    async def recording_db():
+        async for db in database.get_async_db():
+            sessions.append(type(db))
+            yield db
+
+    app.dependency_overrides[database.get_async_db] = recording_db
+
+    # no ``with``: the lifespan (and its background workers) stays off
+    client = TestClient(app)
+    client.mode = request.param
+    client.sessions = sessions
+    yield client
+
+    app.dependency_overrides.clear()
+    if async_engine is not None:
+        anyio.run(async_engine.dispose)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _shutdown_hasher():
+    yield
+    password_hasher.shutdown()
+
+
+def signup(client, email, role):
+    response = client.post("/users/", json={
+        "name": email.split("@")[0],
+        "email": email,
+        "phone": "+10000000000",
+        "password": "secret",
+        "role": role
+    })
+    assert response.status_code == 200, response.text
+
+    response = client.post("/auth/login", json={"email": email, "password": "secret"})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_routes_use_the_configured_session(client):
+    signup(client, "r@example.com", "recruiter")
+
+    expected = ThreadedAsyncSession if client.mode == "threaded" else AsyncSession
+    assert client.sessions and all(kind is expected for kind in client.sessions)
+
+
+def test_login_rejects_a_wrong_password(client):
+    signup(client, "c@example.com", "candidate")
+
+    response = client.post("/auth/login", json={"email": "c@example.com", "password": "nope"})
+    assert response.status_code == 401
+
+    response = client.post("/auth/login", json={"email": "nobody@example.com", "password": "secret"})
+    assert response.status_code == 401
+
+
+def test_jobs(client):
+    recruiter = signup(client, "r@example.com", "recruiter")
+    candidate = signup(client, "c@example.com", "candidate")
+
+    response = client.post("/jobs/", headers=recruiter, json={
+        "title": "Backend Engineer",
+        "description": "python fastapi postgres",
+        "location": "Remote"
+    })
+    assert response.status_code == 200, response.text
+    job = response.json()
+    assert job["title"] == "Backend Engineer"
+    assert job["status"] == "open"
+
+    assert client.post("/jobs/", headers=candidate, json={"title": "x"}).status_code == 403
+
+    listing = client.get("/jobs/")
+    assert listing.status_code == 200
+    assert [item["id"] for item in listing.json()] == [job["id"]]
+    assert client.get("/jobs/", headers={"If-None-Match": listing.headers["etag"]}).status_code == 304
+
+    detail = client.get(f"/jobs/{job['id']}")
+    assert detail.status_code == 200
+    assert detail.json()["description"] == "python fastapi postgres"
+    assert client.get("/jobs/999").status_code == 404
+
+    mine = client.get("/jobs/my", headers=recruiter)
+    assert mine.status_code == 200
+    assert [item["id"] for item in mine.json()] == [job["id"]]
+
+    response = client.patch(f"/jobs/{job['id']}/status", headers=recruiter, params={"status": "closed"})
+    assert response.status_code == 200, response.text
+    assert response.json()["status"] == "closed"
+    assert client.get(f"/jobs/{job['id']}").json()["status"] == "closed"
+
+    response = client.patch(f"/jobs/{job['id']}/status", headers=recruiter, params={"status": "paused"})
+    assert response.status_code == 400
+
+
+def test_applications(client):
+    recruiter = signup(client, "r@example.com", "recruiter")
+    candidate = signup(client, "c@example.com", "candidate")
+
+    job = client.post("/jobs/", headers=recruiter, json={"title": "Data Engineer"}).json()
+
+    response = client.post("/applications/", headers=candidate, json={"job_id": job["id"]})
+    assert response.status_code == 200, response.text
+    application = response.json()
+    assert application["status"] == "applied"
+
+    duplicate = client.post("/applications/", headers=candidate, json={"job_id": job["id"]})
+    assert duplicate.status_code == 400
+
+    assert client.post("/applications/", headers=recruiter, json={"job_id": job["id"]}).status_code == 403
+    assert client.post("/applications/", headers=candidate, json={"job_id": 999}).status_code == 404
+
+    mine = client.get("/applications/my", headers=candidate)
+    assert mine.status_code == 200
+    assert [item["id"] for item in mine.json()] == [application["id"]]
+
+    ranking = client.get(f"/applications/job/{job['id']}", headers=recruiter)
+    assert ranking.status_code == 200, ranking.text
+    assert [row["application_id"] for row in ranking.json()] == [application["id"]]
+    assert client.get(f"/applications/job/{job['id']}", headers=candidate).status_code == 403
+
+    response = client.patch(
+        f"/applications/{application['id']}/status",
+        headers=recruiter,
+        json={"status": "hired"}
+    )
+    assert response.status_code == 200, response.text
+    assert client.get("/applications/my", headers=candidate).json()[0]["status"] == "hired"
+
+    rank = client.get(f"/applications/{application['id']}/rank", headers=candidate)
+    assert rank.status_code == 200, rank.text
+    assert rank.json()["application_id"] == application["id"]
+
+    leaderboard = client.get(f"/applications/job/{job['id']}/leaderboard", headers=recruiter)
+    assert leaderboard.status_code == 200, leaderboard.text
+    # only scored applications are ranked
+    assert leaderboard.json() == []
+
+    # closed jobs take no new applications
+    other = signup(client, "d@example.com", "candidate")
+    client.patch(f"/jobs/{job['id']}/status", headers=recruiter, params={"status": "closed"})
+    assert client.post("/applications/", headers=other, json={"job_id": job["id"]}).status_code == 400
+
+
+def test_ranking_cursor(client):
+    from app.core.pagination import encode_cursor
+
+    recruiter = signup(client, "r@example.com", "recruiter")
+    job = client.post("/jobs/", headers=recruiter, json={"title": "Data Engineer"}).json()
+
+    applied = []
+    for email in ("c@example.com", "d@example.com"):
+        candidate = signup(client, email, "candidate")
+        applied.append(client.post("/applications/", headers=candidate, json={"job_id": job["id"]}).json()["id"])
+
+    url = f"/applications/job/{job['id']}"
+    for sort in ("rank", "applied_at"):
+        first = client.get(url, headers=recruiter, params={"sort": sort, "limit": 1})
+        assert first.status_code == 200, first.text
+        cursor = first.headers["x-next-cursor"]
+
+        second = client.get(url, headers=recruiter, params={"sort": sort, "limit": 1, "cursor": cursor})
+        assert second.status_code == 200, second.text
+        seen = [row["application_id"] for row in first.json() + second.json()]
+        assert sorted(seen) == sorted(applied)
+
+    for values in (["applied", -1, {"a": 1}, 1], [[1], -1, -1, 1], ["applied", True, -1, 1], [1, -1, -1, 1]):
+        response = client.get(url, headers=recruiter, params={"cursor": encode_cursor(values)})
+        assert response.status_code == 400, values
+
+
+def test_token_with_a_malformed_subject_is_rejected(client, monkeypatch):
+    # python-jose already refuses a non-string "sub"; past it, int() must not 500
+    subjects = iter([["1"], ["1"], {"id": 1}, {"id": 1}, "abc", "abc"])
+    monkeypatch.setattr(auth, "_verify_token", lambda token: {"sub": next(subjects), "role": "recruiter"})
+    headers = {"Authorization": "Bearer token"}
+
+    for _ in range(3):
+        # signed claims only, then a user lookup
+        assert client.get("/jobs/my", headers=headers).status_code == 401
+        assert client.post("/applications/", headers=headers, json={"job_id": 1}).status_code == 401
+
+
+def test_search_cursor(client):
+    from app.core.pagination import encode_cursor
+
+    recruiter = signup(client, "r@example.com", "recruiter")
+    for title in ("Backend Engineer", "Data Engineer"):
+        client.post("/jobs/", headers=recruiter, json={"title": title, "description": "python"})
+
+    first = client.get("/jobs/search", params={"limit": 1})
+    assert first.status_code == 200, first.text
+    cursor = first.json()["next_cursor"]
+
+    second = client.get("/jobs/search", params={"limit": 1, "cursor": cursor})
+    assert second.status_code == 200, second.text
+    assert second.json()["items"][0]["id"] != first.json()["items"][0]["id"]
+
+    for values in ([True], ["1"], [None]):
+        response = client.get("/jobs/search", params={"cursor": encode_cursor(values)})
+        assert response.status_code == 400, values
@@ -0,0 +1,246 @@
+"""
+BlandDispatcher against a local stub of the Bland calls API (BLAND_API_URL),
+and how run_bland_interview turns each outcome into a scheduler decision.
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+from app.core import bland_ai
+from app.core.bland_ai import (
+    BlandDispatcher,
+    BlandOutcomeUnknown,
+    BlandRejected,
+    BlandRetryableError,
+    DispatcherBusy
+)
+from app.core.interview_pipeline import run_bland_interview
+from app.core.scheduler import FailTask, RetryTask
+from app.db.database import Base, SessionLocal, engine
+from app.models.application import CandidateApplication
+from app.models.job import JobListing
+from app.models.user import User
+
+
+class StubBland:
+    """
+    Answers every POST with ``status`` / ``body`` / ``headers`` after
+    ``delay`` seconds and records the JSON payloads it received.
+    """
+
+    def __init__(self):
+        self.status = 200
+        self.body = json.dumps({"status": "success", "call_id": "stub-call"})
+        self.headers = {}
+        self.delay = 0.0
+        self.requests = []
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                stub.requests.append(json.loads(self.rfile.read(length)))
+                time.sleep(stub.delay)
+
+                body = stub.body.encode()
+                self.send_response(stub.status)
+                for name, value in stub.headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_port}/v1/calls"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    stub = StubBland()
+    monkeypatch.setattr(bland_ai, "BLAND_API_URL", stub.url)
+    yield stub
+    stub.close()
+
+
+def make_dispatcher(calls_per_minute=60):
+    return BlandDispatcher(max_concurrent=2, max_per_job=1, calls_per_minute=calls_per_minute)
+
+
+PAYLOAD = {"phone_number": "+10000000000", "metadata": {"application_id": 1}}
+
+
+# ============================================================
+# DISPATCHER
+# ============================================================
+def test_accepted_call_returns_the_response(stub):
+    assert make_dispatcher().dispatch(1, PAYLOAD)["call_id"] == "stub-call"
+    assert stub.requests == [PAYLOAD]
+
+
+def test_rate_limited_is_retryable_with_retry_after(stub):
+    stub.status, stub.headers = 429, {"Retry-After": "7"}
+
+    with pytest.raises(BlandRetryableError) as error:
+        make_dispatcher().dispatch(1, PAYLOAD)
+    assert error.value.retry_after == 7
+
+
+@pytest.mark.parametrize("status", [500, 503])
+def test_server_error_is_retryable(stub, status):
+    stub.status = status
+
+    with pytest.raises(BlandRetryableError) as error:
+        make_dispatcher().dispatch(1, PAYLOAD)
+    assert error.value.retry_after is None
+
+
+@pytest.mark.parametrize("status", [502, 504])
+def test_gateway_error_is_outcome_unknown(stub, status):
+    stub.status = status
+
+    with pytest.raises(BlandOutcomeUnknown):
+        make_dispatcher().dispatch(1, PAYLOAD)
+
+
+@pytest.mark.parametrize("status", [400, 401, 402, 422])
+def test_client_error_is_rejected(stub, status):
+    stub.status, stub.body = status, json.dumps({"message": "invalid phone number"})
+
+    with pytest.raises(BlandRejected, match="invalid phone number"):
+        make_dispatcher().dispatch(1, PAYLOAD)
+
+
+def test_unreadable_success_body_is_outcome_unknown(stub):
+    stub.body = "<html>ok</html>"
+
+    with pytest.raises(BlandOutcomeUnknown):
+        make_dispatcher().dispatch(1, PAYLOAD)
+
+
+def test_read_timeout_is_outcome_unknown(stub, monkeypatch):
+    monkeypatch.setattr(bland_ai, "BLAND_TIMEOUT_SECONDS", 0.2)
+    stub.delay = 1.0
+
+    with pytest.raises(BlandOutcomeUnknown):
+        make_dispatcher().dispatch(1, PAYLOAD)
+    # the request did arrive, which is why it must not be resent
+    assert len(stub.requests) == 1
+
+
+def test_connection_refused_is_retryable(monkeypatch):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    monkeypatch.setattr(bland_ai, "BLAND_API_URL", f"http://127.0.0.1:{port}/v1/calls")
+
+    with pytest.raises(BlandRetryableError):
+        make_dispatcher().dispatch(1, PAYLOAD)
+
+
+def test_calls_per_minute_budget(stub):
+    dispatcher = make_dispatcher(calls_per_minute=1)
+    dispatcher.dispatch(1, PAYLOAD)
+
+    with pytest.raises(DispatcherBusy) as busy:
+        dispatcher.dispatch(2, PAYLOAD)
+    assert busy.value.wait > 0
+    assert len(stub.requests) == 1
+
+
+def test_per_job_cap_releases_after_each_call(stub):
+    dispatcher = make_dispatcher()
+    stub.delay = 0.3
+
+    first = threading.Thread(target=dispatcher.dispatch, args=(1, PAYLOAD))
+    first.start()
+    while not stub.requests:
+        time.sleep(0.01)
+
+    with pytest.raises(DispatcherBusy):
+        dispatcher.dispatch(1, PAYLOAD)
+    # another job still gets a slot
+    stub.delay = 0.0
+    dispatcher.dispatch(2, PAYLOAD)
+
+    first.join()
+    dispatcher.dispatch(1, PAYLOAD)
+
+
+# ============================================================
+# SCHEDULED CALL HANDLER
+# ============================================================
+@pytest.fixture
+def application(stub, monkeypatch):
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    monkeypatch.setattr(bland_ai, "dispatcher", make_dispatcher())
+
+    db = SessionLocal()
+    recruiter = User(name="r", email="r@example.com", phone="1", password="x", role="recruiter")
+    candidate = User(name="c", email="c@example.com", phone="+10000000000", password="x", role="candidate")
+    db.add_all([recruiter, candidate])
+    db.flush()
+
+    job = JobListing(recruiter_id=recruiter.id, title="Backend Engineer")
+    db.add(job)
+    db.flush()
+
+    application = CandidateApplication(
+        user_id=candidate.id, job_id=job.id, status="interview_scheduled", retry_count=0
+    )
+    db.add(application)
+    db.commit()
+
+    yield db, application
+    db.close()
+
+
+def test_handler_places_the_call(stub, application):
+    db, application = application
+
+    run_bland_interview(db, {"application_id": application.id})
+
+    assert stub.requests[0]["metadata"] == {"application_id": application.id}
+
+
+def test_handler_retries_a_rate_limit(stub, application):
+    db, application = application
+    stub.status, stub.headers = 429, {"Retry-After": "30"}
+
+    with pytest.raises(RetryTask) as retry:
+        run_bland_interview(db, {"application_id": application.id})
+    assert retry.value.delay == 30
+
+
+def test_handler_never_resends_an_unknown_outcome(stub, application):
+    db, application = application
+    stub.status = 504
+
+    with pytest.raises(FailTask):
+        run_bland_interview(db, {"application_id": application.id})
+
+
+def test_handler_fails_the_application_when_bland_rejects(stub, application):
+    db, application = application
+    stub.status = 400
+
+    with pytest.raises(FailTask):
+        run_bland_interview(db, {"application_id": application.id})
+
+    db.rollback()
+    db.refresh(application)
+    assert application.status == "failed"
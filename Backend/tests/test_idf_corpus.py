@@ -0,0 +1,106 @@
+"""
+The incremental IDF corpus updates must agree with a full rebuild: one
+document per job description and one per distinct resume content.
+"""
+import io
+
+import pytest
+
+from app.core import resume_pipeline
+from app.core.idf_model import rebuild_idf_model
+from app.core.resume_parser import resume_parser
+from app.core.resume_pipeline import process_resume_job
+from app.core.resume_store import resume_store
+from app.db.database import Base, SessionLocal, engine
+from app.models.application import CandidateApplication
+from app.models.idf import IdfCorpus, IdfTerm
+from app.models.job import JobListing
+from app.models.resume_job import ResumeJob
+from app.models.user import User
+from app.routers.jobs import _index_description, _save_job_update
+
+
+@pytest.fixture
+def db(monkeypatch):
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    monkeypatch.setattr(resume_parser, "extract", lambda data, *args, **kwargs: data.decode())
+    monkeypatch.setattr(
+        resume_pipeline,
+        "analyze_resume_with_ai",
+        lambda resume_text, job_description: {"score": 50, "missing_skills": [], "reason": "stub"}
+    )
+
+    db = SessionLocal()
+    yield db
+    db.close()
+
+
+def corpus(db):
+    db.expire_all()
+    counted = db.get(IdfCorpus, 1)
+    return counted.doc_count, dict(db.query(IdfTerm.term, IdfTerm.doc_freq).all())
+
+
+def add_job(db, recruiter, description):
+    job = JobListing(recruiter_id=recruiter.id, title="Engineer", description=description)
+    db.add(job)
+    db.flush()
+    _index_description(db, job)
+    db.commit()
+    return job
+
+
+def upload(db, application, content: bytes):
+    staged = resume_store.stage(io.BytesIO(content))
+    resume_store.publish(staged)
+
+    resume_job = ResumeJob(
+        application_id=application.id, blob_hash=staged.digest, status="processing", attempts=1
+    )
+    db.add(resume_job)
+    db.commit()
+
+    process_resume_job(resume_job.id)
+    db.refresh(resume_job)
+    assert resume_job.status == "completed", resume_job.error
+
+
+def test_incremental_counts_match_a_rebuild(db):
+    recruiter = User(name="r", email="r@example.com", phone="1", password="x", role="recruiter")
+    candidate = User(name="c", email="c@example.com", phone="2", password="x", role="candidate")
+    db.add_all([recruiter, candidate])
+    db.commit()
+
+    first = add_job(db, recruiter, "python fastapi postgres")
+    second = add_job(db, recruiter, "java spring postgres")
+
+    applications = []
+    for job in (first, second):
+        application = CandidateApplication(
+            user_id=candidate.id, job_id=job.id, status="resume_processing", retry_count=0
+        )
+        db.add(application)
+        applications.append(application)
+    db.commit()
+
+    # one resume sent to both jobs, then re-uploaded unchanged
+    resume = b"python django postgres docker"
+    upload(db, applications[0], resume)
+    upload(db, applications[1], resume)
+    upload(db, applications[0], resume)
+    # a different resume is a second document
+    upload(db, applications[0], b"python kubernetes")
+
+    _save_job_update(db, first, {"description": "python flask redis"})
+
+    doc_count, doc_freq = corpus(db)
+    assert doc_count == 4
+    assert doc_freq["python"] == 3
+    assert doc_freq["postgres"] == 2
+    assert "fastapi" not in doc_freq
+    assert doc_freq["redis"] == 1
+
+    rebuild_idf_model(db)
+    assert corpus(db) == (doc_count, doc_freq)
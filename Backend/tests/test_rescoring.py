@@ -0,0 +1,84 @@
+"""Rescoring revisits automatic decisions, but never an interview call already dispatched."""
+import pytest
+
+from app.core.rescoring import _rescore_application
+from app.core.resume_pipeline import apply_shortlist, interview_call_key
+from app.core.scheduler import pending_task_keys
+from app.db.database import Base, SessionLocal, engine
+from app.models.application import CandidateApplication
+from app.models.job import JobListing
+from app.models.scheduled_task import ScheduledTask
+from app.models.user import User
+
+
+@pytest.fixture
+def db():
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    db = SessionLocal()
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def shortlisted(db):
+    recruiter = User(name="r", email="r@example.com", phone="1", password="x", role="recruiter")
+    candidate = User(name="c", email="c@example.com", phone="2", password="x", role="candidate")
+    db.add_all([recruiter, candidate])
+    db.flush()
+
+    job = JobListing(recruiter_id=recruiter.id, title="Engineer", resume_min_score=50)
+    db.add(job)
+    db.flush()
+
+    application = CandidateApplication(
+        user_id=candidate.id, job_id=job.id, status="resume_processing", retry_count=0,
+        tfidf_score=80, resume_score=80
+    )
+    db.add(application)
+    db.flush()
+
+    apply_shortlist(db, application)
+    db.commit()
+    assert application.status == "interview_scheduled"
+
+    return application
+
+
+def rescore(db, application, tfidf_score):
+    pending = interview_call_key(application.id) in pending_task_keys(
+        db, "bland_interview", [interview_call_key(application.id)]
+    )
+    result = _rescore_application(db, application, tfidf_score, pending)
+    db.commit()
+    return result
+
+
+def call_task(db, application):
+    return db.query(ScheduledTask).filter(ScheduledTask.dedupe_key == interview_call_key(application.id)).one()
+
+
+def test_waiting_call_is_withdrawn_when_the_score_drops(db, shortlisted):
+    assert rescore(db, shortlisted, 10) == (True, True)
+
+    assert shortlisted.status == "rejected"
+    assert call_task(db, shortlisted).status == "cancelled"
+
+
+def test_dispatched_call_is_left_to_its_webhook(db, shortlisted):
+    call_task(db, shortlisted).status = "done"
+    db.commit()
+
+    assert rescore(db, shortlisted, 10) == (True, False)
+
+    assert shortlisted.status == "interview_scheduled"
+    assert call_task(db, shortlisted).status == "done"
+
+
+def test_rejection_is_revisited_when_the_score_rises(db, shortlisted):
+    rescore(db, shortlisted, 10)
+
+    assert rescore(db, shortlisted, 90) == (True, True)
+    assert shortlisted.status == "interview_scheduled"
+    assert db.query(ScheduledTask).filter(ScheduledTask.status == "pending").count() == 1
@@ -0,0 +1,78 @@
+"""Resume job queue: jobs abandoned on their last attempt, on SQLite."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core import admin_stats
+from app.core.resume_pipeline import RESUME_JOB_LEASE_SECONDS, RESUME_JOB_MAX_ATTEMPTS, claim_resume_job
+from app.db.database import Base, SessionLocal, engine
+from app.models.application import CandidateApplication
+from app.models.job import JobListing
+from app.models.resume_job import ResumeJob
+from app.models.user import User
+
+
+@pytest.fixture
+def db():
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    db = SessionLocal()
+    yield db
+    db.close()
+
+
+def add_processing_job(db, attempts):
+    recruiter = User(name="r", email="r@example.com", phone="1", password="x", role="recruiter")
+    candidate = User(name="c", email="c@example.com", phone="2", password="x", role="candidate")
+    db.add_all([recruiter, candidate])
+    db.flush()
+
+    job = JobListing(recruiter_id=recruiter.id, title="Backend Engineer")
+    db.add(job)
+    db.flush()
+
+    application = CandidateApplication(
+        user_id=candidate.id, job_id=job.id, status="resume_processing", retry_count=0
+    )
+    db.add(application)
+    db.flush()
+
+    resume_job = ResumeJob(
+        application_id=application.id,
+        blob_hash="0" * 64,
+        status="processing",
+        attempts=attempts,
+        locked_at=datetime.now(timezone.utc) - timedelta(seconds=RESUME_JOB_LEASE_SECONDS + 1)
+    )
+    db.add(resume_job)
+    db.commit()
+
+    return application, resume_job
+
+
+def test_job_lost_on_its_last_attempt_fails_with_its_application(db):
+    application, resume_job = add_processing_job(db, RESUME_JOB_MAX_ATTEMPTS)
+
+    assert claim_resume_job() is None
+
+    db.refresh(resume_job)
+    db.refresh(application)
+    assert resume_job.status == "failed"
+    assert application.status == "resume_failed"
+
+    # the admin rollups followed the status change
+    counted = admin_stats.overview_counters(db)["applications_by_status"]
+    assert counted == {"resume_failed": 1}
+
+    admin_stats.rebuild_stats(db)
+    assert admin_stats.overview_counters(db)["applications_by_status"] == counted
+
+
+def test_job_lost_with_attempts_left_is_reclaimed(db):
+    application, resume_job = add_processing_job(db, RESUME_JOB_MAX_ATTEMPTS - 1)
+
+    assert claim_resume_job() == resume_job.id
+
+    db.refresh(application)
+    assert application.status == "resume_processing"
@@ -0,0 +1,156 @@
+"""Leases, retries and abandoned tasks in core.scheduler, on SQLite."""
+from datetime import datetime, timedelta, timezone
+import json
+
+import pytest
+
+from app.core import scheduler
+from app.core.scheduler import (
+    SCHEDULER_MAX_ATTEMPTS,
+    claim_due_task,
+    recover_overdue_tasks,
+    run_task,
+    task_handler
+)
+from app.db.database import Base, SessionLocal, engine
+from app.models.scheduled_task import ScheduledTask
+
+calls = []
+
+
+@task_handler("test_noop")
+def run_noop(db, payload):
+    calls.append(payload)
+
+
+@pytest.fixture
+def db():
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    calls.clear()
+
+    db = SessionLocal()
+    yield db
+    db.close()
+
+
+def add_task(db, kind="test_noop", **values):
+    task = ScheduledTask(
+        kind=kind,
+        payload=json.dumps({}),
+        run_at=datetime.now(timezone.utc) - timedelta(seconds=1),
+        **{"status": "pending", "attempts": 0, **values}
+    )
+    db.add(task)
+    db.commit()
+    return task
+
+
+def expired_lease(attempts):
+    return {
+        "status": "running",
+        "attempts": attempts,
+        "lease_owner": "dead-host:1",
+        "lease_expires_at": datetime.now(timezone.utc) - timedelta(seconds=1)
+    }
+
+
+def test_due_task_runs_once(db):
+    task = add_task(db)
+
+    assert claim_due_task() == task.id
+    assert claim_due_task() is None
+    run_task(task.id)
+
+    db.refresh(task)
+    assert task.status == "done"
+    assert calls == [{}]
+
+
+def test_expired_lease_is_reclaimed_while_attempts_are_left(db):
+    task = add_task(db, **expired_lease(SCHEDULER_MAX_ATTEMPTS - 1))
+
+    assert claim_due_task() == task.id
+    db.refresh(task)
+    assert task.attempts == SCHEDULER_MAX_ATTEMPTS
+    assert task.lease_owner == scheduler.WORKER_ID
+
+
+def test_expired_lease_on_the_last_attempt_fails_the_task(db):
+    task = add_task(db, **expired_lease(SCHEDULER_MAX_ATTEMPTS))
+
+    assert claim_due_task() is None
+
+    db.refresh(task)
+    assert task.status == "failed"
+    assert task.lease_owner is None
+    assert task.finished_at is not None
+    assert calls == []
+
+
+def test_startup_recovery_applies_the_same_bound(db):
+    retry = add_task(db, **expired_lease(1))
+    exhausted = add_task(db, **expired_lease(SCHEDULER_MAX_ATTEMPTS))
+
+    recover_overdue_tasks()
+
+    db.refresh(retry)
+    db.refresh(exhausted)
+    assert retry.status == "pending"
+    assert exhausted.status == "failed"
+
+
+# ============================================================
+# PERIODIC TASKS
+# ============================================================
+failures = []
+
+
+@task_handler("test_periodic", every=600)
+def run_periodic(db, payload):
+    if failures:
+        raise RuntimeError(failures.pop())
+
+
+def test_periodic_task_comes_round_again(db):
+    task = add_task(db, kind="test_periodic")
+
+    run_task(claim_due_task())
+
+    db.refresh(task)
+    assert task.status == "pending"
+    assert task.attempts == 0
+    assert task.finished_at is None
+
+
+def test_periodic_task_backs_off_instead_of_failing(db):
+    task = add_task(db, kind="test_periodic")
+    failures.extend(["boom"] * (SCHEDULER_MAX_ATTEMPTS + 1))
+
+    for _ in range(SCHEDULER_MAX_ATTEMPTS + 1):
+        task.run_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+        db.commit()
+        run_task(claim_due_task())
+        db.refresh(task)
+        assert task.status == "pending"
+        assert task.last_error == "boom"
+
+    assert task.attempts > SCHEDULER_MAX_ATTEMPTS
+
+    task.run_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+    db.commit()
+    run_task(claim_due_task())
+    db.refresh(task)
+    assert task.attempts == 0
+    assert task.last_error is None
+
+
+def test_abandoned_periodic_task_is_requeued(db):
+    task = add_task(db, kind="test_periodic", **expired_lease(SCHEDULER_MAX_ATTEMPTS))
+
+    assert claim_due_task() is None
+
+    db.refresh(task)
+    assert task.status == "pending"
+    assert task.lease_owner is None
+    assert task.run_at.replace(tzinfo=timezone.utc) > datetime.now(timezone.utc)
@@ -20,10 +20,24 @@ function getRoleFromQuery() {
     return validRoles.includes(role) ? role : null;
 }
 
-async function loadRoleUsers() {
+function renderUserCard(user) {
+    return `
+        <article class="list-card">
+            <h4>${safeText(user.name, "Unnamed User")}</h4>
+            <p>Email: ${safeText(user.email)}</p>
+            <p>Role: ${safeText(user.role)}</p>
+            <p>Phone: ${safeText(user.phone)}</p>
+        </article>
+    `;
+}
+
+let nextUsersCursor = null;
+
+async function loadRoleUsers(cursor = null) {
     const role = getRoleFromQuery();
     currentRole = role;
     const listContainer = document.getElementById("roleUsersList");
+    const loadMoreButton = document.getElementById("loadMoreUsersBtn");
 
     if (!role) {
         listContainer.innerHTML = "<p class='empty-state'>Invalid role selected.</p>";
@@ -34,7 +48,17 @@ async function loadRoleUsers() {
     document.getElementById("roleListHeading").textContent = `${formatRole(role)} Users`;
 
     try {
-        const response = await fetch(`${API_BASE}/admin/overview`, {
+        const params = new URLSearchParams({ role });
+        const search = document.getElementById("userSearch").value.trim();
+        if (search) {
+            params.set("q", search);
+            params.set("match", "contains");
+        }
+        if (cursor) {
+            params.set("cursor", cursor);
+        }
+
+        const response = await fetch(`${API_BASE}/admin/users?${params}`, {
             headers: {
                 "Authorization": `Bearer ${authToken}`
             }
@@ -45,27 +69,36 @@ async function loadRoleUsers() {
             throw new Error(data.detail || "Failed to load users");
         }
 
-        const users = (data.users || []).filter(
-            (user) => (user.role || "").toLowerCase() === role
-        );
+        const users = data.items;
+        nextUsersCursor = data.next_cursor;
+        loadMoreButton.style.display = nextUsersCursor ? "inline-flex" : "none";
+
+        if (cursor) {
+            listContainer.insertAdjacentHTML("beforeend", users.map(renderUserCard).join(""));
+            return;
+        }
 
         listContainer.innerHTML = users.length
-            ? users
-                .map((user) => `
-                    <article class="list-card">
-                        <h4>${safeText(user.name, "Unnamed User")}</h4>
-                        <p>Email: ${safeText(user.email)}</p>
-                        <p>Role: ${safeText(user.role)}</p>
-                        <p>Phone: ${safeText(user.phone)}</p>
-                    </article>
-                `)
-                .join("")
+            ? users.map(renderUserCard).join("")
             : `<p class='empty-state'>No ${role} users found.</p>`;
     } catch (error) {
         listContainer.innerHTML = `<p class='empty-state'>${error.message}</p>`;
     }
 }
 
+document.getElementById("loadMoreUsersBtn").addEventListener("click", () => {
+    if (nextUsersCursor) {
+        loadRoleUsers(nextUsersCursor);
+    }
+});
+
+let userSearchTimer = null;
+
+document.getElementById("userSearch").addEventListener("input", () => {
+    clearTimeout(userSearchTimer);
+    userSearchTimer = setTimeout(() => loadRoleUsers(), 300);
+});
+
 loadRoleUsers();
 
 function setCreateAdminUIVisible(isVisible) {
@@ -1,8 +1,8 @@
 const API_BASE = "http://127.0.0.1:8000";
 const authToken = localStorage.getItem("token");
 const role = (localStorage.getItem("role") || "").toLowerCase();
-
-let allJobs = [];
+// same cap as the API (RESUME_MAX_BYTES); bigger files are refused with a 413
+const MAX_RESUME_BYTES = 10 * 1024 * 1024;
 
 function ensurePopupModal() {
     let modal = document.getElementById("appMessageModal");
@@ -95,6 +95,10 @@ function pickResumeFile() {
 }
 
 async function uploadResumeFile(applicationId, file) {
+    if (file.size > MAX_RESUME_BYTES) {
+        throw new Error("Resume must be 10 MB or smaller");
+    }
+
     const formData = new FormData();
     formData.append("file", file);
 
@@ -111,7 +115,38 @@ async function uploadResumeFile(applicationId, file) {
         throw new Error(data.detail || "Failed to upload resume");
     }
 
-    return data;
+    return waitForResumeProcessing(data.job_id);
+}
+
+async function waitForResumeProcessing(jobId) {
+    for (let attempt = 0; attempt < 60; attempt += 1) {
+        const response = await fetch(`${API_BASE}/applications/resume-jobs/${jobId}`, {
+            headers: {
+                "Authorization": `Bearer ${authToken}`
+            }
+        });
+
+        const data = await response.json().catch(() => ({}));
+        if (!response.ok) {
+            throw new Error(data.detail || "Failed to check resume status");
+        }
+
+        if (data.status === "completed") {
+            return {
+                resume_score: data.resume_score,
+                min_required_score: data.min_required_score,
+                status: data.application_status
+            };
+        }
+
+        if (data.status === "failed") {
+            throw new Error("We could not process your resume. Please try again.");
+        }
+
+        await new Promise((resolve) => setTimeout(resolve, 2000));
+    }
+
+    throw new Error("Resume is still being processed. Check your dashboard shortly.");
 }
 
 async function createApplicationAndUploadResume(jobId) {
@@ -175,19 +210,9 @@ async function createApplicationAndUploadResume(jobId) {
     }
 }
 
-function renderJobs(jobs) {
-    const container = document.getElementById("jobsContainer");
-    container.innerHTML = "";
-
-    if (!jobs.length) {
-        container.innerHTML = "<p class='empty-state'>No jobs found.</p>";
-        return;
-    }
-
-    jobs.forEach((job) => {
-        const div = document.createElement("div");
-        div.className = "job-card";
-        div.innerHTML = `
+function renderJobCard(job) {
+    return `
+        <div class="job-card">
             <h3>${job.title}</h3>
             <p>${job.description || "No description provided."}</p>
             <div class="job-meta">
@@ -196,53 +221,60 @@ function renderJobs(jobs) {
                 <span>${job.mode || "Mode: NA"}</span>
             </div>
             ${role === "candidate" ? `<button onclick="applyJob(${job.id})">Apply</button>` : ""}
-        `;
-        container.appendChild(div);
-    });
+        </div>
+    `;
 }
 
-function filterJobs() {
-    const query = (document.getElementById("jobSearch").value || "").trim().toLowerCase();
-    if (!query) {
-        renderJobs(allJobs);
-        return;
-    }
+let nextJobsCursor = null;
+let jobSearchTimer = null;
 
-    const filtered = allJobs.filter((job) => {
-        const haystack = [
-            job.title,
-            job.role,
-            job.location,
-            job.mode,
-            job.description
-        ]
-            .filter(Boolean)
-            .join(" ")
-            .toLowerCase();
-        return haystack.includes(query);
-    });
-
-    renderJobs(filtered);
-}
+async function loadJobs(cursor = null) {
+    const container = document.getElementById("jobsContainer");
+    const loadMoreButton = document.getElementById("loadMoreJobsBtn");
 
-async function loadJobs() {
     try {
-        const response = await fetch(`${API_BASE}/jobs`, {
+        const params = new URLSearchParams();
+        const query = (document.getElementById("jobSearch").value || "").trim();
+        if (query) {
+            params.set("q", query);
+        }
+        if (cursor) {
+            params.set("cursor", cursor);
+        }
+
+        const response = await fetch(`${API_BASE}/jobs/search?${params}`, {
             headers: authToken ? { "Authorization": `Bearer ${authToken}` } : {}
         });
 
-        allJobs = await response.json();
+        const data = await response.json();
         if (!response.ok) {
-            throw new Error(allJobs.detail || "Failed to fetch jobs");
+            throw new Error(data.detail || "Failed to fetch jobs");
         }
 
-        renderJobs(allJobs);
+        nextJobsCursor = data.next_cursor;
+        loadMoreButton.style.display = nextJobsCursor ? "inline-flex" : "none";
+
+        if (cursor) {
+            container.insertAdjacentHTML("beforeend", data.items.map(renderJobCard).join(""));
+            return;
+        }
+
+        container.innerHTML = data.items.length
+            ? data.items.map(renderJobCard).join("")
+            : "<p class='empty-state'>No jobs found.</p>";
     } catch (error) {
-        const container = document.getElementById("jobsContainer");
         container.innerHTML = `<p class="empty-state">${error.message || "Unable to load jobs."}</p>`;
     }
 }
 
 updateHomeLink();
-document.getElementById("jobSearch").addEventListener("input", filterJobs);
+document.getElementById("jobSearch").addEventListener("input", () => {
+    clearTimeout(jobSearchTimer);
+    jobSearchTimer = setTimeout(() => loadJobs(), 300);
+});
+document.getElementById("loadMoreJobsBtn").addEventListener("click", () => {
+    if (nextJobsCursor) {
+        loadJobs(nextJobsCursor);
+    }
+});
 loadJobs();
@@ -14,6 +14,28 @@ async function getJson(url) {
     return data;
 }
 
+async function getAllPages(url) {
+    let items = [];
+    let cursor = null;
+
+    do {
+        const pageUrl = cursor ? `${url}?cursor=${encodeURIComponent(cursor)}` : url;
+        const response = await fetch(pageUrl, {
+            headers: {
+                "Authorization": `Bearer ${authToken}`
+            }
+        });
+        const data = await response.json();
+        if (!response.ok) {
+            throw new Error(data.detail || "Request failed");
+        }
+        items = items.concat(data);
+        cursor = response.headers.get("X-Next-Cursor");
+    } while (cursor);
+
+    return items;
+}
+
 async function patchJson(url, payload) {
     const hasPayload = typeof payload !== "undefined";
     const headers = {
@@ -295,7 +317,7 @@ async function loadRecruiterDashboard() {
         const jobs = await getJson(`${API_BASE}/jobs/my`);
         const appResults = await Promise.all(
             jobs.map((job) =>
-                getJson(`${API_BASE}/applications/job/${job.id}`)
+                getAllPages(`${API_BASE}/applications/job/${job.id}`)
                     .then((applications) => ({ jobId: job.id, applications }))
                     .catch(() => ({ jobId: job.id, applications: [] }))
             )